@@ -0,0 +1,130 @@
+import time
+from collections import deque
+from tracing import traced
+
+def _parse_color(value):
+    if isinstance(value, str) and len(value) == 7 and value.startswith("#"):
+        try:
+            return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+        except ValueError:
+            return None
+    return None
+
+def blend(start, end, t):
+    # Linear blend between two "#rrggbb" colors; other values switch halfway
+    a, b = _parse_color(start), _parse_color(end)
+    if a is None or b is None:
+        return end if t >= 0.5 else start
+    return "#%02x%02x%02x" % tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+class Tween:
+    # Keyframes are (offset in seconds, {option: value}) pairs, applied in
+    # order. A keyframe whose options map to (start, end) tuples is
+    # interpolated from its offset until the next keyframe's offset.
+    __slots__ = ("widget", "keyframes", "start", "index", "on_done")
+
+    def __init__(self, widget, keyframes, start, on_done=None):
+        self.widget = widget
+        self.keyframes = sorted(keyframes, key=lambda k: k[0])
+        self.start = start
+        self.index = 0
+        self.on_done = on_done
+
+    def options_at(self, now):
+        # Options to apply this frame, or None if nothing is due yet
+        elapsed = now - self.start
+        frames = self.keyframes
+        options = None
+        while self.index < len(frames) and frames[self.index][0] <= elapsed:
+            options = dict(options or {}, **self._resolve(self.index, 1.0))
+            self.index += 1
+        # An interpolated keyframe that has started keeps blending
+        if 0 < self.index < len(frames):
+            current = self.index - 1
+            if any(isinstance(v, tuple) for v in frames[current][1].values()):
+                span = frames[self.index][0] - frames[current][0]
+                t = (elapsed - frames[current][0]) / span if span > 0 else 1.0
+                options = dict(options or {}, **self._resolve(current, t))
+        return options
+
+    def _resolve(self, i, t):
+        return {k: blend(v[0], v[1], t) if isinstance(v, tuple) else v
+                for k, v in self.keyframes[i][1].items()}
+
+    @property
+    def finished(self):
+        return self.index >= len(self.keyframes)
+
+class Animator:
+    # Every running animation is advanced by one fixed-rate after() tick.
+    # Animations live on named channels: starting a new one on a busy
+    # channel cancels the old one, so rapid guesses or a New Game cannot
+    # leave stale timers behind. All options due in a tick are pushed to
+    # the renderer and flushed together.
+    def __init__(self, root, renderer, fps=60):
+        self.root = root
+        self.renderer = renderer
+        self.interval = 1.0 / fps
+        self._tweens = {}
+        self._tick_id = None
+        self._last_tick = None
+        self.frames = 0
+        self.late_frames = 0
+        self.work_times = deque(maxlen=600)
+
+    def play(self, channel, widget, keyframes, delay=0.0, on_done=None):
+        start = time.monotonic() + delay
+        self._tweens[channel] = Tween(widget, keyframes, start, on_done)
+        if self._tick_id is None:
+            self._last_tick = None
+            self._tick_id = self.root.after(0, self._tick)
+
+    def cancel(self, channel):
+        self._tweens.pop(channel, None)
+
+    def cancel_all(self):
+        self._tweens.clear()
+
+    def busy(self):
+        return bool(self._tweens)
+
+    @traced("tk.animation_frame")
+    def _tick(self):
+        now = time.monotonic()
+        if self._last_tick is not None and now - self._last_tick > 2 * self.interval:
+            self.late_frames += 1
+        self._last_tick = now
+        done = []
+        for channel, tween in list(self._tweens.items()):
+            options = tween.options_at(now)
+            if options:
+                self.renderer.set(tween.widget, **options)
+            if tween.finished:
+                done.append((channel, tween))
+        for channel, tween in done:
+            if self._tweens.get(channel) is tween:
+                del self._tweens[channel]
+        self.renderer.flush()
+        for _, tween in done:
+            if tween.on_done:
+                tween.on_done()
+        work = time.monotonic() - now
+        self.frames += 1
+        self.work_times.append(work)
+        if self._tweens:
+            delay = max(0.0, self.interval - work)
+            self._tick_id = self.root.after(int(delay * 1000), self._tick)
+        else:
+            self._tick_id = None
+
+    def stats(self):
+        times = sorted(self.work_times)
+        if not times:
+            return {"frames": 0, "late_frames": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "frames": self.frames,
+            "late_frames": self.late_frames,
+            "mean_ms": 1000 * sum(times) / len(times),
+            "p95_ms": 1000 * times[int(0.95 * (len(times) - 1))],
+            "max_ms": 1000 * times[-1],
+        }
@@ -0,0 +1,238 @@
+import os
+import sys
+import random
+import argparse
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from weakref import WeakKeyDictionary
+from wordle_core import file_version
+
+# Answer weights, one "word weight" pair per line; the shipped file holds
+# Zipf frequencies (log10 of uses per billion words) and is rebuilt with
+# main() below. Answers missing from the file get the smallest listed
+# weight; without the file every answer is equally likely.
+FREQ_FILE = os.environ.get("WORDLE_FREQ_FILE", "word_freq.txt")
+RECENT_LIMIT = 500  # answers per player kept out of that player's next games
+MAX_PLAYERS = 10_000  # recent-answer sets kept, least recently used dropped
+MAX_TRIES = 64
+
+def load_weights(path):
+    # {word: weight}, or None if there is no usable file
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except OSError:
+        return None
+    weights = {}
+    with f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            try:
+                weight = float(parts[1])
+            except ValueError:
+                continue
+            if weight > 0:
+                weights[parts[0].lower()] = weight
+    return weights or None
+
+class AliasTable:
+    # Vose's alias method: after an O(n) build, drawing from any discrete
+    # distribution costs one random index and one coin flip.
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = array("d", bytes(8 * n))
+        self.alias = array("I", range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1 up to rounding
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self, rng=random):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+class AnswerSampler:
+    # Weighted draws from one answer list. Answers are identified by their
+    # position in the sorted list, so sets of them fit in an int bitset.
+    __slots__ = ("answers", "table")
+
+    def __init__(self, answers, weights=None):
+        self.answers = answers
+        self.table = None
+        if weights:
+            floor = min(weights.values())
+            self.table = AliasTable([weights.get(w, floor) for w in answers])
+
+    def position(self, word):
+        i = bisect_left(self.answers, word)
+        return i if i < len(self.answers) and self.answers[i] == word else None
+
+    def draw(self, rng=random, avoid=0):
+        # Position of a weighted draw not in the avoid bitset. After
+        # MAX_TRIES rejections the last draw is kept, so a player who has
+        # seen nearly every answer still gets a game.
+        for _ in range(MAX_TRIES):
+            i = self.table.draw(rng) if self.table else rng.randrange(len(self.answers))
+            if not avoid >> i & 1:
+                break
+        return i
+
+    def sample(self, rng=random, avoid=0):
+        return self.answers[self.draw(rng, avoid)]
+
+    def sample_many(self, n, rng=random, avoid=0):
+        # n distinct answers, e.g. for a multi-board game
+        picked = []
+        for _ in range(min(n, len(self.answers))):
+            i = self.draw(rng, avoid)
+            avoid |= 1 << i
+            picked.append(self.answers[i])
+        return picked
+
+class RecentAnswers:
+    # One player's last answers: a bounded ring of words plus a bitset of
+    # their positions in the current sampler's list, rebuilt only when the
+    # answer list is reloaded.
+    __slots__ = ("words", "bits", "_sampler")
+
+    def __init__(self, limit=RECENT_LIMIT):
+        self.words = deque(maxlen=limit)
+        self.bits = 0
+        self._sampler = None
+
+    def bitset(self, sampler):
+        if sampler is not self._sampler:
+            self.bits = 0
+            for word in self.words:
+                i = sampler.position(word)
+                if i is not None:
+                    self.bits |= 1 << i
+            self._sampler = sampler
+        return self.bits
+
+    def add(self, sampler, word):
+        self.bitset(sampler)
+        if len(self.words) == self.words.maxlen:
+            oldest = self.words.popleft()
+            i = sampler.position(oldest)
+            if i is not None and oldest not in self.words:
+                self.bits &= ~(1 << i)
+        self.words.append(word)
+        i = sampler.position(word)
+        if i is not None:
+            self.bits |= 1 << i
+
+_samplers = WeakKeyDictionary()
+_recent = OrderedDict()
+_lock = threading.Lock()
+
+def sampler_for(lists, freq_file=None):
+    # One sampler per word-list snapshot, rebuilt if the weights file changes
+    freq_file = freq_file or FREQ_FILE
+    version = file_version(freq_file)
+    with _lock:
+        cached = _samplers.get(lists)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    sampler = AnswerSampler(lists.answers, load_weights(freq_file) if version else None)
+    with _lock:
+        _samplers[lists] = (version, sampler)
+    return sampler
+
+def _recent_for(player):
+    # Caller holds _lock
+    recent = _recent.get(player)
+    if recent is None:
+        recent = _recent[player] = RecentAnswers()
+        while len(_recent) > MAX_PLAYERS:
+            _recent.popitem(last=False)
+    else:
+        _recent.move_to_end(player)
+    return recent
+
+def pick_answer(lists, player=None, rng=random, avoid_recent=True):
+    # A weighted answer from lists, skipping player's recent answers
+    sampler = sampler_for(lists)
+    if player is None or not avoid_recent:
+        return sampler.sample(rng)
+    with _lock:
+        recent = _recent_for(player)
+        word = sampler.sample(rng, recent.bitset(sampler))
+        recent.add(sampler, word)
+    return word
+
+def pick_answers(lists, n, player=None, rng=random):
+    # n distinct answers for a multi-board game, also avoiding recent ones
+    sampler = sampler_for(lists)
+    if player is None:
+        return sampler.sample_many(n, rng)
+    with _lock:
+        recent = _recent_for(player)
+        words = sampler.sample_many(n, rng, recent.bitset(sampler))
+        for word in words:
+            recent.add(sampler, word)
+    return words
+
+def _inflected(word, zipf):
+    # Plurals and past tenses of common words ("rules", "boxes", "named")
+    stems = []
+    if word.endswith("s") and not word.endswith("ss"):
+        stems += [word[:-1], word[:-2]] if word.endswith("es") else [word[:-1]]
+    if word.endswith("ed"):
+        stems += [word[:-1], word[:-2]]
+    return any(zipf(stem, "en") >= 3.0 for stem in stems)
+
+def build_files(words, size, freq_file, answers_file):
+    # Weights for every word and an answer pool of the size most common
+    # uninflected ones, from wordfreq's English data. Only needed when the
+    # word list changes; the game reads the two text files.
+    from wordfreq import zipf_frequency
+    weights = {w: zipf_frequency(w, "en") for w in words}
+    common = sorted((w for w in words if weights[w] > 0 and not _inflected(w, zipf_frequency)),
+                    key=lambda w: (-weights[w], w))
+    answers = sorted(common[:size])
+    for path, lines in ((freq_file, [f"{w} {weights[w]:.2f}" for w in sorted(words) if weights[w] > 0]),
+                        (answers_file, answers)):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("# built by answer_sampler.py from wordfreq English data (CC BY-SA 4.0)\n")
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+    return answers
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the answer pool and answer weights from word frequencies.")
+    parser.add_argument("--words", default="words_5.txt", help="allowed words")
+    parser.add_argument("--size", type=int, default=2500, help="answers to keep")
+    parser.add_argument("--freq-file", default=FREQ_FILE)
+    parser.add_argument("--answers-file", default="answers_5.txt")
+    args = parser.parse_args(argv)
+    from word_index import load_words_from_file
+    words = load_words_from_file(args.words)
+    if not words:
+        print(f"No word list at {args.words}", file=sys.stderr)
+        return 1
+    try:
+        answers = build_files(words, args.size, args.freq_file, args.answers_file)
+    except ImportError:
+        print("Building needs the wordfreq package (pip install wordfreq)", file=sys.stderr)
+        return 1
+    print(f"{args.answers_file}: {len(answers)} of {len(words)} words are answers; weights in {args.freq_file}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
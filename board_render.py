@@ -0,0 +1,51 @@
+from tracing import traced
+
+class WidgetRenderer:
+    # Widget options are recorded here instead of being sent to Tk straight
+    # away. Once per idle cycle flush() configures each widget once with
+    # only the options that differ from what is already on screen, so
+    # repeated or redundant updates cost no Tcl calls.
+    def __init__(self, root):
+        self.root = root
+        self._applied = {}
+        self._pending = {}
+        self._scheduled = None
+        self.calls = 0
+        self.flushes = 0
+
+    def track(self, widget, **options):
+        # Record the options a widget was created with
+        self._applied[widget] = dict(options)
+
+    def set(self, widget, **options):
+        applied = self._applied.setdefault(widget, {})
+        pending = self._pending.get(widget)
+        for key, value in options.items():
+            if applied.get(key) == value:
+                if pending:
+                    pending.pop(key, None)
+            else:
+                if pending is None:
+                    pending = self._pending[widget] = {}
+                pending[key] = value
+        if self._pending and self._scheduled is None:
+            self._scheduled = self.root.after_idle(self.flush)
+
+    def get(self, widget, key):
+        pending = self._pending.get(widget)
+        if pending and key in pending:
+            return pending[key]
+        return self._applied.get(widget, {}).get(key)
+
+    @traced("tk.render_flush")
+    def flush(self):
+        if self._scheduled is not None:
+            self.root.after_cancel(self._scheduled)
+            self._scheduled = None
+        pending, self._pending = self._pending, {}
+        for widget, options in pending.items():
+            if options:
+                widget.configure(**options)
+                self._applied[widget].update(options)
+                self.calls += 1
+        self.flushes += 1
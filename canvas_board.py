@@ -0,0 +1,108 @@
+import tkinter as tk
+from tkinter import font as tkfont
+
+KB_ROWS = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
+WIDE_KEYS = ("ENTER", "⌫")
+
+class CanvasItem:
+    # A rectangle plus a text item that accepts the same options as the
+    # tile Labels and key Buttons, so WidgetRenderer and Animator can drive
+    # either kind of board.
+    __slots__ = ("canvas", "rect", "label")
+
+    def __init__(self, canvas, rect, label):
+        self.canvas = canvas
+        self.rect = rect
+        self.label = label
+
+    def configure(self, **options):
+        rect_options = {}
+        text_options = {}
+        if "bg" in options:
+            rect_options["fill"] = options["bg"]
+        if "highlightbackground" in options:
+            rect_options["outline"] = options["highlightbackground"]
+        if "text" in options:
+            text_options["text"] = options["text"]
+        if "fg" in options:
+            text_options["fill"] = options["fg"]
+        if rect_options:
+            self.canvas.itemconfigure(self.rect, **rect_options)
+        if text_options:
+            self.canvas.itemconfigure(self.label, **text_options)
+
+    config = configure
+
+class CanvasBoard(tk.Canvas):
+    # The whole board and on-screen keyboard drawn on one Canvas: 58
+    # widgets become one, resizing only moves items, and every tile and key
+    # shares two Font objects that are rescaled in one call.
+    def __init__(self, master, colors, rows, cols, on_key):
+        super().__init__(master, bg=colors["board_bg"], highlightthickness=0, width=460, height=520)
+        self.colors = colors
+        self.rows = rows
+        self.cols = cols
+        self.on_key = on_key
+        self.tile_font = tkfont.Font(family="Helvetica Neue", size=18, weight="bold")
+        self.key_font = tkfont.Font(family="Helvetica Neue", size=13, weight="bold")
+        self.tiles = []
+        for r in range(rows):
+            row_tiles = []
+            for c in range(cols):
+                rect = self.create_rectangle(0, 0, 0, 0, width=2, fill=colors["tile_empty"],
+                                             outline=colors["tile_border"])
+                label = self.create_text(0, 0, text="", font=self.tile_font, fill=colors["tile_text"])
+                row_tiles.append(CanvasItem(self, rect, label))
+            self.tiles.append(row_tiles)
+        self.key_buttons = {}
+        self.key_rows = []
+        for i, keys in enumerate(KB_ROWS):
+            row_keys = list(keys) + (list(WIDE_KEYS) if i == 2 else [])
+            for key in row_keys:
+                tags = ("key", f"key:{key}")
+                rect = self.create_rectangle(0, 0, 0, 0, width=1, fill=colors["key_bg"],
+                                             outline=colors["tile_border"], tags=tags)
+                label = self.create_text(0, 0, text=key, font=self.key_font, fill=colors["key_fg"], tags=tags)
+                self.key_buttons[key] = CanvasItem(self, rect, label)
+            self.key_rows.append(row_keys)
+        self.tag_bind("key", "<Button-1>", self._on_click)
+        self.bind("<Configure>", self._layout)
+
+    def _on_click(self, event):
+        for tag in self.gettags("current"):
+            if tag.startswith("key:"):
+                self.on_key(tag[4:])
+                return
+
+    def _layout(self, event=None):
+        width, height = self.winfo_width(), self.winfo_height()
+        if width < 2 or height < 2:
+            return
+        gap = 6
+        board_h = height * 0.68
+        size = min((width - gap * (self.cols + 1)) / self.cols, (board_h - gap * (self.rows + 1)) / self.rows)
+        left = (width - (size * self.cols + gap * (self.cols - 1))) / 2
+        for r, row_tiles in enumerate(self.tiles):
+            for c, item in enumerate(row_tiles):
+                x = left + c * (size + gap)
+                y = gap + r * (size + gap)
+                self.coords(item.rect, x, y, x + size, y + size)
+                self.coords(item.label, x + size / 2, y + size / 2)
+        self.tile_font.configure(size=max(8, int(size * 0.42)))
+
+        key_gap = 4
+        units = max(len(keys) + sum(0.5 for k in keys if k in WIDE_KEYS) for keys in self.key_rows)
+        key_w = (width - key_gap * (units + 1)) / units
+        key_h = min((height - board_h - key_gap * 4) / 3, key_w * 1.4)
+        top = board_h + key_gap
+        for r, keys in enumerate(self.key_rows):
+            row_units = len(keys) + sum(0.5 for k in keys if k in WIDE_KEYS)
+            x = (width - (row_units * key_w + (len(keys) - 1) * key_gap)) / 2
+            y = top + r * (key_h + key_gap)
+            for key in keys:
+                w = key_w * (1.5 if key in WIDE_KEYS else 1)
+                item = self.key_buttons[key]
+                self.coords(item.rect, x, y, x + w, y + key_h)
+                self.coords(item.label, x + w / 2, y + key_h / 2)
+                x += w + key_gap
+        self.key_font.configure(size=max(7, int(key_h * 0.32)))
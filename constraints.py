@@ -0,0 +1,155 @@
+from weakref import WeakKeyDictionary
+from wordle_core import COLS
+
+ALL_LETTERS = (1 << 26) - 1
+ORDINALS = ("1st", "2nd", "3rd", "4th", "5th", "6th", "7th", "8th")
+# Set bit positions of every byte value, for turning bitsets into ids
+_BYTE_BITS = tuple(tuple(j for j in range(8) if b >> j & 1) for b in range(256))
+
+def _bit(ch):
+    return 1 << (ord(ch) - 97)
+
+def _count_word(n, ch):
+    return f"{n} {ch.upper()}" + ("s" if n != 1 else "")
+
+class Constraints:
+    # Everything the marks so far say about the answer: per position, a
+    # 26-bit mask of the letters that may still be there, and per letter,
+    # the fewest and most copies the answer can hold. A word satisfies
+    # them exactly when it would have produced every mark seen so far.
+    __slots__ = ("allowed", "min_counts", "max_counts")
+
+    def __init__(self):
+        self.allowed = [ALL_LETTERS] * COLS
+        self.min_counts = {}
+        self.max_counts = {}
+
+    @classmethod
+    def from_history(cls, history):
+        constraints = cls()
+        for guess, marks in history:
+            constraints.add(guess, marks)
+        return constraints
+
+    def add(self, guess, marks):
+        marked = {}
+        grayed = set()
+        for i, ch in enumerate(guess):
+            if marks[i] == 2:
+                self.allowed[i] = _bit(ch)
+            else:
+                self.allowed[i] &= ~_bit(ch)
+            if marks[i]:
+                marked[ch] = marked.get(ch, 0) + 1
+            else:
+                grayed.add(ch)
+        for ch, n in marked.items():
+            if n > self.min_counts.get(ch, 0):
+                self.min_counts[ch] = n
+        for ch in grayed:
+            # A gray copy caps the count at the copies that were marked
+            n = marked.get(ch, 0)
+            if n < self.max_counts.get(ch, COLS):
+                self.max_counts[ch] = n
+            if n == 0:
+                for i in range(COLS):
+                    self.allowed[i] &= ~_bit(ch)
+        return self
+
+    def allows(self, word):
+        for i, ch in enumerate(word):
+            if not self.allowed[i] & _bit(ch):
+                return False
+        for ch, n in self.min_counts.items():
+            if word.count(ch) < n:
+                return False
+        for ch, n in self.max_counts.items():
+            if word.count(ch) > n:
+                return False
+        return True
+
+    def violation(self, word):
+        # The first rule word breaks, as a message, or None
+        for i, ch in enumerate(word):
+            mask = self.allowed[i]
+            if not mask & _bit(ch):
+                if mask and not mask & (mask - 1):
+                    return f"{ORDINALS[i]} letter must be {chr(mask.bit_length() + 96).upper()}"
+                if self.max_counts.get(ch) == 0:
+                    return f"No {ch.upper()}"
+                return f"{ch.upper()} can't be the {ORDINALS[i]} letter"
+        for ch, n in self.min_counts.items():
+            if word.count(ch) < n:
+                return f"Must use {ch.upper()}" if n == 1 else f"Must use {_count_word(n, ch)}"
+        for ch, n in self.max_counts.items():
+            if word.count(ch) > n:
+                return f"Only {_count_word(n, ch)}"
+        return None
+
+class LetterIndex:
+    # Bitsets of word ids (Python ints, bit i = word id i): one per
+    # (position, letter) and one per (letter, at least k copies).
+    # matching() combines a few dozen of them to find every word that fits
+    # a Constraints, instead of testing each word.
+    __slots__ = ("size", "all", "at", "at_least")
+
+    def __init__(self, words):
+        n = len(words)
+        nbytes = (n + 7) // 8
+        at = [[bytearray(nbytes) for _ in range(26)] for _ in range(COLS)]
+        at_least = [[bytearray(nbytes) for _ in range(COLS + 1)] for _ in range(26)]
+        for word_id, word in enumerate(words):
+            byte, bit = word_id >> 3, 1 << (word_id & 7)
+            seen = [0] * 26
+            for i, ch in enumerate(word):
+                c = ord(ch) - 97
+                at[i][c][byte] |= bit
+                seen[c] += 1
+                at_least[c][seen[c]][byte] |= bit
+        self.size = n
+        self.all = (1 << n) - 1
+        self.at = [[int.from_bytes(b, "little") for b in row] for row in at]
+        self.at_least = [[int.from_bytes(b, "little") for b in row] for row in at_least]
+
+    def matching(self, constraints):
+        bits = self.all
+        for i, mask in enumerate(constraints.allowed):
+            if mask == ALL_LETTERS:
+                continue
+            if mask and not mask & (mask - 1):
+                bits &= self.at[i][mask.bit_length() - 1]
+            else:
+                excluded = ALL_LETTERS & ~mask
+                while excluded:
+                    low = excluded & -excluded
+                    bits &= ~self.at[i][low.bit_length() - 1]
+                    excluded ^= low
+        for ch, n in constraints.min_counts.items():
+            bits &= self.at_least[ord(ch) - 97][n]
+        for ch, n in constraints.max_counts.items():
+            if n < COLS:
+                bits &= ~self.at_least[ord(ch) - 97][n + 1]
+        return bits
+
+    def ids(self, constraints):
+        return bits_to_ids(self.matching(constraints))
+
+    def count(self, constraints):
+        return self.matching(constraints).bit_count()
+
+def bits_to_ids(bits):
+    ids = []
+    for i, b in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        if b:
+            base = i * 8
+            ids.extend(base + j for j in _BYTE_BITS[b])
+    return ids
+
+_indexes = WeakKeyDictionary()
+
+def letter_index(index):
+    # One LetterIndex per WordIndex, built on first use
+    letters = _indexes.get(index)
+    if letters is None:
+        letters = _indexes[index] = LetterIndex(index.words)
+    return letters
@@ -0,0 +1,170 @@
+import os
+import sys
+import random
+import argparse
+import datetime
+import threading
+from array import array
+from weakref import WeakKeyDictionary
+
+SCHEDULE_FILE = os.environ.get("WORDLE_DAILY_SCHEDULE", "daily_schedule.txt")
+EPOCH = datetime.date(2025, 1, 1)
+SEED = "wordle-daily"
+
+class DailySchedule:
+    # Day n after start is words[n]: a shuffled answer list, so no word
+    # repeats until every word has been used (decades for a few thousand
+    # answers). The schedule keeps its own words, so editing the word
+    # files never moves a past or future day. Lookups go through a
+    # per-WordIndex table of word ids built once.
+    __slots__ = ("start", "words", "_tables")
+
+    def __init__(self, start, words):
+        self.start = start
+        self.words = list(words)
+        self._tables = WeakKeyDictionary()
+
+    @classmethod
+    def build(cls, words, start=EPOCH, seed=SEED):
+        words = sorted(set(words))
+        random.Random(seed).shuffle(words)
+        return cls(start, words)
+
+    def extend(self, words, seed=SEED):
+        # Append words not scheduled yet after the last day; returns how many
+        scheduled = set(self.words)
+        new = sorted(set(words) - scheduled)
+        random.Random(f"{seed}:{len(self.words)}").shuffle(new)
+        self.words.extend(new)
+        self._tables = WeakKeyDictionary()
+        return len(new)
+
+    def __len__(self):
+        return len(self.words)
+
+    def day_number(self, date=None):
+        date = date or datetime.date.today()
+        return date.toordinal() - self.start.toordinal()
+
+    def date_of(self, day):
+        return self.start + datetime.timedelta(days=day)
+
+    def scheduled_word(self, date=None):
+        # The word as scheduled, whatever the current word list says
+        day = self.day_number(date)
+        return self.words[day % len(self.words)] if day >= 0 else None
+
+    def table(self, index):
+        # Day -> word id in index. A scheduled word that index no longer
+        # has is replaced by the last usable word of the schedule, so only
+        # that day changes and the schedule gets a day shorter; no word is
+        # ever given two days.
+        ids = self._tables.get(index)
+        if ids is None:
+            ids = array("I")
+            end = len(self.words)
+            for day, word in enumerate(self.words):
+                if day >= end:
+                    break
+                word_id = index.id_of(word)
+                while word_id is None and end > day + 1:
+                    end -= 1
+                    word_id = index.id_of(self.words[end])
+                if word_id is None:
+                    break
+                ids.append(word_id)
+            self._tables[index] = ids
+        return ids
+
+    def word_for(self, index, date=None):
+        day = self.day_number(date)
+        if day < 0:
+            raise ValueError(f"no daily word before {self.start.isoformat()}")
+        ids = self.table(index)
+        if not ids:
+            raise ValueError("no scheduled daily word is in the word list")
+        return index.word_of(ids[day % len(ids)])
+
+    def save(self, path=SCHEDULE_FILE):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"# start {self.start.isoformat()}\n")
+            f.write("\n".join(self.words) + "\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=SCHEDULE_FILE):
+        # One word per line, line n (after the header) is day n
+        with open(path, "r", encoding="utf-8") as f:
+            header = f.readline().split()
+            if header[:2] != ["#", "start"]:
+                raise ValueError(f"{path}: not a daily schedule")
+            start = datetime.date.fromisoformat(header[2])
+            words = [line.strip() for line in f if line.strip()]
+        if not words:
+            raise ValueError(f"{path}: empty daily schedule")
+        return cls(start, words)
+
+_schedule = None
+_schedule_lock = threading.Lock()
+
+def default_schedule(answers=None, path=SCHEDULE_FILE):
+    # The schedule file, or one built from answers and saved on first use
+    # so later edits to the word lists leave it alone
+    global _schedule
+    with _schedule_lock:
+        if _schedule is None:
+            try:
+                _schedule = DailySchedule.load(path)
+            except FileNotFoundError:
+                _schedule = DailySchedule.build(answers)
+                try:
+                    _schedule.save(path)
+                except OSError:
+                    pass  # still deterministic for this list, just not pinned
+        return _schedule
+
+def daily_word(index, answers=None, date=None):
+    # Today's word (or date's) as a word from index
+    return default_schedule(answers if answers is not None else index.words).word_for(index, date)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build, extend or show the daily word schedule.")
+    parser.add_argument("command", choices=("build", "extend", "show"))
+    parser.add_argument("--file", default=SCHEDULE_FILE)
+    parser.add_argument("--words", default="answers_5.txt", help="answer list (falls back to words_5.txt)")
+    parser.add_argument("--start", default=EPOCH.isoformat(), help="first day of a new schedule")
+    parser.add_argument("--date", help="show: first date (default today)")
+    parser.add_argument("--days", type=int, default=7, help="show: how many days")
+    parser.add_argument("--force", action="store_true", help="build: replace an existing schedule")
+    args = parser.parse_args(argv)
+    from word_index import load_words_from_file
+    if args.command == "show":
+        schedule = DailySchedule.load(args.file)
+        first = datetime.date.fromisoformat(args.date) if args.date else datetime.date.today()
+        for i in range(args.days):
+            date = first + datetime.timedelta(days=i)
+            print(date.isoformat(), schedule.scheduled_word(date) or "-")
+        return 0
+    words = load_words_from_file(args.words) or load_words_from_file("words_5.txt")
+    if not words:
+        print("No word list found", file=sys.stderr)
+        return 1
+    if args.command == "build":
+        if os.path.exists(args.file) and not args.force:
+            print(f"{args.file} exists; use extend, or --force to replace it", file=sys.stderr)
+            return 1
+        schedule = DailySchedule.build(words, datetime.date.fromisoformat(args.start))
+        schedule.save(args.file)
+        print(f"{args.file}: {len(schedule)} days from {schedule.start.isoformat()} "
+              f"to {schedule.date_of(len(schedule) - 1).isoformat()}")
+    else:
+        schedule = DailySchedule.load(args.file)
+        added = schedule.extend(words)
+        schedule.save(args.file)
+        print(f"{args.file}: {added} words added, {len(schedule)} days "
+              f"to {schedule.date_of(len(schedule) - 1).isoformat()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
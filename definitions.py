@@ -0,0 +1,160 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from wordle_core import CACHE_DIR
+from tracing import traced, span, count
+
+# Point WORDLE_DICTIONARY_URL at a local stub server to test without network
+API_URL = os.environ.get("WORDLE_DICTIONARY_URL", "https://api.dictionaryapi.dev/api/v2/entries/en/{word}")
+OFFLINE_FILE = "definitions_offline.json"
+NOT_FOUND = "No definition found."
+
+def parse_definition(data):
+    if isinstance(data, list) and data and "meanings" in data[0]:
+        meanings = data[0]["meanings"]
+        if meanings and "definitions" in meanings[0]:
+            return meanings[0]["definitions"][0].get("definition", "") or None
+    return None
+
+class DefinitionCache:
+    # Lookup order: memory LRU, bundled offline file, on-disk cache, network.
+    # Definitions are stored as strings; a word the API has no entry for is
+    # stored as None so it is not fetched again. Network errors are not
+    # cached, so the next game can retry. The disk cache is append-only, one
+    # {"word": definition} line per fetch, so processes sharing it never
+    # overwrite each other's entries.
+    def __init__(self, url=API_URL, cache_file=None, offline_file=OFFLINE_FILE,
+                 max_entries=256, timeout=5):
+        self.url = url
+        self.cache_file = cache_file or os.path.join(CACHE_DIR, "definitions.jsonl")
+        self.offline_file = offline_file
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lru = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._offline = None
+        self._disk = None
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="definitions")
+
+    def _load_json(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _remember(self, word, definition):
+        self._lru[word] = definition
+        self._lru.move_to_end(word)
+        if len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _load_disk(self):
+        # Later lines win; a line cut short by a crash is skipped
+        disk = {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        disk.update(json.loads(line))
+                    except (ValueError, TypeError):
+                        pass
+        except OSError:
+            pass
+        return disk
+
+    def _append_disk(self, word, definition):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            # One write per line in append mode, so concurrent writers interleave whole lines
+            with open(self.cache_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps({word: definition}) + "\n")
+        except Exception:
+            pass
+
+    @traced("definition.fetch")
+    def _fetch(self, word):
+        import requests
+        resp = requests.get(self.url.format(word=word), timeout=self.timeout)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return parse_definition(resp.json())
+
+    def _resolve(self, word):
+        with self._lock:
+            if self._offline is None:
+                self._offline = self._load_json(self.offline_file)
+                self._disk = self._load_disk()
+            known = word in self._offline or word in self._disk
+            definition = self._offline.get(word, self._disk.get(word))
+        if not known:
+            try:
+                definition = self._fetch(word)
+            except Exception:
+                with self._lock:
+                    self._pending.pop(word, None)
+                return NOT_FOUND
+            with self._lock:
+                self._disk[word] = definition
+                self._append_disk(word, definition)
+        with self._lock:
+            self._remember(word, definition)
+            self._pending.pop(word, None)
+        return definition or NOT_FOUND
+
+    def prefetch(self, word):
+        # Start a background lookup; returns a Future, or None if cached
+        with self._lock:
+            if word in self._lru:
+                return None
+            future = self._pending.get(word)
+            if future is None:
+                future = self._pending[word] = self._executor.submit(self._resolve, word)
+            return future
+
+    def lookup(self, word):
+        # Non-blocking: the definition if known, else None
+        with self._lock:
+            if word in self._lru:
+                self._lru.move_to_end(word)
+                count("definition.hit")
+                return self._lru[word] or NOT_FOUND
+        return None
+
+    def get(self, word, timeout=None):
+        definition = self.lookup(word)
+        if definition is not None:
+            return definition
+        future = self.prefetch(word)
+        if future is None:
+            return self.lookup(word) or NOT_FOUND
+        count("definition.wait")
+        try:
+            # Time the caller spends blocked on a lookup
+            with span("definition.wait", word=word):
+                return future.result(timeout=timeout)
+        except Exception:
+            return NOT_FOUND
+
+_default = None
+_default_lock = threading.Lock()
+
+def default_cache():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = DefinitionCache()
+        return _default
+
+def prefetch_definition(word):
+    return default_cache().prefetch(word)
+
+def lookup_definition(word):
+    return default_cache().lookup(word)
+
+def get_definition(word, timeout=None):
+    return default_cache().get(word, timeout)
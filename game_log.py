@@ -0,0 +1,277 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from tracing import traced
+
+LOG_DIR = os.environ.get("WORDLE_GAME_LOG", "game_log")
+MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+SEGMENT_NAME = re.compile(r"^games-(\d{6})\.jsonl$")
+EVENT_VERSION = 1
+
+def game_event(player, state, daily=False, ended=None):
+    # One finished game as a compact dict: guesses as words, marks as
+    # base-3 codes, times as epoch seconds
+    return {
+        "v": EVENT_VERSION,
+        "player": player,
+        "target": state.target,
+        "guesses": state.guesses,
+        "codes": list(state.codes),
+        "won": state.won,
+        "rows": state.rows,
+        "hard": state.hard,
+        "daily": bool(daily),
+        "started": round(state.started, 3),
+        "ended": round(time.time() if ended is None else ended, 3),
+    }
+
+def segment_path(directory, number):
+    return os.path.join(directory, f"games-{number:06d}.jsonl")
+
+def list_segments(directory):
+    # [(number, path)] in write order
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    found = []
+    for name in names:
+        m = SEGMENT_NAME.match(name)
+        if m:
+            found.append((int(m.group(1)), os.path.join(directory, name)))
+    return sorted(found)
+
+class GameLog:
+    # Append-only JSONL, one line per finished game. The newest segment is
+    # appended to until it passes max_bytes; older segments are never
+    # rewritten, so readers can tail the log while games are written. Each
+    # line is written with a single O_APPEND write, so processes sharing a
+    # log do not interleave records.
+    def __init__(self, directory=LOG_DIR, max_bytes=MAX_SEGMENT_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._number = None
+        self._opened = None
+
+    def _current(self):
+        if self._number is None:
+            segments = list_segments(self.directory)
+            self._number = segments[-1][0] if segments else 1
+        path = segment_path(self.directory, self._number)
+        try:
+            if os.path.getsize(path) >= self.max_bytes:
+                self._number += 1
+                path = segment_path(self.directory, self._number)
+        except FileNotFoundError:
+            pass
+        return path
+
+    @traced("log.append")
+    def append(self, event):
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._current()
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if path != self._opened:
+                    # A crash mid-write leaves a torn last line; end it so
+                    # it does not swallow this record
+                    size = os.fstat(fd).st_size
+                    if size:
+                        os.lseek(fd, size - 1, os.SEEK_SET)
+                        if os.read(fd, 1) != b"\n":
+                            line = b"\n" + line
+                    self._opened = path
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def record(self, player, state, daily=False):
+        self.append(game_event(player, state, daily))
+
+def read_events(directory=LOG_DIR, start=(0, 0)):
+    # Yield (event, position after it) from position (segment number, byte
+    # offset) on, one line at a time. A trailing line without a newline is
+    # a write in progress and is left for the next read; a line that does
+    # not parse is skipped.
+    first, offset = start
+    for number, path in list_segments(directory):
+        if number < first:
+            continue
+        with open(path, "rb") as f:
+            if number == first and offset:
+                f.seek(offset)
+            pos = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                pos += len(line)
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                yield event, (number, pos)
+
+def _new_player():
+    return {"games": 0, "wins": 0, "total_guesses": 0, "solve_seconds": 0.0,
+            "distribution": {}, "hard_games": 0, "hard_wins": 0, "daily_games": 0, "daily_wins": 0}
+
+def _new_word():
+    return {"plays": 0, "wins": 0, "total_guesses": 0}
+
+class StatsAggregator:
+    # Derived stats built one event at a time: per player (guess
+    # distribution, solve time, hard/daily splits) and per target word
+    # (plays, wins, guesses). Memory grows with players and words, never
+    # with the length of the history. The state and the log position it
+    # covers are saved together, so update() only reads new events.
+    def __init__(self, path=None):
+        self.path = path
+        self.position = (0, 0)
+        self.games = 0
+        self.players = {}
+        self.words = {}
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                saved = json.load(f)
+            self.position = tuple(saved["position"])
+            self.games = saved["games"]
+            self.players = saved["players"]
+            self.words = saved["words"]
+
+    def add(self, event):
+        won = event["won"]
+        guesses = len(event["guesses"])
+        self.games += 1
+        p = self.players.get(event["player"])
+        if p is None:
+            p = self.players[event["player"]] = _new_player()
+        p["games"] += 1
+        if event.get("hard"):
+            p["hard_games"] += 1
+        if event.get("daily"):
+            p["daily_games"] += 1
+        w = self.words.get(event["target"])
+        if w is None:
+            w = self.words[event["target"]] = _new_word()
+        w["plays"] += 1
+        if won:
+            p["wins"] += 1
+            p["total_guesses"] += guesses
+            p["solve_seconds"] += max(0.0, event["ended"] - event["started"])
+            key = str(guesses)
+            p["distribution"][key] = p["distribution"].get(key, 0) + 1
+            if event.get("hard"):
+                p["hard_wins"] += 1
+            if event.get("daily"):
+                p["daily_wins"] += 1
+            w["wins"] += 1
+            w["total_guesses"] += guesses
+
+    def update(self, directory=LOG_DIR):
+        # Fold in every event written since the last update; returns how many
+        added = 0
+        for event, position in read_events(directory, self.position):
+            self.add(event)
+            self.position = position
+            added += 1
+        if added and self.path:
+            self.save()
+        return added
+
+    def save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"position": list(self.position), "games": self.games,
+                       "players": self.players, "words": self.words}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def hardest_words(self, n=10, min_plays=1):
+        # Lowest win rate first, then most guesses per win
+        rows = [(w["wins"] / w["plays"], -(w["total_guesses"] / w["wins"]) if w["wins"] else -99, word)
+                for word, w in self.words.items() if w["plays"] >= min_plays]
+        return [word for _, _, word in sorted(rows)[:n]]
+
+    def report(self, player=None, top=10, min_plays=1):
+        players = {player: self.players[player]} if player in self.players else ({} if player else self.players)
+        summary = _new_player()
+        for p in players.values():
+            for key, value in p.items():
+                if key == "distribution":
+                    for n, count in value.items():
+                        summary["distribution"][n] = summary["distribution"].get(n, 0) + count
+                else:
+                    summary[key] += value
+        wins = summary["wins"]
+        return {
+            "player": player,
+            "games": summary["games"],
+            "wins": wins,
+            "win_rate": wins / summary["games"] if summary["games"] else 0.0,
+            "average_guesses": summary["total_guesses"] / wins if wins else 0.0,
+            "average_solve_seconds": summary["solve_seconds"] / wins if wins else 0.0,
+            "distribution": dict(sorted(summary["distribution"].items(), key=lambda kv: int(kv[0]))),
+            "hard": [summary["hard_wins"], summary["hard_games"]],
+            "daily": [summary["daily_wins"], summary["daily_games"]],
+            "hardest_words": self.hardest_words(top, min_plays) if player is None else [],
+        }
+
+# Shared per-process log, like the definitions cache
+_default_log = None
+
+def default_log():
+    global _default_log
+    if _default_log is None:
+        _default_log = GameLog()
+    return _default_log
+
+def log_game(player, state, daily=False):
+    # Best effort: a full disk or read-only directory must not end the game
+    try:
+        default_log().record(player, state, daily)
+        return True
+    except OSError:
+        return False
+
+def print_report(report, elapsed, events):
+    who = report["player"] or "all players"
+    print(f"Replayed {events} events in {elapsed:.2f}s ({events / elapsed if elapsed else 0:.0f}/s); "
+          f"{report['games']} games for {who}")
+    print(f"Win rate: {report['win_rate']:.1%}  Average guesses: {report['average_guesses']:.2f}  "
+          f"Average solve time: {report['average_solve_seconds']:.1f}s")
+    print(f"Hard mode: {report['hard'][0]}/{report['hard'][1]} won  "
+          f"Daily: {report['daily'][0]}/{report['daily'][1]} won")
+    most = max(report["distribution"].values(), default=0) or 1
+    for n, count in report["distribution"].items():
+        print(f"  {n}: {count:6d} {'#' * round(40 * count / most)}")
+    if report["hardest_words"]:
+        print(f"Hardest words: {', '.join(report['hardest_words'])}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the game log and report derived stats.")
+    parser.add_argument("--dir", default=LOG_DIR)
+    parser.add_argument("--player", help="report one player only")
+    parser.add_argument("--state", help="aggregator checkpoint: resume from it and save back to it")
+    parser.add_argument("--top", type=int, default=10, help="hardest words to list")
+    parser.add_argument("--min-plays", type=int, default=3, help="plays before a word counts as hard")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+    aggregator = StatsAggregator(args.state)
+    t0 = time.perf_counter()
+    events = aggregator.update(args.dir)
+    elapsed = time.perf_counter() - t0
+    report = aggregator.report(args.player, args.top, args.min_plays)
+    print_report(report, elapsed, events)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
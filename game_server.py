@@ -0,0 +1,397 @@
+import sys
+import json
+import base64
+import signal
+import struct
+import time
+import random
+import asyncio
+import hashlib
+import inspect
+import secrets
+import argparse
+from collections import OrderedDict
+from urllib.parse import unquote
+from word_lists import WordListWatcher, describe_change
+from stats_store import open_stats_store, default_stats, apply_game_result
+from leaderboard import LeaderboardIndex
+from game_state import GameState
+from game_log import GameLog
+from tracing import traced
+from daily_schedule import daily_word
+from answer_sampler import pick_answer
+from wordle_core import ROWS
+
+WORDS_FILE = "words_5.txt"
+ANSWERS_FILE = "answers_5.txt"
+STATS_FILE = "server_stats.db"
+MAX_BODY = 64 * 1024
+MAX_HEADERS = 64
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Answers must not be predictable from earlier games
+_rng = random.SystemRandom()
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large"}
+
+# --- HTTP/1.1 and WebSocket framing over asyncio streams ---
+
+async def read_request(reader):
+    # (method, path, headers, body), or None when the client hung up
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ValueError("malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise ValueError("too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise ValueError("body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+def write_response(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+    )
+
+def websocket_accept(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode("latin-1")).digest()).decode("ascii")
+
+async def accept_websocket(writer, headers):
+    # Server side of the upgrade, after read_request() returned its headers
+    writer.write(
+        "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Accept: {websocket_accept(headers.get('sec-websocket-key', ''))}\r\n\r\n"
+        .encode("latin-1")
+    )
+    await writer.drain()
+
+async def open_websocket(host, port, path="/ws"):
+    # Client side: (reader, writer) ready for encode_frame(mask=True)/read_frame
+    reader, writer = await asyncio.open_connection(host, port)
+    key = secrets.token_urlsafe(16)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("latin-1")
+    )
+    status = await reader.readline()
+    if b" 101 " not in status:
+        writer.close()
+        raise ConnectionError(f"WebSocket upgrade failed: {status!r}")
+    while await reader.readline() not in (b"\r\n", b""):
+        pass
+    return reader, writer
+
+def encode_frame(payload, opcode=1, mask=False):
+    # One unfragmented frame; clients must mask, servers must not
+    head = bytearray([0x80 | opcode])
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        head.append(bit | n)
+    elif n < 1 << 16:
+        head.append(bit | 126)
+        head += struct.pack(">H", n)
+    else:
+        head.append(bit | 127)
+        head += struct.pack(">Q", n)
+    if mask:
+        key = secrets.token_bytes(4)
+        return bytes(head) + key + _apply_mask(payload, key)
+    return bytes(head) + payload
+
+def _apply_mask(data, key):
+    # XOR with the repeating 4-byte key as one big-int operation
+    n = len(data)
+    if not n:
+        return data
+    stream = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(n, "big")
+
+async def read_frame(reader):
+    # (opcode, payload) of the next frame; continuation frames are joined
+    message, first_opcode = b"", None
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        opcode, n = b0 & 0x0F, b1 & 0x7F
+        if n == 126:
+            n = struct.unpack(">H", await reader.readexactly(2))[0]
+        elif n == 127:
+            n = struct.unpack(">Q", await reader.readexactly(8))[0]
+        if n > MAX_BODY:
+            raise ValueError("frame too large")
+        key = await reader.readexactly(4) if b1 & 0x80 else None
+        payload = await reader.readexactly(n)
+        if key:
+            payload = _apply_mask(payload, key)
+        if opcode >= 8:
+            # Control frames may arrive between fragments
+            return opcode, payload
+        if first_opcode is None:
+            first_opcode = opcode
+        message += payload
+        if b0 & 0x80:
+            return first_opcode, message
+
+_signatures = {}
+
+def accepts(handler, *args, **kwargs):
+    # Whether the bound method handler can be called with these arguments.
+    # Checked before the call, so a TypeError raised inside a handler is a
+    # bug that surfaces, not a "bad arguments" reply.
+    func = handler.__func__
+    signature = _signatures.get(func)
+    if signature is None:
+        signature = _signatures[func] = inspect.signature(func)
+    try:
+        signature.bind(None, *args, **kwargs)
+    except TypeError:
+        return False
+    return True
+
+# --- Game service ---
+
+class GameServer:
+    # Many games in one process. Each game is a GameState keyed by a random
+    # id; the oldest idle games are dropped once max_games is reached.
+    # HTTP and WebSocket requests go through the same call(op, args).
+    # word_lists is a WordListWatcher: new games start on its current
+    # snapshot and running games keep theirs.
+    def __init__(self, word_lists, store=None, max_games=100_000, log=None):
+        self.word_lists = word_lists
+        self.store = store
+        self.log = log
+        self.leaderboard = LeaderboardIndex(store.load_all() if store else {})
+        self.max_games = max_games
+        self.games = OrderedDict()
+        self.requests = 0
+
+    def _game(self, game_id):
+        entry = self.games.get(game_id)
+        if entry is not None:
+            self.games.move_to_end(game_id)
+        return entry
+
+    def _state_payload(self, game_id, player, state):
+        payload = {
+            "game": game_id,
+            "player": player,
+            "hard": state.hard,
+            "row": state.row,
+            "rows": state.rows,
+            "over": state.over,
+            "won": state.won,
+            "guesses": [{"word": word, "marks": marks} for word, marks in state.history()],
+        }
+        if state.over:
+            payload["answer"] = state.target
+        return payload
+
+    async def call(self, op, args):
+        # (HTTP status, payload) for one request
+        self.requests += 1
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            return 404, {"error": f"unknown op {op!r}"}
+        if not accepts(handler, **args):
+            return 400, {"error": f"bad arguments for {op!r}"}
+        return await handler(**args)
+
+    @traced("server.new")
+    async def op_new(self, player="Player", daily=False, hard=False):
+        lists = self.word_lists.current()
+        words = lists.answers
+        target = daily_word(lists.index, words) if daily else pick_answer(lists, str(player), _rng)
+        state = GameState.for_word(lists.index, target, ROWS, bool(hard))
+        game_id = secrets.token_hex(8)
+        self.games[game_id] = (str(player), state, bool(daily))
+        while len(self.games) > self.max_games:
+            self.games.popitem(last=False)
+        return 201, self._state_payload(game_id, player, state)
+
+    @traced("server.state")
+    async def op_state(self, game):
+        entry = self._game(game)
+        if entry is None:
+            return 404, {"error": "no such game"}
+        player, state, _ = entry
+        return 200, self._state_payload(game, player, state)
+
+    @traced("server.guess")
+    async def op_guess(self, game, word):
+        entry = self._game(game)
+        if entry is None:
+            return 404, {"error": "no such game"}
+        player, state, daily = entry
+        error = state.validate(str(word).lower())
+        if error:
+            return 400, {"error": error}
+        state.submit(str(word).lower())
+        payload = self._state_payload(game, player, state)
+        if state.over:
+            payload["stats"] = await self._record_game(player, state, daily)
+        return 200, payload
+
+    @traced("server.stats")
+    async def op_stats(self, player):
+        return 200, {"player": player, "stats": self.leaderboard.stats.get(player, default_stats())}
+
+    def _persist(self, player, state, daily):
+        guesses = state.row if state.won else 0
+        seconds = time.time() - state.started
+        if self.log is not None:
+            self.log.record(player, state, daily)
+        if self.store is None:
+            return apply_game_result(dict(self.leaderboard.stats.get(player, default_stats())),
+                                     state.won, guesses, state.hard, daily, seconds)
+        return self.store.record_game(player, state.won, guesses, state.hard, daily, seconds)
+
+    async def _record_game(self, player, state, daily):
+        if self.store is None and self.log is None:
+            stats = self._persist(player, state, daily)
+        else:
+            # SQLite commits and log writes block, so they run on the
+            # default thread pool
+            loop = asyncio.get_running_loop()
+            stats = await loop.run_in_executor(None, self._persist, player, state, daily)
+        self.leaderboard.update(player, stats)
+        return stats
+
+    def route(self, method, path, body):
+        # (op, args) for an HTTP request, or (None, (status, payload))
+        parts = [unquote(p) for p in path.split("?", 1)[0].strip("/").split("/")]
+        try:
+            args = json.loads(body) if body else {}
+        except ValueError:
+            return None, (400, {"error": "invalid JSON"})
+        if not isinstance(args, dict):
+            return None, (400, {"error": "expected a JSON object"})
+        if parts == ["games"]:
+            return ("new", args) if method == "POST" else (None, (405, {"error": "use POST"}))
+        if len(parts) == 2 and parts[0] == "games":
+            return ("state", {"game": parts[1]}) if method == "GET" else (None, (405, {"error": "use GET"}))
+        if len(parts) == 3 and parts[0] == "games" and parts[2] == "guess":
+            if method != "POST":
+                return None, (405, {"error": "use POST"})
+            return "guess", {"game": parts[1], "word": args.get("word", "")}
+        if len(parts) == 2 and parts[0] == "stats":
+            return "stats", {"player": parts[1]}
+        return None, (404, {"error": "not found"})
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ValueError as e:
+                    write_response(writer, 400, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self.handle_websocket(reader, writer, headers)
+                    break
+                op, args = self.route(method, path, body)
+                status, payload = await self.call(op, args) if op else args
+                keep_alive = headers.get("connection", "").lower() != "close"
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_websocket(self, reader, writer, headers):
+        # Each text message is {"op": ..., "id": ..., **args}; the reply
+        # echoes "id" and carries the HTTP status as "status"
+        await accept_websocket(writer, headers)
+        while True:
+            try:
+                opcode, payload = await read_frame(reader)
+            except ValueError:
+                writer.write(encode_frame(struct.pack(">H", 1009), opcode=8))
+                return
+            if opcode == 8:
+                writer.write(encode_frame(payload[:2], opcode=8))
+                return
+            if opcode == 9:
+                writer.write(encode_frame(payload, opcode=10))
+                continue
+            if opcode != 1:
+                continue
+            try:
+                message = json.loads(payload)
+            except ValueError:
+                message = None
+            # Like route(): anything but a JSON object is a 400, not a crash
+            if not isinstance(message, dict) or "op" not in message:
+                status, reply, request_id = 400, {"error": "expected {\"op\": ...}"}, None
+            else:
+                op = message.pop("op")
+                request_id = message.pop("id", None)
+                status, reply = await self.call(op, message)
+            reply = dict(reply, status=status, id=request_id)
+            writer.write(encode_frame(json.dumps(reply, separators=(",", ":")).encode("utf-8")))
+            await writer.drain()
+
+def _print_reload(old, new):
+    print(f"Reloaded word lists: {describe_change(old, new)}", flush=True)
+
+async def serve(host="127.0.0.1", port=8765, words_file=WORDS_FILE, stats_file=STATS_FILE, log_dir=None,
+                answers_file=ANSWERS_FILE, reload_interval=5.0):
+    word_lists = WordListWatcher(words_file, answers_file, reload_interval, on_change=_print_reload)
+    lists = word_lists.current()
+    if reload_interval > 0:
+        word_lists.start()
+    store = open_stats_store(stats_file) if stats_file else None
+    game_server = GameServer(word_lists, store, log=GameLog(log_dir) if log_dir else None)
+    server = await asyncio.start_server(game_server.handle_connection, host, port)
+    print(f"Serving {len(lists.index)} words ({len(lists.answers)} answers) on "
+          f"http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    # Stop cleanly on SIGTERM so atexit hooks (trace export) still run
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except NotImplementedError:
+        pass  # Windows: Ctrl+C only
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        if store is not None:
+            store.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Wordle games over HTTP and WebSocket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--words", default=WORDS_FILE)
+    parser.add_argument("--answers", default=ANSWERS_FILE, help="optional answer list (default: any word)")
+    parser.add_argument("--reload", type=float, default=5.0, help="seconds between word list checks (0: never)")
+    parser.add_argument("--stats", default=STATS_FILE, help="stats store path ('' keeps stats in memory)")
+    parser.add_argument("--log", help="append finished games to this game log directory")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.words, args.stats, args.log, args.answers, args.reload))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
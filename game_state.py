@@ -0,0 +1,277 @@
+import time
+import struct
+from array import array
+from tracing import traced
+from constraints import Constraints, letter_index
+from word_trie import DEAD
+from wordle_core import ROWS, COLS, ALL_GREEN, score_guess, encode_marks, decode_pattern
+
+# to_bytes() layout: version, flags (bit 0 = hard mode), rows, target id,
+# start time, then every guess id followed by every mark code
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<BBBId")
+BOARD_COUNTS = (4, 8, 16, 32)
+UNPLAYED = 255  # MultiGameState code for a board solved by an earlier guess
+
+def multi_rows(boards):
+    # One guess per board plus five: Quordle's 9, Octordle's 13
+    return boards + 5
+
+class TypedWord:
+    # Letter-by-letter input for the Tk boards. Each key moves one step
+    # through the word trie, so an impossible prefix shows at once and
+    # Enter already knows the word's id. Needs typed, _path, index, ids
+    # and over on the game class.
+    __slots__ = ()
+
+    def type_letter(self, ch):
+        if len(self.typed) >= COLS or self.over:
+            return False
+        ch = ch.lower()
+        node, offset = self._path[-1]
+        child, skip = self.index.trie().step(node, ch)
+        self._path.append((child, offset + skip))
+        self.typed += ch
+        return True
+
+    def backspace(self):
+        if not self.typed:
+            return False
+        self._path.pop()
+        self.typed = self.typed[:-1]
+        return True
+
+    def clear_typed(self):
+        self.typed = ""
+        del self._path[1:]
+
+    def typed_is_prefix(self):
+        # Whether some word starts with the typed letters
+        return self._path[-1][0] != DEAD
+
+    def typed_id(self):
+        # Id of the typed word, or None if it is not in the word list
+        node, offset = self._path[-1]
+        if len(self.typed) == COLS and node != DEAD and self.index.trie().final[node]:
+            return offset
+        return None
+
+    def _word_id(self, word):
+        return self.typed_id() if word == self.typed else self.index.id_of(word)
+
+    def _check_word(self, word):
+        # Rule checks every game shares: (error or None, word id)
+        if self.over:
+            return "Game over.", None
+        if len(word) < COLS:
+            return "Not enough letters.", None
+        if len(word) != COLS or not word.isalpha():
+            return "Please enter a valid 5-letter word.", None
+        word_id = self._word_id(word)
+        if word_id is None:
+            return "Not in word list.", None
+        if word_id in self.ids:
+            return "Already guessed.", word_id
+        return None, word_id
+
+class GameState(TypedWord):
+    # The rules of one game, shared by both frontends. Guesses are held as
+    # word ids and base-3 mark codes (0-242), so a game costs a few dozen
+    # bytes and round-trips through to_bytes()/from_bytes(). Ids refer to
+    # the WordIndex the game was started with.
+    __slots__ = ("index", "target_id", "rows", "hard", "ids", "codes", "typed", "started",
+                 "_constraints", "_path")
+
+    def __init__(self, index, target_id, rows=ROWS, hard=False, started=None):
+        self.index = index
+        self.target_id = target_id
+        self.rows = rows
+        self.hard = hard
+        self.started = time.time() if started is None else started
+        self.ids = array("I")
+        self.codes = bytearray()
+        self.typed = ""
+        self._constraints = None
+        # (trie node, id offset) after each typed letter, root first
+        self._path = [(0, 0)]
+
+    @classmethod
+    def for_word(cls, index, word, rows=ROWS, hard=False):
+        return cls(index, index.id_of(word), rows, hard)
+
+    @property
+    def target(self):
+        return self.index.word_of(self.target_id)
+
+    @property
+    def row(self):
+        return len(self.codes)
+
+    @property
+    def won(self):
+        return bool(self.codes) and self.codes[-1] == ALL_GREEN
+
+    @property
+    def over(self):
+        return self.won or len(self.codes) >= self.rows
+
+    @property
+    def guesses(self):
+        return [self.index.word_of(i) for i in self.ids]
+
+    @property
+    def marks(self):
+        return [decode_pattern(code) for code in self.codes]
+
+    def history(self):
+        # [(guess, marks), ...] in the order they were played
+        return [(self.index.word_of(i), decode_pattern(code)) for i, code in zip(self.ids, self.codes)]
+
+    def constraints(self):
+        # Built from the history on first use, then kept up to date
+        if self._constraints is None:
+            self._constraints = Constraints.from_history(self.history())
+        return self._constraints
+
+    def candidate_ids(self):
+        # Ids of every word that fits all marks so far
+        return letter_index(self.index).ids(self.constraints())
+
+    def candidate_count(self):
+        return letter_index(self.index).count(self.constraints())
+
+    def legal_guess_ids(self):
+        # Ids hard mode allows as the next guess, or None if any word will do.
+        # Fitting every clue is the same test as being a candidate.
+        if not self.hard or not self.codes:
+            return None
+        return self.candidate_ids()
+
+    def validate(self, word):
+        # Why the guess would be rejected, or None if it can be played
+        error, _ = self._check_word(word)
+        if error:
+            return error
+        if self.hard:
+            # Hard mode: every guess must fit every clue so far
+            broken = self.constraints().violation(word)
+            if broken:
+                return f"Hard Mode: {broken}!"
+        return None
+
+    @traced("game.submit")
+    def submit(self, word=None):
+        # Play word (default: the typed letters) and return its marks
+        word = (self.typed if word is None else word).lower()
+        error = self.validate(word)
+        if error:
+            raise ValueError(error)
+        marks = score_guess(word, self.target)
+        self.ids.append(self._word_id(word))
+        self.codes.append(encode_marks(marks))
+        if self._constraints is not None:
+            self._constraints.add(word, marks)
+        self.clear_typed()
+        return marks
+
+    def to_bytes(self):
+        # The typed-but-unsubmitted letters are not saved
+        n = len(self.codes)
+        return (_HEADER.pack(FORMAT_VERSION, int(self.hard), self.rows, self.target_id, self.started)
+                + struct.pack(f"<{n}I", *self.ids) + bytes(self.codes))
+
+    @classmethod
+    def from_bytes(cls, index, data):
+        version = data[0] if data else None
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported game state version {version}")
+        _, flags, rows, target_id, started = _HEADER.unpack_from(data)
+        n = (len(data) - _HEADER.size) // 5
+        state = cls(index, target_id, rows, bool(flags & 1), started)
+        state.ids = array("I", struct.unpack_from(f"<{n}I", data, _HEADER.size))
+        state.codes = bytearray(data[_HEADER.size + 4 * n:])
+        return state
+
+class MultiGameState(TypedWord):
+    # Several boards played with the same guesses (Quordle, Octordle and
+    # beyond). codes holds one mark code per board for every guess, row by
+    # row, with UNPLAYED for boards already solved. A guess is scored
+    # against every unsolved target in one vectorized pass.
+    __slots__ = ("index", "target_ids", "rows", "ids", "codes", "solved", "typed", "started",
+                 "_path", "_letters")
+
+    def __init__(self, index, target_ids, rows=None, started=None):
+        # NumPy stays off the Tk startup path until a multi-board game
+        from patterns import words_to_array
+        self.index = index
+        self.target_ids = array("I", target_ids)
+        self.rows = multi_rows(len(self.target_ids)) if rows is None else rows
+        self.started = time.time() if started is None else started
+        self.ids = array("I")
+        self.codes = bytearray()
+        # Guess number that solved each board, 0 while unsolved
+        self.solved = bytearray(len(self.target_ids))
+        self.typed = ""
+        self._path = [(0, 0)]
+        # (boards, 5) letter codes of the targets, for score_block
+        self._letters = words_to_array(self.targets)
+
+    @classmethod
+    def for_words(cls, index, words, rows=None):
+        return cls(index, [index.id_of(w) for w in words], rows)
+
+    @property
+    def boards(self):
+        return len(self.target_ids)
+
+    @property
+    def targets(self):
+        return [self.index.word_of(i) for i in self.target_ids]
+
+    @property
+    def row(self):
+        return len(self.ids)
+
+    @property
+    def solved_count(self):
+        return self.boards - self.solved.count(0)
+
+    @property
+    def won(self):
+        return 0 not in self.solved
+
+    @property
+    def over(self):
+        return self.won or len(self.ids) >= self.rows
+
+    @property
+    def guesses(self):
+        return [self.index.word_of(i) for i in self.ids]
+
+    def row_codes(self, row):
+        n = self.boards
+        return self.codes[row * n:(row + 1) * n]
+
+    def validate(self, word):
+        error, _ = self._check_word(word)
+        return error
+
+    @traced("game.submit_multi")
+    def submit(self, word=None):
+        # Play word on every unsolved board; returns this row's codes
+        word = (self.typed if word is None else word).lower()
+        error = self.validate(word)
+        if error:
+            raise ValueError(error)
+        from patterns import words_to_array, score_block
+        unsolved = [b for b, row in enumerate(self.solved) if not row]
+        scored = score_block(words_to_array([word]), self._letters[unsolved])[0]
+        codes = bytearray([UNPLAYED]) * self.boards
+        for b, code in zip(unsolved, scored.tolist()):
+            codes[b] = code
+            if code == ALL_GREEN:
+                self.solved[b] = len(self.ids) + 1
+        self.ids.append(self._word_id(word))
+        self.codes += codes
+        self.clear_typed()
+        return codes
@@ -0,0 +1,95 @@
+import threading
+from bisect import bisect_left, insort
+
+def _win_rate(stats):
+    games = stats.get("games", 0)
+    return stats.get("wins", 0) / games if games else None
+
+def _avg_guesses(stats):
+    total = stats.get("total_guesses", 0)
+    return total / stats["wins"] if total and stats.get("wins") else None
+
+# name: (label, value function, higher is better). Players whose value is
+# None (no games, no recorded guesses) are left off that board.
+METRICS = {
+    "max_streak": ("Max Streak", lambda s: s.get("max_streak", 0), True),
+    "wins": ("Wins", lambda s: s.get("wins", 0), True),
+    "win_rate": ("Win Rate", _win_rate, True),
+    "avg_guesses": ("Avg Guesses", _avg_guesses, False),
+}
+
+def format_value(metric, value):
+    if metric == "win_rate":
+        return f"{value:.0%}"
+    if metric == "avg_guesses":
+        return f"{value:.2f}"
+    return str(value)
+
+class LeaderboardIndex:
+    # One sorted list of (sort key, player) per metric. update() moves a
+    # single player with two binary searches, so opening a leaderboard page
+    # or looking up a rank never re-sorts. rebuild() is the full sort, used
+    # only when loading from the stats store.
+    def __init__(self, all_stats=None):
+        self._lock = threading.Lock()
+        self.rebuild(all_stats or {})
+
+    def _key(self, metric, stats):
+        _, value_of, higher_better = METRICS[metric]
+        value = value_of(stats)
+        if value is None:
+            return None
+        return -value if higher_better else value
+
+    def rebuild(self, all_stats):
+        with self._lock:
+            self.stats = {player: dict(stats) for player, stats in all_stats.items()}
+            self._keys = {}
+            self._boards = {}
+            for metric in METRICS:
+                keys = {}
+                for player, stats in self.stats.items():
+                    key = self._key(metric, stats)
+                    if key is not None:
+                        keys[player] = key
+                self._keys[metric] = keys
+                self._boards[metric] = sorted((key, player) for player, key in keys.items())
+
+    def update(self, player, stats):
+        with self._lock:
+            self.stats[player] = dict(stats)
+            for metric in METRICS:
+                keys, board = self._keys[metric], self._boards[metric]
+                old = keys.pop(player, None)
+                if old is not None:
+                    del board[bisect_left(board, (old, player))]
+                new = self._key(metric, stats)
+                if new is not None:
+                    keys[player] = new
+                    insort(board, (new, player))
+
+    def __len__(self):
+        return len(self.stats)
+
+    def size(self, metric):
+        return len(self._boards[metric])
+
+    def page(self, metric, page=0, per_page=10):
+        # [(rank, player, value, stats), ...] for one page of the board
+        _, value_of, _ = METRICS[metric]
+        with self._lock:
+            start = page * per_page
+            rows = self._boards[metric][start:start + per_page]
+            return [(start + i + 1, player, value_of(self.stats[player]), self.stats[player])
+                    for i, (_, player) in enumerate(rows)]
+
+    def top(self, metric, k=10):
+        return self.page(metric, 0, k)
+
+    def rank(self, metric, player):
+        # 1-based rank, or None if the player is not on this board
+        with self._lock:
+            key = self._keys[metric].get(player)
+            if key is None:
+                return None
+            return bisect_left(self._boards[metric], (key, player)) + 1
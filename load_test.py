@@ -0,0 +1,179 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from word_index import load_word_index
+from game_server import WORDS_FILE, read_frame, encode_frame, open_websocket
+
+class HttpClient:
+    # One keep-alive HTTP/1.1 connection
+    def __init__(self, reader, writer, host):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, host)
+
+    async def request(self, op, args):
+        if op == "new":
+            method, path, body = "POST", "/games", args
+        elif op == "guess":
+            method, path, body = "POST", f"/games/{args['game']}/guess", {"word": args["word"]}
+        elif op == "state":
+            method, path, body = "GET", f"/games/{args['game']}", None
+        else:
+            method, path, body = "GET", f"/stats/{args['player']}", None
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+
+class WebSocketClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+
+    @classmethod
+    async def connect(cls, host, port):
+        return cls(*await open_websocket(host, port))
+
+    async def request(self, op, args):
+        self.next_id += 1
+        message = dict(args, op=op, id=self.next_id)
+        self.writer.write(encode_frame(json.dumps(message).encode("utf-8"), mask=True))
+        _, payload = await read_frame(self.reader)
+        reply = json.loads(payload)
+        return reply.pop("status"), reply
+
+    async def close(self):
+        self.writer.write(encode_frame(b"\x03\xe8", opcode=8, mask=True))
+        self.writer.close()
+
+async def play_games(client, words, rng, deadline, latencies, errors, hard):
+    # Play whole games with random guesses until the deadline
+    player = f"load-{rng.randrange(1000)}"
+    games = 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        status, state = await client.request("new", {"player": player, "hard": hard})
+        latencies.append(time.perf_counter() - t0)
+        if status != 201:
+            errors.append(status)
+            continue
+        while not state["over"] and time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            status, reply = await client.request("guess", {"game": state["game"], "word": rng.choice(words)})
+            latencies.append(time.perf_counter() - t0)
+            if status == 200:
+                state = reply
+            elif status != 400:
+                # 400 is a rejected guess (already played, hard mode)
+                errors.append(status)
+                break
+        games += 1
+    return games
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+async def run(host, port, connections, duration, transport, hard, seed, words_file):
+    index, _ = load_word_index(words_file)
+    words = index.words
+    client_cls = WebSocketClient if transport == "ws" else HttpClient
+    clients = [await client_cls.connect(host, port) for _ in range(connections)]
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+    try:
+        games = await asyncio.gather(*(
+            play_games(c, words, random.Random(seed + i), deadline, latencies, errors, hard)
+            for i, c in enumerate(clients)
+        ))
+    finally:
+        for c in clients:
+            await c.close()
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "transport": transport,
+        "connections": connections,
+        "requests": len(latencies),
+        "games": sum(games),
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "requests_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": 1000 * percentile(latencies, 0.50),
+        "p99_ms": 1000 * percentile(latencies, 0.99),
+        "max_ms": 1000 * latencies[-1] if latencies else 0.0,
+    }
+
+def print_report(report):
+    print(f"Transport: {report['transport']}  Connections: {report['connections']}  "
+          f"Elapsed: {report['elapsed']:.2f}s")
+    print(f"Requests: {report['requests']}  ({report['requests_per_sec']:.0f} req/s)  "
+          f"Games: {report['games']}  Errors: {report['errors']}")
+    print(f"Latency: p50 {report['p50_ms']:.2f} ms  p99 {report['p99_ms']:.2f} ms  "
+          f"max {report['max_ms']:.2f} ms")
+
+def spawn_server(words_file, script="game_server.py", args=("--stats", "")):
+    # Start script on a free port (game_server.py with in-memory stats by default)
+    proc = subprocess.Popen([sys.executable, script, "--port", "0", "--words", words_file, *args],
+                            stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("Serving"):
+        proc.kill()
+        raise RuntimeError(f"{script} did not start")
+    return proc, int(line.rsplit(":", 1)[1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test game_server.py on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spawn", action="store_true", help="start a server for the run instead of using --port")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--transport", choices=("http", "ws"), default="http")
+    parser.add_argument("--hard", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--words", default=WORDS_FILE)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+    proc, port = spawn_server(args.words) if args.spawn else (None, args.port)
+    try:
+        report = asyncio.run(run(args.host, port, args.connections, args.duration, args.transport,
+                                 args.hard, args.seed, args.words))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,33 @@
+import time
+_start_time = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import simpledialog
-import random
 import os
-from collections import Counter
+import sys
 import string
-import json
-import hashlib
-import datetime
-import requests  # Add to imports
+import threading
 from tkinter import font as tkfont
+from word_lists import WordListWatcher, ANSWERS_FILE
+from stats_store import open_stats_store, default_stats, apply_game_result, analytics
+from leaderboard import LeaderboardIndex, METRICS, format_value
+from board_render import WidgetRenderer
+from animation import Animator
+from canvas_board import CanvasBoard
+from game_state import GameState, BOARD_COUNTS, multi_rows
+from game_log import log_game
+from tracing import traced, game_profiler
+from daily_schedule import daily_word
+from answer_sampler import pick_answer
+from wordle_core import ROWS, COLS
 
 COLORS = {
     "bg": "#e3f2fd",           # Soft blue
     "board_bg": "#e3f2fd",     # Match board background
     "tile_empty": "#e0e0e0",   # Lighter tile
     "tile_text": "#22223b",    # Dark text for empty tiles
+    "tile_invalid": "#d32f2f", # Typed letters no word starts with
     "green": "#6aaa64",
     "yellow": "#c9b458",
     "gray": "#bdbdbd",         # Softer gray
@@ -26,114 +38,144 @@ COLORS = {
     "tile_active": "#64b5f6"   # Slightly darker blue for active
 }
 
-ROWS = 6
-COLS = 5
-
-FALLBACK_WORDS = [
-    "about","other","which","their","there","apple","grape","mango","peach","berry",
-    "lemon","melon","chair","table","plant","glass","stone","flame","cloud","dream",
-    "crash","trace","place","spare","share","stare","crate","slate","brave","blink",
-    "pride","drive","bring","sling","sugar","cider","orbit","vivid","cabin","knock",
-    "rinse","smile","snack","track","video","zesty","quick","jazzy","fuzzy","piano"
-]
-
-def load_words_from_file(filename="words_5.txt"):
-    if not os.path.exists(filename):
-        return None
-    words = []
-    with open(filename, "r", encoding="utf-8") as f:
-        for line in f:
-            w = line.strip().lower()
-            if len(w) == 5 and w.isalpha():
-                words.append(w)
-    return sorted(set(words))
-
-def score_guess(guess, target):
-    result = [0] * 5
-    counts = Counter(target)
-    for i in range(5):
-        if guess[i] == target[i]:
-            result[i] = 2
-            counts[guess[i]] -= 1
-    for i in range(5):
-        if result[i] == 0 and counts.get(guess[i], 0) > 0:
-            result[i] = 1
-            counts[guess[i]] -= 1
-    return result
-
-def get_daily_word(words):
-    today = datetime.date.today().isoformat()
-    idx = int(hashlib.sha256(today.encode()).hexdigest(), 16) % len(words)
-    return words[idx]
-
-def get_definition(word):
-    try:
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-        resp = requests.get(url, timeout=5)
-        data = resp.json()
-        if isinstance(data, list) and "meanings" in data[0]:
-            meanings = data[0]["meanings"]
-            if meanings and "definitions" in meanings[0]:
-                definition = meanings[0]["definitions"][0].get("definition", "")
-                return definition
-        return "No definition found."
-    except Exception:
-        return "No definition found."
+HINT_BUDGET = 0.5  # seconds the solver may spend on a best-guess hint
+# "canvas" draws the board and keyboard on one Canvas instead of 58 widgets
+BOARD_RENDERER = os.environ.get("WORDLE_RENDERER", "widgets")
+# "1" prints time to first paint; "exit" also quits, for startup_bench.py
+STARTUP_TIMING = os.environ.get("WORDLE_STARTUP_TIMING", "")
+WORDS_FILE = "words_5.txt"
 
 # Stats functions
-STATS_FILE = "wordle_stats.json"
+STATS_FILE = "wordle_stats.db"
+LEGACY_STATS_FILE = "wordle_stats.json"  # migrated into STATS_FILE on first run
+_stats_store = None
+
+def get_stats_store():
+    global _stats_store
+    if _stats_store is None:
+        _stats_store = open_stats_store(STATS_FILE, legacy_json=LEGACY_STATS_FILE)
+    return _stats_store
 
 def load_all_stats():
-    try:
-        with open(STATS_FILE, "r") as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def save_all_stats(all_stats):
-    try:
-        with open(STATS_FILE, "w") as f:
-            json.dump(all_stats, f)
-    except Exception:
-        pass
+    return get_stats_store().load_all()
 
 def get_player_stats(all_stats, player):
-    return all_stats.get(player, {"games": 0, "wins": 0, "streak": 0, "max_streak": 0})
-
-def show_leaderboard_popup(master, all_stats):
+    return all_stats.get(player, default_stats())
+
+# The word lists are parsed once, in the background after the first paint,
+# then watched: an edited file is reloaded off the UI thread and the next
+# new game uses it, while a game in progress keeps its own snapshot
+_word_lists = WordListWatcher(WORDS_FILE, ANSWERS_FILE, matrix=True)
+
+def get_word_lists():
+    return _word_lists.current()
+
+def watch_word_lists():
+    _word_lists.current()
+    _word_lists.start()
+
+# The solver (pattern matrix and opening guess) is warmed up after the
+# first paint as well; a Best Guess asked for before it is ready says so
+_solver_warmup = None
+_solver_lock = threading.Lock()
+
+def solver_warmup(index):
+    global _solver_warmup
+    with _solver_lock:
+        warmup = _solver_warmup
+        # Ids are only meaningful for the word list the game started with
+        if warmup is None or warmup.index is not index:
+            from solver import SolverWarmup
+            if warmup is not None and warmup.solver is not None:
+                warmup.solver.close()
+            warmup = _solver_warmup = SolverWarmup(index).start()
+    return warmup
+
+def close_solver():
+    with _solver_lock:
+        if _solver_warmup is not None and _solver_warmup.solver is not None:
+            _solver_warmup.solver.close()
+
+def warm_up():
+    watch_word_lists()
+    solver_warmup(get_word_lists().index)
+
+LEADERBOARD_PAGE_SIZE = 10
+
+def show_leaderboard_popup(master, leaderboard, player=None):
     popup = tk.Toplevel(master)
     popup.title("Leaderboard")
     popup.configure(bg=COLORS["bg"])
     popup.grab_set()
-    tk.Label(
+    title = tk.Label(
         popup,
-        text="🏆 Leaderboard: Best Streaks",
+        text="",
         font=("Helvetica Neue", 18, "bold"),
         bg=COLORS["bg"],
         fg="#1976d2"
-    ).pack(pady=(18, 10))
-    sorted_stats = sorted(all_stats.items(), key=lambda x: x[1].get("max_streak", 0), reverse=True)
-    for i, (player, stats) in enumerate(sorted_stats[:10], 1):
-        rank_color = "#ffd700" if i == 1 else "#c0c0c0" if i == 2 else "#cd7f32" if i == 3 else "#22223b"
-        emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else ""
-        tk.Label(
-            popup,
-            text=f"{emoji} {i}. {player}",
-            font=("Helvetica Neue", 14, "bold"),
-            bg=COLORS["bg"],
-            fg=rank_color,
-            anchor="w",
-            justify="left"
-        ).pack(fill="x", padx=24)
-        tk.Label(
-            popup,
-            text=f"Max Streak: {stats.get('max_streak', 0)}   Games: {stats.get('games', 0)}   Wins: {stats.get('wins', 0)}",
-            font=("Helvetica Neue", 12),
-            bg=COLORS["bg"],
-            fg="#333333",
-            anchor="w",
-            justify="left"
-        ).pack(fill="x", padx=36, pady=(0, 6))
+    )
+    title.pack(pady=(18, 6))
+    metric_bar = tk.Frame(popup, bg=COLORS["bg"])
+    metric_bar.pack(pady=(0, 8))
+    rows = tk.Frame(popup, bg=COLORS["bg"])
+    rows.pack(fill="x")
+    your_rank = tk.Label(popup, text="", font=("Helvetica Neue", 12, "bold"),
+                         bg=COLORS["bg"], fg="#1976d2")
+    your_rank.pack(pady=(4, 0))
+    nav = tk.Frame(popup, bg=COLORS["bg"])
+    nav.pack(pady=(8, 0))
+    view = {"metric": "max_streak", "page": 0}
+
+    def render():
+        metric, page = view["metric"], view["page"]
+        label = METRICS[metric][0]
+        title.config(text=f"🏆 Leaderboard: {label}")
+        for child in rows.winfo_children():
+            child.destroy()
+        for i, name, value, stats in leaderboard.page(metric, page, LEADERBOARD_PAGE_SIZE):
+            rank_color = "#ffd700" if i == 1 else "#c0c0c0" if i == 2 else "#cd7f32" if i == 3 else "#22223b"
+            emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else ""
+            tk.Label(
+                rows,
+                text=f"{emoji} {i}. {name}",
+                font=("Helvetica Neue", 14, "bold"),
+                bg=COLORS["bg"],
+                fg=rank_color,
+                anchor="w",
+                justify="left"
+            ).pack(fill="x", padx=24)
+            tk.Label(
+                rows,
+                text=f"{label}: {format_value(metric, value)}   Games: {stats.get('games', 0)}   Wins: {stats.get('wins', 0)}",
+                font=("Helvetica Neue", 12),
+                bg=COLORS["bg"],
+                fg="#333333",
+                anchor="w",
+                justify="left"
+            ).pack(fill="x", padx=36, pady=(0, 6))
+        rank = leaderboard.rank(metric, player) if player else None
+        your_rank.config(text=f"Your rank: #{rank} of {leaderboard.size(metric)}" if rank else "")
+        prev_btn.config(state="normal" if page > 0 else "disabled")
+        more = (page + 1) * LEADERBOARD_PAGE_SIZE < leaderboard.size(metric)
+        next_btn.config(state="normal" if more else "disabled")
+
+    def show(metric=None, step=0):
+        if metric:
+            view["metric"], view["page"] = metric, 0
+        view["page"] += step
+        render()
+
+    for metric, (label, _, _) in METRICS.items():
+        tk.Button(metric_bar, text=label, font=("Helvetica Neue", 10, "bold"),
+                  bg=COLORS["key_bg"], fg="#22223b", relief="flat", padx=8, pady=4,
+                  command=lambda m=metric: show(metric=m)).pack(side="left", padx=2)
+    prev_btn = tk.Button(nav, text="◀ Prev", font=("Helvetica Neue", 11), bg=COLORS["key_bg"],
+                         fg="#22223b", relief="flat", padx=10, pady=4, command=lambda: show(step=-1))
+    prev_btn.pack(side="left", padx=4)
+    next_btn = tk.Button(nav, text="Next ▶", font=("Helvetica Neue", 11), bg=COLORS["key_bg"],
+                         fg="#22223b", relief="flat", padx=10, pady=4, command=lambda: show(step=1))
+    next_btn.pack(side="left", padx=4)
+    render()
     tk.Button(
         popup,
         text="Close",
@@ -158,72 +200,40 @@ def show_stats_popup(master, stats):
         bg=COLORS["bg"],
         fg="#1976d2"
     ).pack(pady=(18, 10))
+    summary = analytics(stats)
+    # Solve times and the distribution only cover wins since timing began
+    since = f" (last {summary['timed_wins']} wins)" if summary["partial"] else ""
     stat_font = ("Helvetica Neue", 14, "bold")
     value_font = ("Helvetica Neue", 14)
-    tk.Label(
-        popup,
-        text=f"Games Played:",
-        font=stat_font,
-        bg=COLORS["bg"],
-        fg="#22223b",
-        anchor="w"
-    ).pack(fill="x", padx=32)
-    tk.Label(
-        popup,
-        text=f"{stats['games']}",
-        font=value_font,
-        bg=COLORS["bg"],
-        fg="#1976d2",
-        anchor="w"
-    ).pack(fill="x", padx=48)
-    tk.Label(
-        popup,
-        text=f"Wins:",
-        font=stat_font,
-        bg=COLORS["bg"],
-        fg="#22223b",
-        anchor="w"
-    ).pack(fill="x", padx=32)
-    tk.Label(
-        popup,
-        text=f"{stats['wins']}",
-        font=value_font,
-        bg=COLORS["bg"],
-        fg="#6aaa64",
-        anchor="w"
-    ).pack(fill="x", padx=48)
-    tk.Label(
-        popup,
-        text=f"Current Streak:",
-        font=stat_font,
-        bg=COLORS["bg"],
-        fg="#22223b",
-        anchor="w"
-    ).pack(fill="x", padx=32)
-    tk.Label(
-        popup,
-        text=f"{stats['streak']}",
-        font=value_font,
-        bg=COLORS["bg"],
-        fg="#c9b458",
-        anchor="w"
-    ).pack(fill="x", padx=48)
-    tk.Label(
-        popup,
-        text=f"Max Streak:",
-        font=stat_font,
-        bg=COLORS["bg"],
-        fg="#22223b",
-        anchor="w"
-    ).pack(fill="x", padx=32)
-    tk.Label(
-        popup,
-        text=f"{stats['max_streak']}",
-        font=value_font,
-        bg=COLORS["bg"],
-        fg="#6aaa64",
-        anchor="w"
-    ).pack(fill="x", padx=48)
+    rows = [
+        ("Games Played:", f"{summary['games']}", "#1976d2"),
+        ("Wins:", f"{summary['wins']} ({summary['win_rate']:.0%})", "#6aaa64"),
+        ("Streak (Max):", f"{summary['streak']} ({summary['max_streak']})", "#c9b458"),
+        ("Average Guesses:", f"{summary['average_guesses']:.2f}", "#1976d2"),
+        ("Average Solve Time:", f"{summary['average_solve_seconds']:.0f}s{since}", "#1976d2"),
+        ("Hard Mode Wins:", "{} / {}".format(*summary["hard"]), "#6aaa64"),
+        ("Daily Wins:", "{} / {}".format(*summary["daily"]), "#6aaa64"),
+    ]
+    grid = tk.Frame(popup, bg=COLORS["bg"])
+    grid.pack(fill="x", padx=32)
+    for r, (label, value, color) in enumerate(rows):
+        tk.Label(grid, text=label, font=stat_font, bg=COLORS["bg"], fg="#22223b",
+                 anchor="w").grid(row=r, column=0, sticky="w")
+        tk.Label(grid, text=value, font=value_font, bg=COLORS["bg"], fg=color,
+                 anchor="w").grid(row=r, column=1, sticky="w", padx=(12, 0))
+    tk.Label(popup, text=f"Guess Distribution{since}", font=stat_font, bg=COLORS["bg"],
+             fg="#22223b", anchor="w").pack(fill="x", padx=32, pady=(12, 4))
+    # Bar widths are in characters, scaled to the most common result
+    distribution = summary["distribution"]
+    most = max(distribution) or 1
+    for n, count in enumerate(distribution, 1):
+        bar = tk.Frame(popup, bg=COLORS["bg"])
+        bar.pack(fill="x", padx=32, pady=1)
+        tk.Label(bar, text=str(n), font=value_font, bg=COLORS["bg"], fg="#22223b",
+                 width=2).pack(side="left")
+        tk.Label(bar, text=str(count), font=("Helvetica Neue", 11, "bold"),
+                 bg=COLORS["green"] if count else COLORS["gray"], fg="white", anchor="e",
+                 width=2 + 24 * count // most).pack(side="left")
     tk.Button(
         popup,
         text="Close",
@@ -237,7 +247,7 @@ def show_stats_popup(master, stats):
     ).pack(pady=16)
 
 class MainMenu(tk.Frame):
-    def __init__(self, master, start_callback, exit_callback, show_stats_callback, toggle_daily_callback, daily_mode, toggle_hard_callback, hard_mode, show_leaderboard_callback, player_name):
+    def __init__(self, master, start_callback, exit_callback, show_stats_callback, toggle_daily_callback, daily_mode, toggle_hard_callback, hard_mode, show_leaderboard_callback, player_name, boards_callback=None, boards=1, race_callback=None):
         super().__init__(master, bg=COLORS["bg"])
         self.start_callback = start_callback
         self.exit_callback = exit_callback
@@ -248,6 +258,8 @@ class MainMenu(tk.Frame):
         self.hard_mode = hard_mode
         self.show_leaderboard_callback = show_leaderboard_callback
         self.player_name = player_name
+        self.boards_callback = boards_callback
+        self.boards = boards
 
         # Heading
         tk.Label(self, text="WORDLE", font=("Helvetica Neue", 32, "bold"),
@@ -268,7 +280,11 @@ class MainMenu(tk.Frame):
             "  • Yellow: Correct letter, wrong place\n"
             "  • Gray: Letter not in the word\n\n"
             "Hard Mode:\n"
-            "- If a letter is revealed as green or yellow, you must use it in your next guess.\n"
+            "- Every guess must fit all the clues so far: greens stay in place, yellows move elsewhere, grays are left out.\n"
+            "Boards:\n"
+            "- Play 4, 8, 16 or 32 words at once; every guess goes to all unsolved boards.\n"
+            "Race:\n"
+            "- Join a room on a race server (python race_server.py) and race others to the same word.\n"
             "Controls:\n"
             "- Type letters or use the on-screen keyboard.\n"
             "- Press Enter to submit, Backspace to delete.\n"
@@ -279,6 +295,9 @@ class MainMenu(tk.Frame):
         btn_style = {"font":("Helvetica Neue", 13, "bold"), "relief":"flat", "padx":18, "pady":10}
         tk.Button(self, text="Start Game", bg=COLORS["green"], fg="white",
                   command=self.start_callback, **btn_style).pack(pady=8)
+        if race_callback:
+            tk.Button(self, text="Race", bg="#1976d2", fg="white",
+                      command=race_callback, **btn_style).pack(pady=4)
         tk.Button(self, text="Stats", bg=COLORS["yellow"], fg="#22223b",
                   command=self.show_stats_callback, **btn_style).pack(pady=4)
         tk.Button(self, text="Leaderboard", bg=COLORS["key_bg"], fg="#22223b",
@@ -296,6 +315,12 @@ class MainMenu(tk.Frame):
                   command=self.toggle_hard)
         self.hard_btn.pack(pady=4)
 
+        self.boards_btn = tk.Button(self, text=self._boards_text(),
+                  font=("Helvetica Neue", 12, "bold"),
+                  bg="#fffde7", fg="#22223b", relief="ridge", padx=12, pady=6,
+                  command=self.cycle_boards)
+        self.boards_btn.pack(pady=4)
+
         tk.Button(self, text="Exit", font=("Helvetica Neue", 12, "bold"),
                   bg="#e57373", fg="white", relief="flat", padx=18, pady=10,
                   command=self.exit_callback).pack(pady=8)
@@ -316,8 +341,20 @@ class MainMenu(tk.Frame):
         self.hard_btn.config(text=self._hard_text())
         self.toggle_hard_callback(self.hard_mode)
 
+    def _boards_text(self):
+        if self.boards == 1:
+            return "Boards: 1"
+        return f"Boards: {self.boards} ({multi_rows(self.boards)} guesses)"
+
+    def cycle_boards(self):
+        counts = (1,) + BOARD_COUNTS
+        self.boards = counts[(counts.index(self.boards) + 1) % len(counts)]
+        self.boards_btn.config(text=self._boards_text())
+        if self.boards_callback:
+            self.boards_callback(self.boards)
+
 class WordleApp(tk.Frame):
-    def __init__(self, master, back_to_menu_callback, stats, daily_mode_getter, hard_mode_getter, player_name, all_stats):
+    def __init__(self, master, back_to_menu_callback, stats, daily_mode_getter, hard_mode_getter, player_name, all_stats, leaderboard=None):
         super().__init__(master, bg=COLORS["bg"])
         self.master = master
         self.back_to_menu_callback = back_to_menu_callback
@@ -326,18 +363,15 @@ class WordleApp(tk.Frame):
         self.hard_mode_getter = hard_mode_getter
         self.player_name = player_name
         self.all_stats = all_stats
+        self.leaderboard = leaderboard
 
-        file_words = load_words_from_file("words_5.txt")
-        self.allowed_words = file_words if file_words else FALLBACK_WORDS[:]
-        self.answers = self.allowed_words
+        lists = get_word_lists()
+        self.word_index, self.answers = lists.index, lists.answers
 
-        self.row = 0
-        self.col = 0
-        self.game_over = False
-        self.current_letters = [""] * COLS
-        self.target = self._pick_word()
-        self.guessed_words = set()
-        self.hard_letters = set()
+        # The first game is created by new_game() when the frame is shown
+        self.state = None
+        self._hint_thread = None
+        self._prefix_warned = False
 
         title = tk.Label(self, text="WORDLE", font=("Helvetica Neue", 26, "bold"),
                          bg=COLORS["bg"], fg="#22223b")
@@ -354,6 +388,60 @@ class WordleApp(tk.Frame):
         )
         self.status.pack(pady=(0, 8))
 
+        # All tile and key updates go through the renderer
+        self.renderer = WidgetRenderer(self)
+        self.animator = Animator(self, self.renderer)
+        self.key_marks = {}
+        if BOARD_RENDERER == "canvas":
+            self._build_canvas_board()
+        else:
+            self._build_widget_board()
+
+        controls = tk.Frame(self, bg=COLORS["bg"])
+        controls.pack(pady=(0, 10))
+
+        btn_style = {"font":("Helvetica Neue", 11, "bold"), "padx":10, "pady":6, "relief":"ridge"}
+        self.new_btn = tk.Button(
+            controls, text="New Game", command=self.new_game,
+            bg=COLORS["green"], fg="white", **btn_style
+        )
+        self.new_btn.pack(side="left", padx=6)
+
+        self.show_btn = tk.Button(
+            controls, text="Show Answer", command=self.show_answer,
+            bg=COLORS["yellow"], fg="#22223b", **btn_style
+        )
+        self.show_btn.pack(side="left", padx=6)
+
+        self.hint_btn = tk.Button(
+            controls, text="Best Guess", command=self.show_best_guess,
+            bg=COLORS["key_bg"], fg="#22223b", **btn_style
+        )
+        self.hint_btn.pack(side="left", padx=6)
+
+        self.menu_btn = tk.Button(
+            controls, text="Main Menu", command=self.back_to_menu_callback,
+            bg="#1976d2", fg="white", font=("Helvetica Neue", 11, "bold"),
+            relief="ridge", padx=12, pady=6
+        )
+        self.menu_btn.pack(side="left", padx=6)
+
+        self.wordlist_info = tk.Label(
+            controls,
+            text=(f"Using {WORDS_FILE}" if lists.from_file else "Using built-in word list"),
+            font=("Helvetica Neue", 9), bg=COLORS["bg"], fg="#9a9a9a"
+        )
+        self.wordlist_info.pack(side="left", padx=6)
+
+        self.bind_keys()
+
+        self._update_status("Guess the 5-letter word. You have 6 tries.")
+
+    def bind_keys(self):
+        self.master.bind("<Key>", self.on_key_event)
+        self.master.bind("<Escape>", lambda e: self.new_game())
+
+    def _build_widget_board(self):
         self.board_frame = tk.Frame(self, bg=COLORS["board_bg"])
         self.board_frame.pack(padx=8, pady=(4, 4), fill="both", expand=True)
 
@@ -377,6 +465,8 @@ class WordleApp(tk.Frame):
                     highlightthickness=2
                 )
                 lbl.grid(row=r, column=c, padx=3, pady=3, sticky="nsew")
+                self.renderer.track(lbl, text="", bg=COLORS["tile_empty"], fg=COLORS["tile_text"],
+                                    highlightbackground=COLORS["tile_border"])
                 row_tiles.append(lbl)
             self.tiles.append(row_tiles)
 
@@ -394,41 +484,17 @@ class WordleApp(tk.Frame):
                 self._add_key_button(rowf, "ENTER")
                 self._add_key_button(rowf, "⌫")
 
-        controls = tk.Frame(self, bg=COLORS["bg"])
-        controls.pack(pady=(0, 10))
-
-        btn_style = {"font":("Helvetica Neue", 11, "bold"), "padx":10, "pady":6, "relief":"ridge"}
-        self.new_btn = tk.Button(
-            controls, text="New Game", command=self.new_game,
-            bg=COLORS["green"], fg="white", **btn_style
-        )
-        self.new_btn.pack(side="left", padx=6)
-
-        self.show_btn = tk.Button(
-            controls, text="Show Answer", command=self.show_answer,
-            bg=COLORS["yellow"], fg="#22223b", **btn_style
-        )
-        self.show_btn.pack(side="left", padx=6)
-
-        self.menu_btn = tk.Button(
-            controls, text="Main Menu", command=self.back_to_menu_callback,
-            bg="#1976d2", fg="white", font=("Helvetica Neue", 11, "bold"),
-            relief="ridge", padx=12, pady=6
-        )
-        self.menu_btn.pack(side="left", padx=6)
-
-        self.wordlist_info = tk.Label(
-            controls,
-            text=("Using words_5.txt" if file_words else "Using built-in word list"),
-            font=("Helvetica Neue", 9), bg=COLORS["bg"], fg="#9a9a9a"
-        )
-        self.wordlist_info.pack(side="left", padx=6)
-
-        self.master.bind("<Key>", self.on_key_event)
-        self.master.bind("<Escape>", lambda e: self.new_game())
-
-        self._update_status("Guess the 5-letter word. You have 6 tries.")
-        self._highlight_active_row()
+    def _build_canvas_board(self):
+        self.board = CanvasBoard(self, COLORS, ROWS, COLS, self.on_virtual_key)
+        self.board.pack(padx=8, pady=(4, 6), fill="both", expand=True)
+        self.tiles = self.board.tiles
+        self.key_buttons = self.board.key_buttons
+        for row_tiles in self.tiles:
+            for item in row_tiles:
+                self.renderer.track(item, text="", bg=COLORS["tile_empty"], fg=COLORS["tile_text"],
+                                    highlightbackground=COLORS["tile_border"])
+        for item in self.key_buttons.values():
+            self.renderer.track(item, bg=COLORS["key_bg"], fg=COLORS["key_fg"])
 
     def _add_key_button(self, parent, text):
         btn = tk.Button(
@@ -444,19 +510,29 @@ class WordleApp(tk.Frame):
             command=lambda t=text: self.on_virtual_key(t)
         )
         btn.pack(side="left", padx=2, pady=2, expand=True, fill="both")
+        self.renderer.track(btn, bg=COLORS["key_bg"], fg=COLORS["key_fg"])
         self.key_buttons[text.upper()] = btn
 
+    def _set_tile(self, r, c, **options):
+        self.renderer.set(self.tiles[r][c], **options)
+
+    def _set_key(self, key, **options):
+        btn = self.key_buttons.get(key.upper())
+        if btn:
+            self.renderer.set(btn, **options)
+
     def _update_status(self, msg):
         self.status.config(text=msg)
 
     def _highlight_active_row(self):
+        # Only tiles whose border actually changes reach Tk
         for r in range(ROWS):
+            border = COLORS["tile_active"] if r == self.state.row and not self.state.over else COLORS["tile_border"]
             for c in range(COLS):
-                border = COLORS["tile_active"] if r == self.row and not self.game_over else COLORS["tile_border"]
-                self.tiles[r][c].config(highlightbackground=border)
+                self._set_tile(r, c, highlightbackground=border)
 
     def on_virtual_key(self, key):
-        if self.game_over:
+        if self.state is None or self.state.over:
             return
         key = key.upper()
         if key == "ENTER":
@@ -467,7 +543,7 @@ class WordleApp(tk.Frame):
             self.type_letter(key)
 
     def on_key_event(self, event):
-        if self.game_over:
+        if self.state is None or self.state.over:
             return
         key = event.keysym
         if key == "Return":
@@ -476,163 +552,178 @@ class WordleApp(tk.Frame):
             self.backspace()
         elif len(event.char) == 1 and event.char.isalpha():
             self.type_letter(event.char.upper())
-        self._highlight_active_row()
 
     def type_letter(self, ch):
-        if self.col < COLS:
-            self.current_letters[self.col] = ch
-            self.tiles[self.row][self.col].config(text=ch)
-            self.col += 1
+        if self.state.type_letter(ch):
+            self._set_tile(self.state.row, len(self.state.typed) - 1, text=ch)
+            self._show_prefix()
 
     def backspace(self):
-        if self.col > 0:
-            self.col -= 1
-            self.current_letters[self.col] = ""
-            self.tiles[self.row][self.col].config(text="")
-
+        if self.state.backspace():
+            self._set_tile(self.state.row, len(self.state.typed), text="", fg=COLORS["tile_text"])
+            self._show_prefix()
+
+    def _show_prefix(self):
+        # Typed letters turn red as soon as no word starts with them. The
+        # renderer drops the calls that change nothing.
+        state = self.state
+        ok = state.typed_is_prefix()
+        fg = COLORS["tile_text"] if ok else COLORS["tile_invalid"]
+        for c in range(len(state.typed)):
+            self._set_tile(state.row, c, fg=fg)
+        if not ok and not self._prefix_warned:
+            self._update_status(f"No word starts with {state.typed.upper()}.")
+        elif ok and self._prefix_warned:
+            self._update_status("")
+        self._prefix_warned = not ok
+
+    @traced("tk.submit_guess")
     def submit_guess(self):
-        if self.col != COLS:
-            self._update_status("Not enough letters.")
-            self._shake_row(self.row)
-            return
-        guess = "".join(self.current_letters).lower()
-        if guess not in self.allowed_words:
-            self._update_status("Not in word list.")
-            self._shake_row(self.row)
-            return
-        if guess in self.guessed_words:
-            self._update_status("Already guessed.")
-            self._shake_row(self.row)
+        state = self.state
+        # Hard mode can be toggled from the menu mid-game
+        state.hard = self.hard_mode_getter()
+        guess = state.typed
+        error = state.validate(guess)
+        if error:
+            self._update_status(error)
+            self._shake_row(state.row)
             return
 
-        # Hard mode enforcement
-        if self.hard_mode_getter() and self.row > 0 and self.hard_letters:
-            missing = [ch for ch in self.hard_letters if ch not in guess]
-            if missing:
-                self._update_status(f"Hard Mode: Must use {', '.join(missing).upper()}!")
-                self._shake_row(self.row)
-                return
-
-        self.guessed_words.add(guess)
-        marks = score_guess(guess, self.target)
-        self._flip_row_animation(self.row, marks, guess)
+        row = state.row
+        marks = state.submit(guess)
+        self._flip_row_animation(row, marks, guess)
 
-        # Update hard_letters for next guess
-        if self.hard_mode_getter():
-            self.hard_letters = set()
-            for i in range(COLS):
-                if marks[i] in (1, 2):
-                    self.hard_letters.add(guess[i])
-
-        if guess == self.target:
-            self.game_over = True
-            self._update_status(f"Great! You guessed {self.target.upper()} ✅")
+        if state.won:
+            self._update_status(f"Great! You guessed {state.target.upper()} ✅")
             self._highlight_active_row()
             self.update_stats(win=True)
             self.show_win_dialog()
             return
 
-        self.row += 1
-        self.col = 0
-        self.current_letters = [""] * COLS
         self._highlight_active_row()
 
-        if self.row == ROWS:
-            self.game_over = True
-            self._update_status(f"Out of tries. Answer: {self.target.upper()}")
-            definition = get_definition(self.target)
-            messagebox.showinfo("Game Over", f"Out of tries!\n\nAnswer: {self.target.upper()}\n\nMeaning: {definition}")
-            self._highlight_active_row()
+        if state.over:
+            self._update_status(f"Out of tries. Answer: {state.target.upper()}")
             self.update_stats(win=False)
+            target = state.target
+            self._when_definition_ready(target, lambda definition: messagebox.showinfo(
+                "Game Over", f"Out of tries!\n\nAnswer: {target.upper()}\n\nMeaning: {definition}"))
 
     def _shake_row(self, row):
         # Flash border color for shake effect
-        def flash(times):
-            color = "#ff3333" if times % 2 == 0 else COLORS["tile_border"]
-            for c in range(COLS):
-                self.tiles[row][c].config(highlightbackground=color)
-            if times < 5:
-                self.after(60, lambda: flash(times + 1))
-            else:
-                for c in range(COLS):
-                    self.tiles[row][c].config(highlightbackground=COLORS["tile_border"])
-        flash(0)
-
-    def _move_row(self, row, offset):
-        pass  # No-op, not needed
+        frames = [(i * 0.06, {"highlightbackground": "#ff3333" if i % 2 == 0 else COLORS["tile_border"]})
+                  for i in range(6)]
+        for c in range(COLS):
+            done = self._highlight_active_row if c == COLS - 1 else None
+            self.animator.play(("border", row, c), self.tiles[row][c], frames, on_done=done)
 
     def _flip_row_animation(self, row, marks, guess):
         # Flip animation: reveal tiles one by one
-        def flip_tile(c):
-            lbl = self.tiles[row][c]
-            lbl.config(bg=COLORS["tile_active"])
-            lbl.after(100, lambda: self._animate_tile_color(row, c, self._get_tile_color(marks[c])))
-            self._fade_keyboard_color(guess[c], marks[c])
         for c in range(COLS):
-            self.board_frame.after(c * 120, lambda cc=c: flip_tile(cc))
+            frames = [
+                (0.0, {"bg": COLORS["tile_active"]}),
+                (0.1, {"bg": self._get_tile_color(marks[c]), "fg": "white"}),
+            ]
+            self.animator.play(("tile", row, c), self.tiles[row][c], frames, delay=c * 0.12)
+            self._fade_keyboard_color(guess[c], marks[c], delay=c * 0.12)
 
     def _get_tile_color(self, mark):
         return COLORS["gray"] if mark == 0 else (COLORS["yellow"] if mark == 1 else COLORS["green"])
 
-    def _animate_tile_color(self, r, c, color):
-        lbl = self.tiles[r][c]
-        lbl.config(bg=color, fg="white")
-
-    def _fade_keyboard_color(self, ch, mark):
-        # Fade-in effect for keyboard button color
-        btn = self.key_buttons.get(ch.upper())
-        if not btn:
+    def _fade_keyboard_color(self, ch, mark, delay=0.0):
+        # Fade-in effect for keyboard button color. A key keeps its best
+        # mark, so a later gray copy of a letter cannot hide a green one.
+        key = ch.upper()
+        btn = self.key_buttons.get(key)
+        if not btn or self.key_marks.get(key, -1) >= mark:
             return
+        self.key_marks[key] = mark
         target = self._get_tile_color(mark)
-        steps = 8
-        orig = btn.cget("bg")
-        colors = [orig, COLORS["key_bg"], target]
-        def fade(step):
-            if step >= steps:
-                btn.config(bg=target)
-                return
-            # Simple fade: interpolate between orig and target
-            btn.config(bg=target if step > steps//2 else COLORS["key_bg"])
-            btn.after(30, lambda: fade(step+1))
-        fade(0)
+        frames = [(0.0, {"bg": (COLORS["key_bg"], target)}), (0.24, {"bg": target})]
+        self.animator.play(("key", key), btn, frames, delay=delay)
 
-    def _pick_word(self):
+    def _new_state(self):
+        # Pick up reloaded word lists between games
+        lists = get_word_lists()
+        self.word_index, self.answers = lists.index, lists.answers
         if self.daily_mode_getter():
-            return get_daily_word(self.answers)
+            word = daily_word(self.word_index, self.answers)
         else:
-            return random.choice(self.answers)
+            word = pick_answer(lists, self.player_name)
+        from definitions import prefetch_definition
+        prefetch_definition(word)
+        return GameState.for_word(self.word_index, word, ROWS, self.hard_mode_getter())
+
+    def _when_definition_ready(self, word, callback, future=None):
+        # Poll the background lookup instead of blocking the Tk main loop
+        from definitions import prefetch_definition, get_definition
+        future = future or prefetch_definition(word)
+        if future is None:
+            callback(get_definition(word))
+        elif future.done():
+            callback(future.result())
+        else:
+            self.after(50, lambda: self._when_definition_ready(word, callback, future))
 
     def new_game(self):
-        self.target = self._pick_word()
-        self.row = 0
-        self.col = 0
-        self.game_over = False
-        self.current_letters = [""] * COLS
-        self.guessed_words.clear()
-        self.hard_letters = set()
+        self.state = self._new_state()
+        game_profiler.start()
+        self._prefix_warned = False
         self._update_status("New game! Guess the 5-letter word.")
+        self.animator.cancel_all()
+        self.key_marks = {}
         for r in range(ROWS):
             for c in range(COLS):
-                self.tiles[r][c].config(text="", bg=COLORS["tile_empty"], fg=COLORS["tile_text"])
-        for text, btn in self.key_buttons.items():
-            btn.config(bg=COLORS["key_bg"], fg=COLORS["key_fg"])
+                self._set_tile(r, c, text="", bg=COLORS["tile_empty"], fg=COLORS["tile_text"])
+        for text in self.key_buttons:
+            self._set_key(text, bg=COLORS["key_bg"], fg=COLORS["key_fg"])
         self._highlight_active_row()
 
+    def show_best_guess(self):
+        if self.state.over or (self._hint_thread and self._hint_thread.is_alive()):
+            return
+        self.state.hard = self.hard_mode_getter()
+        warmup = solver_warmup(self.state.index)
+        self._update_status("Thinking..." if warmup.ready else "Warming up the solver...")
+        candidates = self.state.candidate_ids()
+        guess_ids = self.state.legal_guess_ids()
+        result = {}
+        def work():
+            try:
+                solver = warmup.wait()
+                if solver is not None:
+                    result["word"] = solver.best_guess(candidates, budget=HINT_BUDGET, guess_ids=guess_ids)
+            except Exception:
+                result["word"] = None
+        self._hint_thread = threading.Thread(target=work, daemon=True)
+        self._hint_thread.start()
+        self._poll_best_guess(result, self.state)
+
+    def _poll_best_guess(self, result, state):
+        if self._hint_thread.is_alive():
+            self.after(50, lambda: self._poll_best_guess(result, state))
+            return
+        if state is not self.state or state.over:
+            return
+        word = result.get("word")
+        self._update_status(f"Best guess: {word.upper()}" if word else "No hints available!")
+
     def show_answer(self):
-        messagebox.showinfo("Answer", f"The answer is:\n\n{self.target.upper()}")
+        messagebox.showinfo("Answer", f"The answer is:\n\n{self.state.target.upper()}")
 
     def show_win_dialog(self):
-        definition = get_definition(self.target)
         win_popup = tk.Toplevel(self)
         win_popup.title("Congratulations!")
         win_popup.configure(bg=COLORS["bg"])
         win_popup.grab_set()
         tk.Label(win_popup, text="You guessed the word!", font=("Helvetica", 16, "bold"),
                  bg=COLORS["bg"], fg=COLORS["green"]).pack(pady=(16, 8))
-        tk.Label(win_popup, text=f"Answer: {self.target.upper()}", font=("Helvetica", 14),
+        tk.Label(win_popup, text=f"Answer: {self.state.target.upper()}", font=("Helvetica", 14),
                  bg=COLORS["bg"], fg="white").pack(pady=(0, 8))
-        tk.Label(win_popup, text=f"Meaning: {definition}", font=("Helvetica", 12),
-                 bg=COLORS["bg"], fg=COLORS["yellow"], wraplength=400, justify="left").pack(pady=(0, 16))
+        meaning = tk.Label(win_popup, text="Meaning: looking up...", font=("Helvetica", 12),
+                           bg=COLORS["bg"], fg=COLORS["yellow"], wraplength=400, justify="left")
+        meaning.pack(pady=(0, 16))
+        self._when_definition_ready(self.state.target, lambda definition: meaning.winfo_exists() and meaning.config(text=f"Meaning: {definition}"))
         tk.Button(win_popup, text="Next Level", font=("Helvetica", 12, "bold"),
                   bg=COLORS["green"], fg="white", relief="flat", padx=16, pady=8,
                   command=lambda: [win_popup.destroy(), self.new_game()]).pack(pady=6)
@@ -641,16 +732,21 @@ class WordleApp(tk.Frame):
                   command=lambda: [win_popup.destroy(), self.back_to_menu_callback()]).pack(pady=6)
 
     def update_stats(self, win):
-        self.stats["games"] += 1
-        if win:
-            self.stats["wins"] += 1
-            self.stats["streak"] += 1
-            if self.stats["streak"] > self.stats["max_streak"]:
-                self.stats["max_streak"] = self.stats["streak"]
-        else:
-            self.stats["streak"] = 0
+        state = self.state
+        guesses = state.row if win else 0
+        daily = self.daily_mode_getter()
+        seconds = time.time() - state.started
+        try:
+            self.stats.update(get_stats_store().record_game(self.player_name, win, guesses,
+                                                            state.hard, daily, seconds))
+        except Exception as e:
+            apply_game_result(self.stats, win, guesses, state.hard, daily, seconds)
+            messagebox.showwarning("Stats", f"Could not save stats: {e}")
+        log_game(self.player_name, state, daily)
+        game_profiler.stop()
         self.all_stats[self.player_name] = self.stats
-        save_all_stats(self.all_stats)
+        if self.leaderboard is not None:
+            self.leaderboard.update(self.player_name, self.stats)
 
 class App(tk.Tk):
     def __init__(self):
@@ -659,16 +755,49 @@ class App(tk.Tk):
         self.configure(bg=COLORS["bg"])
         self.resizable(True, True)
         self.minsize(480, 700)  # Minimum size for usability
+        # Closing the window cleans up like the Exit button
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)
 
-        self.player_name = self.ask_player_name()
+        prompt_start = time.perf_counter()
+        self.player_name = os.environ.get("WORDLE_PLAYER") or self.ask_player_name()
+        self._prompt_time = time.perf_counter() - prompt_start
         self.all_stats = load_all_stats()
         self.stats = get_player_stats(self.all_stats, self.player_name)
+        self.leaderboard = LeaderboardIndex(self.all_stats)
         self.daily_mode = False
         self.hard_mode = False
-        self.menu = MainMenu(self, self.start_game, self.exit_app, self.show_stats, self.toggle_daily, self.daily_mode, self.toggle_hard, self.hard_mode, self.show_leaderboard, self.player_name)
-        self.game = WordleApp(self, self.show_menu, self.stats, self.get_daily_mode, self.get_hard_mode, self.player_name, self.all_stats)
-        self.menu.pack(fill="both", expand=True)
-        self.game.pack_forget()
+        self.boards = 1
+        # Frames are built the first time they are shown
+        self.menu = None
+        self.game = None
+        self.multi_game = None
+        self.race_game = None
+        self.show_menu()
+        self.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self):
+        if STARTUP_TIMING:
+            self.update_idletasks()
+            # Time spent waiting for the player to type a name is not startup cost
+            elapsed = time.perf_counter() - _start_time - self._prompt_time
+            # sys.stderr is None in the windowed PyInstaller build
+            if sys.stderr is not None:
+                print(f"startup: {elapsed * 1000:.1f} ms to first paint", file=sys.stderr, flush=True)
+            if STARTUP_TIMING == "exit":
+                self.destroy()
+                return
+        # Warm the word lists and the solver while the player is still on the menu
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    def _get_menu(self):
+        if self.menu is None:
+            self.menu = MainMenu(self, self.start_game, self.exit_app, self.show_stats, self.toggle_daily, self.daily_mode, self.toggle_hard, self.hard_mode, self.show_leaderboard, self.player_name, self.set_boards, self.boards, self.start_race)
+        return self.menu
+
+    def _get_game(self):
+        if self.game is None:
+            self.game = WordleApp(self, self.show_menu, self.stats, self.get_daily_mode, self.get_hard_mode, self.player_name, self.all_stats, self.leaderboard)
+        return self.game
 
     def ask_player_name(self):
         name = simpledialog.askstring("Player Profile", "Enter your player name:", parent=self)
@@ -676,23 +805,53 @@ class App(tk.Tk):
             name = "Player"
         return name.strip()
 
+    def _get_multi_game(self):
+        if self.multi_game is None:
+            from multi_board import MultiBoardApp
+            self.multi_game = MultiBoardApp(self, self.show_menu, COLORS, get_word_lists, self.boards)
+        return self.multi_game
+
+    def _get_race_game(self):
+        if self.race_game is None:
+            from race_board import RaceApp
+            self.race_game = RaceApp(self, self.show_menu, COLORS, self.player_name, self.get_hard_mode)
+        return self.race_game
+
     def start_game(self):
-        self.menu.pack_forget()
-        self.game.pack(fill="both", expand=True)
+        self._get_menu().pack_forget()
+        if self.boards > 1:
+            frame = self._get_multi_game()
+            frame.pack(fill="both", expand=True)
+            frame.bind_keys()
+            frame.new_game(self.boards)
+            return
+        self._get_game().pack(fill="both", expand=True)
+        self.game.bind_keys()
         self.game.new_game()
 
+    def start_race(self):
+        self._get_menu().pack_forget()
+        frame = self._get_race_game()
+        frame.pack(fill="both", expand=True)
+        frame.bind_keys()
+
     def show_menu(self):
-        self.game.pack_forget()
-        self.menu.pack(fill="both", expand=True)
+        for frame in (self.game, self.multi_game, self.race_game):
+            if frame is not None:
+                frame.pack_forget()
+        self._get_menu().pack(fill="both", expand=True)
 
     def exit_app(self):
+        close_solver()
+        if self.race_game is not None:
+            self.race_game.leave()
         self.destroy()
 
     def show_stats(self):
         show_stats_popup(self, self.stats)
 
     def show_leaderboard(self):
-        show_leaderboard_popup(self, self.all_stats)
+        show_leaderboard_popup(self, self.leaderboard, self.player_name)
 
     def toggle_daily(self, mode):
         self.daily_mode = mode
@@ -703,8 +862,14 @@ class App(tk.Tk):
     def toggle_hard(self, mode):
         self.hard_mode = mode
 
+    def set_boards(self, boards):
+        self.boards = boards
+
     def get_hard_mode(self):
         return self.hard_mode
 
 if __name__ == "__main__":
+    # Only needed so the solver's worker processes start in a frozen build
+    import multiprocessing
+    multiprocessing.freeze_support()
     App().mainloop()
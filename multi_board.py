@@ -0,0 +1,206 @@
+import string
+import tkinter as tk
+from tkinter import font as tkfont
+from game_state import MultiGameState, UNPLAYED
+from answer_sampler import pick_answers
+from wordle_core import COLS, decode_pattern
+from tracing import traced
+
+KB_ROWS = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
+
+def board_columns(boards):
+    # Wider grids would not fit the 480px window; more boards scroll instead
+    return 2 if boards <= 4 else 4
+
+class MultiBoardCanvas(tk.Canvas):
+    # Every board on one scrollable Canvas. Tiles are only created for rows
+    # that have been played, one batch per guess, and solved boards stop
+    # growing, so a guess costs at most boards x 5 new tiles however many
+    # rows the game allows.
+    def __init__(self, master, colors, boards, rows):
+        super().__init__(master, bg=colors["board_bg"], highlightthickness=0, width=460, height=460)
+        self.colors = colors
+        self.boards = boards
+        self.rows = rows
+        self.columns = board_columns(boards)
+        self.size = 20 if boards <= 4 else 14 if boards <= 16 else 11
+        self.gap = 2
+        self.margin = 12
+        self.font = tkfont.Font(family="Helvetica Neue", size=max(6, int(self.size * 0.5)), weight="bold")
+        self.header_font = tkfont.Font(family="Helvetica Neue", size=9, weight="bold")
+        board_w = COLS * (self.size + self.gap)
+        board_h = rows * (self.size + self.gap)
+        self.cell_w = board_w + self.margin
+        self.cell_h = board_h + self.margin + 14
+        grid_rows = -(-boards // self.columns)
+        self.headers = []
+        for b in range(boards):
+            x, y = self._origin(b)
+            self.create_rectangle(x - 3, y - 3, x + board_w + 1, y + board_h + 1,
+                                  outline=colors["tile_border"], width=1, tags=(f"frame:{b}",))
+            self.headers.append(self.create_text(x, y - 6, text=f"#{b + 1}", anchor="sw",
+                                                 font=self.header_font, fill=colors["tile_text"]))
+        self.configure(scrollregion=(0, 0, self.columns * self.cell_w + self.margin,
+                                     grid_rows * self.cell_h + self.margin))
+
+    def _origin(self, board):
+        col, row = board % self.columns, board // self.columns
+        return (self.margin + col * self.cell_w, self.margin + 14 + row * self.cell_h)
+
+    def draw_row(self, row, guess, codes):
+        colors = self.colors
+        fills = (colors["gray"], colors["yellow"], colors["green"])
+        letters = guess.upper()
+        step = self.size + self.gap
+        for b, code in enumerate(codes):
+            if code == UNPLAYED:
+                continue
+            x0, y = self._origin(b)
+            y += row * step
+            marks = decode_pattern(code)
+            for c in range(COLS):
+                x = x0 + c * step
+                self.create_rectangle(x, y, x + self.size, y + self.size, width=0, fill=fills[marks[c]])
+                self.create_text(x + self.size / 2, y + self.size / 2, text=letters[c],
+                                 font=self.font, fill="white")
+
+    def mark_solved(self, board, guesses):
+        self.itemconfigure(self.headers[board], text=f"#{board + 1} ✓ {guesses}", fill=self.colors["green"])
+        self.itemconfigure(f"frame:{board}", outline=self.colors["green"], width=2)
+
+    def reveal(self, board, target):
+        self.itemconfigure(self.headers[board], text=f"#{board + 1} {target.upper()}",
+                           fill=self.colors["tile_invalid"])
+
+class MultiBoardApp(tk.Frame):
+    # Quordle-style play: the same guesses go to every board at once
+    def __init__(self, master, back_to_menu_callback, colors, get_word_lists, boards):
+        super().__init__(master, bg=colors["bg"])
+        self.master = master
+        self.back_to_menu_callback = back_to_menu_callback
+        self.colors = colors
+        self.get_word_lists = get_word_lists
+        self.state = None
+        self.board = None
+        self.boards = boards
+
+        self.heading = tk.Label(self, text="", font=("Helvetica Neue", 22, "bold"),
+                                bg=colors["bg"], fg="#22223b")
+        self.heading.pack(pady=(10, 2))
+        self.status = tk.Label(self, text="", font=("Helvetica Neue", 12), bg=colors["bg"],
+                               fg="#1976d2", wraplength=460, justify="center")
+        self.status.pack(pady=(0, 4))
+        # The word being typed is shown once, not on every board
+        self.entry = tk.Label(self, text="", font=("Courier", 20, "bold"), bg=colors["tile_empty"],
+                              fg=colors["tile_text"], width=COLS * 2, relief="ridge", bd=2)
+        self.entry.pack(pady=(0, 6))
+
+        self.board_frame = tk.Frame(self, bg=colors["board_bg"])
+        self.board_frame.pack(padx=8, fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(self.board_frame, orient="vertical")
+        self.scrollbar.pack(side="right", fill="y")
+
+        keyboard = tk.Frame(self, bg=colors["bg"])
+        keyboard.pack(pady=(4, 4))
+        for i, keys in enumerate(KB_ROWS):
+            rowf = tk.Frame(keyboard, bg=colors["bg"])
+            rowf.pack()
+            for key in list(keys) + (["ENTER", "⌫"] if i == 2 else []):
+                tk.Button(rowf, text=key, font=("Helvetica Neue", 11, "bold"), bg=colors["key_bg"],
+                          fg=colors["key_fg"], relief="ridge", width=3 if len(key) == 1 else 6,
+                          command=lambda k=key: self.on_virtual_key(k)).pack(side="left", padx=1, pady=1)
+
+        controls = tk.Frame(self, bg=colors["bg"])
+        controls.pack(pady=(0, 10))
+        btn_style = {"font": ("Helvetica Neue", 11, "bold"), "padx": 10, "pady": 6, "relief": "ridge"}
+        tk.Button(controls, text="New Game", command=self.new_game,
+                  bg=colors["green"], fg="white", **btn_style).pack(side="left", padx=6)
+        tk.Button(controls, text="Main Menu", command=self.back_to_menu_callback,
+                  bg="#1976d2", fg="white", **btn_style).pack(side="left", padx=6)
+
+    def bind_keys(self):
+        # The single-board game binds the same keys; whichever frame is
+        # shown takes them over
+        self.master.bind("<Key>", self.on_key_event)
+        self.master.bind("<Escape>", lambda e: self.new_game())
+
+    def new_game(self, boards=None):
+        self.boards = boards or self.boards
+        lists = self.get_word_lists()
+        targets = pick_answers(lists, self.boards)
+        self.state = MultiGameState.for_words(lists.index, targets)
+        if self.board is not None:
+            self.board.destroy()
+        self.board = MultiBoardCanvas(self.board_frame, self.colors, self.boards, self.state.rows)
+        self.board.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.board.yview)
+        self.board.pack(side="left", fill="both", expand=True)
+        self.heading.config(text=f"WORDLE × {self.boards}")
+        self._show_entry()
+        self._show_progress()
+
+    def _show_progress(self, message=""):
+        state = self.state
+        left = state.rows - state.row
+        text = f"Solved {state.solved_count}/{state.boards} · {left} guesses left"
+        self.status.config(text=f"{message}\n{text}" if message else text)
+
+    def _show_entry(self):
+        state = self.state
+        typed = state.typed.upper().ljust(COLS, "_")
+        fg = self.colors["tile_text"] if state.typed_is_prefix() else self.colors["tile_invalid"]
+        self.entry.config(text=" ".join(typed), fg=fg)
+
+    def on_virtual_key(self, key):
+        if self.state is None or self.state.over:
+            return
+        if key == "ENTER":
+            self.submit_guess()
+        elif key == "⌫":
+            self.backspace()
+        elif len(key) == 1 and key in string.ascii_uppercase:
+            self.type_letter(key)
+
+    def on_key_event(self, event):
+        if self.state is None or self.state.over:
+            return
+        key = event.keysym
+        if key == "Return":
+            self.submit_guess()
+        elif key in ("BackSpace", "Delete"):
+            self.backspace()
+        elif len(event.char) == 1 and event.char.isalpha():
+            self.type_letter(event.char.upper())
+
+    def type_letter(self, ch):
+        if self.state.type_letter(ch):
+            self._show_entry()
+
+    def backspace(self):
+        if self.state.backspace():
+            self._show_entry()
+
+    @traced("tk.submit_multi")
+    def submit_guess(self):
+        state = self.state
+        guess = state.typed
+        error = state.validate(guess)
+        if error:
+            self._show_progress(error)
+            return
+        row = state.row
+        codes = state.submit(guess)
+        self.board.draw_row(row, guess, codes)
+        for b, solved_at in enumerate(state.solved):
+            if solved_at == row + 1:
+                self.board.mark_solved(b, solved_at)
+        self._show_entry()
+        if state.won:
+            self._show_progress(f"All {state.boards} boards solved in {state.row} guesses! ✅")
+        elif state.over:
+            for b, target in enumerate(state.targets):
+                if not state.solved[b]:
+                    self.board.reveal(b, target)
+            self._show_progress(f"Out of guesses: {state.boards - state.solved_count} boards unsolved.")
+        else:
+            self._show_progress()
@@ -0,0 +1,135 @@
+import os
+import hashlib
+import numpy as np
+from wordle_core import CACHE_DIR, decode_pattern
+
+WEIGHTS = np.array([81, 27, 9, 3, 1], dtype=np.uint8)
+
+def words_fingerprint(words):
+    return hashlib.sha1("\n".join(words).encode("utf-8")).hexdigest()[:16]
+
+def words_to_array(words):
+    # (N, 5) array of letter codes 0-25
+    buf = "".join(words).encode("ascii")
+    return (np.frombuffer(buf, dtype=np.uint8).reshape(-1, 5) - ord("a")).astype(np.uint8)
+
+def score_block(guesses, targets):
+    # Vectorized score_guess for every (guess, target) pair of two letter
+    # arrays. Returns a (len(guesses), len(targets)) uint8 array of codes.
+    g = [guesses[:, None, i] for i in range(5)]
+    t = [targets[None, :, j] for j in range(5)]
+    open_ = [g[i] != t[i] for i in range(5)]
+    codes = np.zeros((len(guesses), len(targets)), dtype=np.uint8)
+    for i in range(5):
+        codes += ~open_[i] * np.uint8(2 * WEIGHTS[i])
+        # Unmatched copies of this letter in the target...
+        avail = np.zeros_like(codes)
+        for j in range(5):
+            avail += (t[j] == g[i]) & open_[j]
+        # ...minus those already claimed by earlier non-green guess letters
+        used = np.zeros_like(codes)
+        for k in range(i):
+            used += (g[k] == g[i]) & open_[k]
+        codes += (open_[i] & (used < avail)) * WEIGHTS[i]
+    return codes
+
+def compute_matrix(words, out=None, chunk=256):
+    arr = words_to_array(words)
+    n = len(arr)
+    if out is None:
+        out = np.empty((n, n), dtype=np.uint8)
+    for start in range(0, n, chunk):
+        out[start:start + chunk] = score_block(arr[start:start + chunk], arr)
+    return out
+
+def matrix_path(words, cache_dir=None):
+    cache_dir = cache_dir or CACHE_DIR
+    return os.path.join(cache_dir, f"patterns-{words_fingerprint(words)}.npy")
+
+def _write_matrix(path, n, fill):
+    # fill(out) writes the (n, n) matrix; readers only ever see a whole file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=(n, n))
+    fill(out)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+
+def load_matrix(words, cache_dir=None):
+    # Feedback code for guess i against answer j is matrix[i, j]. The matrix
+    # is built once per word list and memory-mapped read-only afterwards, so
+    # every process shares the same pages.
+    path = matrix_path(words, cache_dir)
+    if not os.path.exists(path):
+        _write_matrix(path, len(words), lambda out: compute_matrix(words, out))
+    return np.load(path, mmap_mode="r")
+
+def update_matrix(old_words, new_words, cache_dir=None, chunk=1024):
+    # Cache the matrix for new_words by editing the cached one for
+    # old_words: pairs of surviving words are copied and only the rows and
+    # columns of added words are scored. Returns False, doing nothing, when
+    # there is no old matrix to start from.
+    path = matrix_path(new_words, cache_dir)
+    if os.path.exists(path):
+        return True
+    old_path = matrix_path(old_words, cache_dir)
+    if not os.path.exists(old_path):
+        return False
+    old = np.load(old_path, mmap_mode="r")
+    old_ids = {w: i for i, w in enumerate(old_words)}
+    source = np.array([old_ids.get(w, -1) for w in new_words], dtype=np.intp)
+    kept = np.flatnonzero(source >= 0)
+    added = np.flatnonzero(source < 0)
+    kept_old = source[kept]
+    # Surviving words keep their order, so their columns move in a few
+    # long runs that copy as slices: (new column, old column, width)
+    breaks = np.flatnonzero((np.diff(kept) != 1) | (np.diff(kept_old) != 1)) + 1
+    runs = [(kept[s], kept_old[s], e - s) for s, e in zip(np.r_[0, breaks], np.r_[breaks, len(kept)])]
+
+    def fill(out):
+        # One contiguous block of rows at a time
+        arr = words_to_array(new_words)
+        n = len(new_words)
+        for start in range(0, n, chunk):
+            src = source[start:start + chunk]
+            block = np.empty((len(src), n), dtype=np.uint8)
+            have = np.flatnonzero(src >= 0)
+            new = np.flatnonzero(src < 0)
+            part = block if not len(new) else np.empty((len(have), n), dtype=np.uint8)
+            rows_old = old[src[have]]
+            for new_col, old_col, width in runs:
+                part[:, new_col:new_col + width] = rows_old[:, old_col:old_col + width]
+            if part is not block:
+                block[have] = part
+            if len(new):
+                block[new] = score_block(arr[start + new], arr)
+            if len(added):
+                block[:, added] = score_block(arr[start:start + chunk], arr[added])
+            out[start:start + chunk] = block
+
+    _write_matrix(path, len(new_words), fill)
+    return True
+
+class PatternMatrix:
+    def __init__(self, index, cache_dir=None):
+        self.index = index
+        self.matrix = load_matrix(index.words, cache_dir)
+
+    def pattern(self, guess, answer):
+        return int(self.matrix[self.index.ids[guess], self.index.ids[answer]])
+
+    def marks(self, guess, answer):
+        return decode_pattern(self.pattern(guess, answer))
+
+    def row(self, guess):
+        return self.matrix[self.index.ids[guess]]
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from word_index import load_word_index
+    index, _ = load_word_index(sys.argv[1] if len(sys.argv) > 1 else "words_5.txt")
+    t0 = time.perf_counter()
+    load_matrix(index.words)
+    print(f"{matrix_path(index.words)}: {len(index)}x{len(index)} in {time.perf_counter() - t0:.2f}s")
@@ -0,0 +1,260 @@
+import string
+import tkinter as tk
+from tkinter import font as tkfont
+from race_client import RaceClient, RaceView, parse_address
+from race_server import RACE_PORT
+from multi_board import KB_ROWS
+from wordle_core import ROWS, COLS, decode_pattern
+
+POLL_MS = 30
+MAX_SHOWN = 20  # opponents drawn; the rest are only counted
+OPPONENT_COLUMNS = 4
+
+class RaceCanvas(tk.Canvas):
+    # Your own board with letters on the left, opponents' marks (never
+    # their letters) in small grids on the right. Opponent rows are drawn
+    # as they arrive; the grids are laid out again only when the round or
+    # the set of opponents shown changes.
+    def __init__(self, master, colors, rows):
+        super().__init__(master, bg=colors["board_bg"], highlightthickness=0, width=460, height=330)
+        self.colors = colors
+        self.rows = rows
+        self.size = 32
+        self.mini = 7
+        self.font = tkfont.Font(family="Helvetica Neue", size=14, weight="bold")
+        self.name_font = tkfont.Font(family="Helvetica Neue", size=8, weight="bold")
+        self.round = None
+        self.names = []
+        self.drawn = {}
+        self.labels = {}
+
+    def _fills(self):
+        colors = self.colors
+        return (colors["gray"], colors["yellow"], colors["green"])
+
+    def draw_mine(self, view, typed):
+        self.delete("mine")
+        fills = self._fills()
+        step = self.size + 4
+        for r in range(view.rows):
+            y = 10 + r * step
+            if r < len(view.guesses):
+                word, marks = view.guesses[r]
+            else:
+                word, marks = typed if r == len(view.guesses) else "", None
+            for c in range(COLS):
+                x = 10 + c * step
+                fill = fills[marks[c]] if marks else self.colors["tile_empty"]
+                self.create_rectangle(x, y, x + self.size, y + self.size, fill=fill, width=2,
+                                      outline=self.colors["tile_border"], tags=("mine",))
+                if c < len(word):
+                    self.create_text(x + self.size / 2, y + self.size / 2, text=word[c].upper(), font=self.font,
+                                     fill="white" if marks else self.colors["tile_text"], tags=("mine",))
+
+    def _origin(self, slot):
+        cell_w = COLS * (self.mini + 1) + 8
+        cell_h = self.rows * (self.mini + 1) + 16
+        col, row = slot % OPPONENT_COLUMNS, slot // OPPONENT_COLUMNS
+        return 200 + col * cell_w, 10 + row * cell_h
+
+    def draw_opponents(self, view):
+        names = [name for name in view.racers if name != view.player][:MAX_SHOWN]
+        if view.round != self.round or names != self.names:
+            self.delete("opponent")
+            self.round, self.names, self.drawn, self.labels = view.round, names, {}, {}
+            for slot, name in enumerate(names):
+                x, y = self._origin(slot)
+                self.labels[name] = self.create_text(x, y, text=name[:8], anchor="nw", font=self.name_font,
+                                                     fill=self.colors["tile_text"], tags=("opponent",))
+        fills = self._fills()
+        step = self.mini + 1
+        for slot, name in enumerate(names):
+            racer = view.racers[name]
+            codes = racer["codes"]
+            x0, y0 = self._origin(slot)
+            for r in range(self.drawn.get(name, 0), len(codes)):
+                y = y0 + 12 + r * step
+                for c, mark in enumerate(decode_pattern(codes[r])):
+                    x = x0 + c * step
+                    self.create_rectangle(x, y, x + self.mini, y + self.mini, width=0, fill=fills[mark],
+                                          tags=("opponent",))
+            self.drawn[name] = len(codes)
+            if racer["won"]:
+                self.itemconfigure(self.labels[name], text=f"#{racer['place']} {name[:6]}", fill=self.colors["green"])
+            elif racer["over"]:
+                self.itemconfigure(self.labels[name], fill=self.colors["gray"])
+
+class RaceApp(tk.Frame):
+    # Race mode: join a room on a race server, then everyone plays the same
+    # word and sees the others' colours appear as they guess
+    def __init__(self, master, back_to_menu_callback, colors, player_name, hard_mode_getter):
+        super().__init__(master, bg=colors["bg"])
+        self.master = master
+        self.back_to_menu_callback = back_to_menu_callback
+        self.colors = colors
+        self.player_name = player_name
+        self.hard_mode_getter = hard_mode_getter
+        self.client = None
+        self.view = None
+        self.typed = ""
+        self._poll_id = None
+
+        tk.Label(self, text="WORDLE RACE", font=("Helvetica Neue", 22, "bold"),
+                 bg=colors["bg"], fg="#22223b").pack(pady=(10, 2))
+        self.status = tk.Label(self, text="Join a room to race", font=("Helvetica Neue", 12), bg=colors["bg"],
+                               fg="#1976d2", wraplength=460, justify="center")
+        self.status.pack(pady=(0, 4))
+
+        join = tk.Frame(self, bg=colors["bg"])
+        join.pack(pady=(0, 6))
+        tk.Label(join, text="Server", bg=colors["bg"], fg="#22223b").grid(row=0, column=0, sticky="e")
+        self.server_entry = tk.Entry(join, width=22)
+        self.server_entry.insert(0, f"127.0.0.1:{RACE_PORT}")
+        self.server_entry.grid(row=0, column=1, padx=4)
+        tk.Label(join, text="Room", bg=colors["bg"], fg="#22223b").grid(row=1, column=0, sticky="e")
+        self.room_entry = tk.Entry(join, width=22)
+        self.room_entry.insert(0, "lobby")
+        self.room_entry.grid(row=1, column=1, padx=4)
+        self.join_btn = tk.Button(join, text="Join", command=self.join, bg=colors["green"], fg="white",
+                                  font=("Helvetica Neue", 11, "bold"), relief="ridge", padx=10)
+        self.join_btn.grid(row=0, column=2, rowspan=2, padx=6)
+
+        self.board = RaceCanvas(self, colors, ROWS)
+        self.board.pack(padx=8, fill="both", expand=True)
+
+        keyboard = tk.Frame(self, bg=colors["bg"])
+        keyboard.pack(pady=(4, 4))
+        for i, keys in enumerate(KB_ROWS):
+            rowf = tk.Frame(keyboard, bg=colors["bg"])
+            rowf.pack()
+            for key in list(keys) + (["ENTER", "⌫"] if i == 2 else []):
+                tk.Button(rowf, text=key, font=("Helvetica Neue", 11, "bold"), bg=colors["key_bg"],
+                          fg=colors["key_fg"], relief="ridge", width=3 if len(key) == 1 else 6,
+                          command=lambda k=key: self.on_virtual_key(k)).pack(side="left", padx=1, pady=1)
+
+        controls = tk.Frame(self, bg=colors["bg"])
+        controls.pack(pady=(0, 10))
+        btn_style = {"font": ("Helvetica Neue", 11, "bold"), "padx": 10, "pady": 6, "relief": "ridge"}
+        self.next_btn = tk.Button(controls, text="Next Round", command=self.next_round, state="disabled",
+                                  bg=colors["green"], fg="white", **btn_style)
+        self.next_btn.pack(side="left", padx=6)
+        tk.Button(controls, text="Leave", command=self.leave,
+                  bg=colors["gray"], fg="white", **btn_style).pack(side="left", padx=6)
+        tk.Button(controls, text="Main Menu", command=self.back_to_menu,
+                  bg="#1976d2", fg="white", **btn_style).pack(side="left", padx=6)
+
+    def bind_keys(self):
+        self.master.bind("<Key>", self.on_key_event)
+        self.master.unbind("<Escape>")
+
+    def join(self):
+        if self.client is not None:
+            return
+        try:
+            host, port = parse_address(self.server_entry.get())
+        except ValueError:
+            self.status.config(text="Server should look like host:port")
+            return
+        room = self.room_entry.get().strip() or "lobby"
+        self.view = RaceView()
+        self.typed = ""
+        self.client = RaceClient(host, port, room, self.player_name, self.hard_mode_getter()).start()
+        self.join_btn.config(state="disabled")
+        self.status.config(text=f"Connecting to {host}:{port}...")
+        self._poll_id = self.after(POLL_MS, self._poll)
+
+    def leave(self):
+        if self.client is not None:
+            self.client.close()
+        self._stop()
+        self.status.config(text="Join a room to race")
+
+    def back_to_menu(self):
+        self.leave()
+        self.back_to_menu_callback()
+
+    def _stop(self):
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.client = None
+        self.join_btn.config(state="normal")
+        self.next_btn.config(state="disabled")
+
+    def _poll(self):
+        self._poll_id = None
+        events = self.client.poll()
+        for event in events:
+            # Typed letters stay until the server takes the word
+            if self.view.apply(event) in ("guess", "round"):
+                self.typed = ""
+        if events:
+            self._show()
+        if self.view.closed:
+            self._stop()
+        else:
+            self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _show(self):
+        view = self.view
+        if view.closed:
+            self.status.config(text=f"Disconnected: {view.error}")
+            return
+        if not view.joined:
+            return
+        self.board.draw_mine(view, self.typed)
+        self.board.draw_opponents(view)
+        others = len(view.racers) - 1
+        hidden = max(0, others - MAX_SHOWN)
+        line = f"Room {view.room} · round {view.round} · {others} opponents" + (f" ({hidden} not shown)" if hidden else "")
+        if view.error:
+            message = view.error
+        elif view.won:
+            message = f"Solved! Place #{view.racers[view.player]['place']}"
+        elif view.winner:
+            message = f"{view.winner} won this round" + (f" · answer {view.answer.upper()}" if view.answer else "")
+        elif view.over:
+            message = f"Out of guesses · answer {view.answer.upper()}" if view.answer else "Out of guesses"
+        else:
+            message = "Go!"
+        self.status.config(text=f"{message}\n{line}")
+        self.next_btn.config(state="normal" if view.can_start_next() else "disabled")
+
+    def next_round(self):
+        if self.client is not None:
+            self.client.next_round()
+
+    def on_virtual_key(self, key):
+        if key == "ENTER":
+            self.submit_guess()
+        elif key == "⌫":
+            self.backspace()
+        elif len(key) == 1 and key in string.ascii_uppercase:
+            self.type_letter(key)
+
+    def on_key_event(self, event):
+        key = event.keysym
+        if key == "Return":
+            self.submit_guess()
+        elif key in ("BackSpace", "Delete"):
+            self.backspace()
+        elif len(event.char) == 1 and event.char.isalpha():
+            self.type_letter(event.char.upper())
+
+    def _playing(self):
+        return self.client is not None and self.view.joined and not self.view.over and not self.view.finished
+
+    def type_letter(self, ch):
+        if self._playing() and len(self.typed) < COLS:
+            self.typed += ch.lower()
+            self.board.draw_mine(self.view, self.typed)
+
+    def backspace(self):
+        if self._playing() and self.typed:
+            self.typed = self.typed[:-1]
+            self.board.draw_mine(self.view, self.typed)
+
+    def submit_guess(self):
+        # The server checks the word; its reply or error shows on the next poll
+        if self._playing() and len(self.typed) == COLS:
+            self.client.guess(self.typed)
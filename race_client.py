@@ -0,0 +1,194 @@
+import json
+import queue
+import asyncio
+import threading
+from game_server import open_websocket, encode_frame, read_frame
+from race_server import RACE_PORT
+from wordle_core import ROWS, encode_marks
+
+def parse_address(text, default_port=RACE_PORT):
+    # "host", "host:port" or ":port" -> (host, port)
+    host, sep, port = text.strip().rpartition(":")
+    if not sep:
+        host, port = port, ""
+    return host or "127.0.0.1", int(port) if port else default_port
+
+class RaceClient:
+    # A race connection for a GUI. The socket lives on a daemon thread with
+    # its own event loop; guess() and next_round() hand frames to that loop
+    # from any thread, and server events wait in a queue until the UI polls.
+    # A final {"type": "closed"} event reports the end of the connection.
+    def __init__(self, host, port, room, player, hard=False):
+        self.host = host
+        self.port = port
+        self.join_args = {"room": room, "player": player, "hard": bool(hard)}
+        self.events = queue.SimpleQueue()
+        self._loop = None
+        self._writer = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run_thread, name="race", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run_thread(self):
+        error = None
+        try:
+            asyncio.run(self._run())
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        self._loop = None
+        self.events.put({"type": "closed", "error": error})
+
+    async def _run(self):
+        reader, writer = await open_websocket(self.host, self.port, "/race")
+        self._writer = writer
+        self._loop = asyncio.get_running_loop()
+        self._write("join", self.join_args)
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == 8:
+                    break
+                if opcode == 9:
+                    writer.write(encode_frame(payload, opcode=10, mask=True))
+                elif opcode == 1:
+                    for event in json.loads(payload)["events"]:
+                        self.events.put(event)
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("race server went away")
+        finally:
+            writer.close()
+
+    def _write(self, op, args):
+        self._writer.write(encode_frame(json.dumps(dict(args, op=op)).encode("utf-8"), mask=True))
+
+    def send(self, op, **args):
+        # Dropped when not connected; the "closed" event says so
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._write, op, args)
+            except RuntimeError:
+                pass  # loop closed in between
+
+    def guess(self, word):
+        self.send("guess", word=word)
+
+    def next_round(self):
+        self.send("next")
+
+    def close(self):
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._writer.write, encode_frame(b"\x03\xe8", opcode=8, mask=True))
+            except RuntimeError:
+                pass
+
+    def poll(self, timeout=0):
+        # Every queued event; waits up to timeout seconds for the first
+        events = []
+        try:
+            events.append(self.events.get(timeout=timeout) if timeout else self.events.get_nowait())
+            while True:
+                events.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+class RaceView:
+    # What a race client shows, rebuilt from server events: the player's own
+    # guesses with letters, and every racer's progress as mark codes only.
+    def __init__(self):
+        self.room = None
+        self.player = None
+        self.round = 0
+        self.rows = ROWS
+        self.hard = False
+        self.guesses = []
+        self.racers = {}
+        self.answer = None
+        self.winner = None
+        self.finished = False
+        self.error = None
+        self.closed = False
+
+    def apply(self, event):
+        kind = event.get("type")
+        if kind == "joined":
+            self.room = event["room"]
+            self.player = event["player"]
+            self.rows = event["rows"]
+            self.hard = event["hard"]
+            self._reset(event["round"])
+            self.winner = event["winner"]
+            self.finished = event["done"]
+            self.racers = {racer["player"]: racer for racer in event["racers"]}
+        elif kind == "round":
+            self.rows = event["rows"]
+            self._reset(event["round"])
+            for name, racer in self.racers.items():
+                self.racers[name] = dict(racer, codes=[], won=False, over=False, place=0, round=self.round)
+        elif kind == "progress":
+            if event["round"] == self.round:
+                self.racers[event["player"]] = event
+                if event["place"] == 1:
+                    self.winner = event["player"]
+        elif kind == "leave":
+            self.racers.pop(event["player"], None)
+        elif kind == "finished":
+            if event["round"] == self.round:
+                self.finished = True
+                self.answer = event["answer"]
+                self.winner = event["winner"]
+        elif kind == "guess":
+            if event["round"] == self.round:
+                self.guesses.append((event["word"], event["marks"]))
+                self.answer = event.get("answer", self.answer)
+                self.error = None
+                # Our own row shows now, ahead of the batched broadcast
+                me = self.racers.get(self.player)
+                if me is not None:
+                    self.racers[self.player] = dict(me, codes=me["codes"] + [encode_marks(event["marks"])],
+                                                    won=event["won"], over=event["over"], place=event["place"])
+        elif kind == "error":
+            self.error = event["error"]
+        elif kind == "closed":
+            self.closed = True
+            # Keep the server's reason (e.g. removed for inactivity) if it sent one
+            self.error = event["error"] or self.error or "disconnected"
+        return kind
+
+    def _reset(self, round_number):
+        self.round = round_number
+        self.guesses = []
+        self.answer = None
+        self.winner = None
+        self.finished = False
+        self.error = None
+
+    @property
+    def joined(self):
+        return self.player is not None and not self.closed
+
+    @property
+    def over(self):
+        me = self.racers.get(self.player)
+        return bool(me and me["over"])
+
+    @property
+    def won(self):
+        me = self.racers.get(self.player)
+        return bool(me and me["won"])
+
+    def can_start_next(self):
+        return self.finished
+
+    def opponents(self):
+        # Winners by place, then whoever has played most rows
+        others = [racer for name, racer in self.racers.items() if name != self.player]
+        others.sort(key=lambda r: (not r["won"], r["place"], -len(r["codes"]), r["player"]))
+        return others
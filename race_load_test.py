@@ -0,0 +1,177 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from word_index import load_word_index
+from game_server import WORDS_FILE, read_frame, encode_frame, open_websocket
+from load_test import percentile, spawn_server
+from race_server import RACE_PORT
+
+class Counters:
+    __slots__ = ("frames", "events", "guesses", "rejected", "rounds", "errors")
+
+    def __init__(self):
+        self.frames = self.events = self.guesses = self.rejected = self.rounds = self.errors = 0
+
+class SimRacer:
+    # One simulated player: guesses a random word every interval (jittered)
+    # and, for every opponent row it is told about, records how long ago
+    # that opponent sent the guess. All racers share one process, so the
+    # send times are directly comparable.
+    def __init__(self, name, room, reader, writer):
+        self.name = name
+        self.room = room
+        self.reader = reader
+        self.writer = writer
+        self.round = None
+        self.row = 0
+        self.over = False
+        self.waiting = True  # for the reply to our last op
+
+    def send(self, op, **args):
+        self.writer.write(encode_frame(json.dumps(dict(args, op=op)).encode("utf-8"), mask=True))
+
+    async def listen(self, sent, latencies, counters):
+        while True:
+            opcode, payload = await read_frame(self.reader)
+            if opcode == 8:
+                return
+            now = time.perf_counter()
+            events = json.loads(payload)["events"]
+            counters.frames += 1
+            counters.events += len(events)
+            for event in events:
+                kind = event["type"]
+                if kind == "progress":
+                    if event["player"] != self.name:
+                        t0 = sent.get((self.room, event["player"], event["round"], len(event["codes"])))
+                        if t0 is not None:
+                            latencies.append(now - t0)
+                elif kind == "guess":
+                    self.row += 1
+                    self.over = event["over"]
+                    self.waiting = False
+                elif kind == "joined":
+                    self.round = event["round"]
+                    self.waiting = False
+                elif kind == "round":
+                    self.round = event["round"]
+                    self.row = 0
+                    self.over = False
+                    self.waiting = False
+                    counters.rounds += 1
+                elif kind == "error":
+                    # A repeated word, or "next" while others still play
+                    counters.rejected += 1
+                    self.waiting = False
+
+    async def play(self, words, rng, deadline, interval, sent, counters):
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(interval * (0.5 + rng.random()))
+            if self.waiting:
+                continue
+            if self.over:
+                # Answered by a "round" event to everyone, or an error
+                self.waiting = True
+                self.send("next")
+                continue
+            sent[(self.room, self.name, self.round, self.row + 1)] = time.perf_counter()
+            self.waiting = True
+            self.send("guess", word=rng.choice(words))
+            counters.guesses += 1
+
+async def connect(host, port, name, room, limit):
+    async with limit:
+        reader, writer = await open_websocket(host, port, "/race")
+    racer = SimRacer(name, room, reader, writer)
+    racer.send("join", room=room, player=name)
+    return racer
+
+async def run(host, port, players, room_size, duration, interval, seed, words_file):
+    index, _ = load_word_index(words_file)
+    words = index.words
+    rooms = -(-players // room_size)
+    # The server's listen backlog is small; connect a few dozen at a time
+    limit = asyncio.Semaphore(50)
+    racers = await asyncio.gather(*(connect(host, port, f"racer-{i}", f"room-{i % rooms}", limit)
+                                    for i in range(players)))
+    sent, latencies, counters = {}, [], Counters()
+    listeners = [asyncio.create_task(r.listen(sent, latencies, counters)) for r in racers]
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+    try:
+        await asyncio.gather(*(r.play(words, random.Random(seed + i), deadline, interval, sent, counters)
+                               for i, r in enumerate(racers)))
+        # Let the last batches arrive
+        await asyncio.sleep(0.2)
+    finally:
+        for task in listeners:
+            if task.done() and task.exception() is not None:
+                counters.errors += 1
+            task.cancel()
+        for r in racers:
+            r.writer.write(encode_frame(b"\x03\xe8", opcode=8, mask=True))
+            r.writer.close()
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "players": players,
+        "rooms": rooms,
+        "elapsed": elapsed,
+        "guesses": counters.guesses,
+        "rejected": counters.rejected,
+        "rounds": counters.rounds // max(1, room_size),
+        "deliveries": len(latencies),
+        "deliveries_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "frames": counters.frames,
+        "events_per_frame": counters.events / counters.frames if counters.frames else 0.0,
+        "errors": counters.errors,
+        "p50_ms": 1000 * percentile(latencies, 0.50),
+        "p99_ms": 1000 * percentile(latencies, 0.99),
+        "max_ms": 1000 * latencies[-1] if latencies else 0.0,
+    }
+
+def print_report(report):
+    print(f"Players: {report['players']} in {report['rooms']} rooms  Elapsed: {report['elapsed']:.2f}s")
+    print(f"Guesses: {report['guesses']}  Rejected: {report['rejected']}  Rounds: ~{report['rounds']}  "
+          f"Errors: {report['errors']}")
+    print(f"Deliveries: {report['deliveries']}  ({report['deliveries_per_sec']:.0f}/s)  "
+          f"Frames: {report['frames']}  ({report['events_per_frame']:.1f} events/frame)")
+    print(f"Fan-out latency: p50 {report['p50_ms']:.2f} ms  p99 {report['p99_ms']:.2f} ms  "
+          f"max {report['max_ms']:.2f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure race_server.py fan-out latency on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=RACE_PORT)
+    parser.add_argument("--spawn", action="store_true", help="start a server for the run instead of using --port")
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--room-size", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--interval", type=float, default=1.0, help="mean seconds between a player's guesses")
+    parser.add_argument("--batch-ms", type=float, help="with --spawn: the server's batch window")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--words", default=WORDS_FILE)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+    server_args = ["--reload", "0"]
+    if args.batch_ms is not None:
+        server_args += ["--batch-ms", str(args.batch_ms)]
+    proc, port = spawn_server(args.words, "race_server.py", server_args) if args.spawn else (None, args.port)
+    try:
+        report = asyncio.run(run(args.host, port, args.players, args.room_size, args.duration,
+                                 args.interval, args.seed, args.words))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
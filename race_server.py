@@ -0,0 +1,403 @@
+import sys
+import json
+import time
+import struct
+import random
+import signal
+import asyncio
+import argparse
+from word_lists import WordListWatcher
+from game_state import GameState
+from answer_sampler import pick_answer
+from tracing import traced
+from wordle_core import ROWS
+from game_server import (WORDS_FILE, ANSWERS_FILE, read_request, write_response, accept_websocket,
+                         encode_frame, read_frame, accepts)
+
+RACE_PORT = 8766
+BATCH_WINDOW = 0.004  # seconds a broadcast waits so others can share its frame
+MAX_BUFFERED = 256 * 1024  # bytes queued to one racer before it is dropped
+MAX_ROOMS = 1000
+MAX_RACERS = 256  # per room
+MAX_NAME = 24
+GRACE_PERIOD = 30.0  # seconds the others get to finish after the first win
+PING_INTERVAL = 15.0  # quiet racers are pinged; three intervals without a frame drops them
+IDLE_TIMEOUT = 120.0  # a racer still playing an open round who sends no op this long is removed
+AWAY_TIMEOUT = 600.0  # anyone who sends no op this long is removed
+# Answers must not be predictable from earlier rounds
+_rng = random.SystemRandom()
+
+def encode_events(events):
+    # Every server message is one text frame holding {"events": [...]}
+    return encode_frame(json.dumps({"events": events}, separators=(",", ":")).encode("utf-8"))
+
+def _error(message):
+    return {"type": "error", "error": message}
+
+class Racer:
+    # One connection. Sends never wait: a racer whose socket buffer passes
+    # MAX_BUFFERED is disconnected instead of holding up the room.
+    # last_seen moves on any frame (pongs included), last_active only on ops.
+    __slots__ = ("writer", "name", "room", "state", "place", "last_seen", "last_active")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.name = None
+        self.room = None
+        self.state = None
+        self.place = 0
+        self.last_seen = self.last_active = time.monotonic()
+
+    def send(self, frame):
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_BUFFERED:
+            transport.abort()
+            return
+        self.writer.write(frame)
+
+    def progress(self, round_number):
+        # Marks only: opponents see the colours of each row, never the letters
+        state = self.state
+        return {"type": "progress", "player": self.name, "round": round_number, "codes": list(state.codes),
+                "won": state.won, "over": state.over, "place": self.place}
+
+class Room:
+    # One race: every racer plays the same target. Broadcasts wait up to
+    # batch_window in a queue and go out as one frame, encoded once and
+    # written to every racer, so a burst of guesses costs one JSON encode
+    # per batch rather than one per guess and recipient. A racer's newer
+    # progress replaces its older one in the same batch.
+    __slots__ = ("name", "hard", "batch_window", "racers", "round", "lists", "target", "places", "winner",
+                 "done", "pending", "_latest", "_flush", "_grace", "batches")
+
+    def __init__(self, name, hard, lists, batch_window=BATCH_WINDOW):
+        self.name = name
+        self.hard = hard
+        self.batch_window = batch_window
+        self.racers = {}
+        self.round = 0
+        self.pending = []
+        self._latest = {}
+        self._flush = None
+        self._grace = None
+        self.batches = 0
+        self._start_round(lists)
+
+    def _start_round(self, lists):
+        self._cancel_grace()
+        self.round += 1
+        self.lists = lists
+        # Keyed on the room so its players do not see the same answer twice soon
+        self.target = pick_answer(lists, f"room:{self.name}", _rng)
+        self.places = 0
+        self.winner = None
+        self.done = False
+        for racer in self.racers.values():
+            racer.state = self.new_state()
+            racer.place = 0
+
+    def new_round(self, lists):
+        self._start_round(lists)
+        self._latest.clear()
+        self.broadcast({"type": "round", "round": self.round, "rows": ROWS, "hard": self.hard})
+
+    def new_state(self):
+        return GameState.for_word(self.lists.index, self.target, ROWS, self.hard)
+
+    def unique_name(self, name):
+        if name not in self.racers:
+            return name
+        n = 2
+        while f"{name} {n}" in self.racers:
+            n += 1
+        return f"{name} {n}"
+
+    def broadcast(self, event):
+        if event["type"] == "progress":
+            i = self._latest.get(event["player"])
+            if i is not None:
+                self.pending[i] = event
+                return
+            self._latest[event["player"]] = len(self.pending)
+        self.pending.append(event)
+        if self._flush is None:
+            self._flush = asyncio.get_running_loop().call_later(self.batch_window, self.flush)
+
+    def flush(self):
+        self._flush = None
+        if not self.pending:
+            return
+        frame = encode_events(self.pending)
+        self.pending = []
+        self._latest.clear()
+        self.batches += 1
+        for racer in self.racers.values():
+            racer.send(frame)
+
+    def won_by(self, racer, grace_period=GRACE_PERIOD):
+        self.places += 1
+        racer.place = self.places
+        if self.winner is None:
+            self.winner = racer.name
+            # Whoever is still playing gets grace_period to finish
+            if not self.done:
+                self._grace = asyncio.get_running_loop().call_later(grace_period, self.finish)
+
+    def check_finished(self):
+        # The round ends when nobody is left playing
+        if not self.done and all(racer.state.over for racer in self.racers.values()):
+            self.finish()
+
+    def finish(self):
+        # Announce the answer once; after this anyone may start the next round
+        self._cancel_grace()
+        if not self.done:
+            self.done = True
+            self.broadcast({"type": "finished", "round": self.round, "answer": self.target,
+                            "winner": self.winner})
+
+    def _cancel_grace(self):
+        if self._grace is not None:
+            self._grace.cancel()
+            self._grace = None
+
+    def close(self):
+        self._cancel_grace()
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+
+class RaceServer:
+    # Rooms of racers over WebSocket at /race. A client sends text frames
+    # {"op": "join", "room": ..., "player": ..., "hard": ...}, then
+    # {"op": "guess", "word": ...} and {"op": "next"}; the reply to its own
+    # op is sent at once, everything the room should see is batched.
+    # GET /rooms lists the open rooms for a lobby.
+    def __init__(self, word_lists, max_rooms=MAX_ROOMS, batch_window=BATCH_WINDOW, grace_period=GRACE_PERIOD):
+        self.word_lists = word_lists
+        self.max_rooms = max_rooms
+        self.grace_period = grace_period
+        self.batch_window = batch_window
+        self.rooms = {}
+
+    def room_list(self):
+        return [{"room": room.name, "racers": len(room.racers), "round": room.round, "hard": room.hard}
+                for room in self.rooms.values()]
+
+    def call(self, racer, op, args):
+        # The event to send straight back, or None
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            return _error(f"unknown op {op!r}")
+        if op != "join" and racer.room is None:
+            return _error("join a room first")
+        if not accepts(handler, racer, **args):
+            return _error(f"bad arguments for {op!r}")
+        return handler(racer, **args)
+
+    @traced("race.join")
+    def op_join(self, racer, room="lobby", player="Player", hard=False):
+        if racer.room is not None:
+            return _error("already in a room")
+        # "false" or 0 from a client must not make a hard room
+        if not isinstance(hard, bool):
+            return _error("bad arguments for 'join'")
+        name = str(room).strip()[:MAX_NAME] or "lobby"
+        joined = self.rooms.get(name)
+        if joined is None:
+            if len(self.rooms) >= self.max_rooms:
+                return _error("too many rooms")
+            joined = self.rooms[name] = Room(name, hard, self.word_lists.current(), self.batch_window)
+        elif len(joined.racers) >= MAX_RACERS:
+            return _error("room is full")
+        racer.name = joined.unique_name(str(player).strip()[:MAX_NAME] or "Player")
+        racer.room = joined
+        racer.state = joined.new_state()
+        racer.place = 0
+        joined.racers[racer.name] = racer
+        # Someone joining a finished round just waits for the next one
+        joined.broadcast(racer.progress(joined.round))
+        return {"type": "joined", "room": joined.name, "player": racer.name, "round": joined.round,
+                "rows": ROWS, "hard": joined.hard, "winner": joined.winner, "done": joined.done,
+                "racers": [other.progress(joined.round) for other in joined.racers.values()]}
+
+    @traced("race.guess")
+    def op_guess(self, racer, word):
+        room, state = racer.room, racer.state
+        # Everyone has been shown the answer by now
+        if room.done:
+            return _error("the round is over")
+        word = str(word).lower()
+        error = state.validate(word)
+        if error:
+            return _error(error)
+        marks = state.submit(word)
+        if state.won:
+            room.won_by(racer, self.grace_period)
+        room.broadcast(racer.progress(room.round))
+        if state.over:
+            room.check_finished()
+        reply = {"type": "guess", "round": room.round, "word": word, "marks": marks,
+                 "over": state.over, "won": state.won, "place": racer.place}
+        if state.over:
+            reply["answer"] = room.target
+        return reply
+
+    def op_next(self, racer):
+        # Anyone may start the next round once it has finished: everyone is
+        # done, or the grace period after the first win ran out. Nobody's
+        # board is wiped mid-guess before that.
+        room = racer.room
+        if not room.done:
+            return _error("the race is still on")
+        room.new_round(self.word_lists.current())
+        return None
+
+    def leave(self, racer):
+        room = racer.room
+        if room is None:
+            return
+        racer.room = None
+        room.racers.pop(racer.name, None)
+        if not room.racers:
+            room.close()
+            self.rooms.pop(room.name, None)
+            return
+        room.broadcast({"type": "leave", "player": racer.name})
+        room.check_finished()
+
+    def sweep(self, now=None):
+        # Ping quiet racers and remove the ones that stopped answering, or
+        # that hold up an open round (e.g. a browser tab left in race mode)
+        now = time.monotonic() if now is None else now
+        for room in list(self.rooms.values()):
+            for racer in list(room.racers.values()):
+                idle = now - racer.last_active
+                if now - racer.last_seen > 3 * PING_INTERVAL:
+                    self.evict(racer, "connection lost")
+                elif idle > AWAY_TIMEOUT or idle > IDLE_TIMEOUT and not (racer.state.over or room.done):
+                    self.evict(racer, "removed for inactivity")
+                elif now - racer.last_seen > PING_INTERVAL:
+                    racer.send(encode_frame(b"", opcode=9))
+
+    def evict(self, racer, reason):
+        racer.send(encode_events([_error(reason)]))
+        racer.send(encode_frame(struct.pack(">H", 1001), opcode=8))
+        self.leave(racer)
+        racer.writer.close()
+
+    async def sweep_forever(self, interval=PING_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    async def close(self):
+        # Hang up on every racer so their handlers end before the loop does
+        for room in list(self.rooms.values()):
+            for racer in list(room.racers.values()):
+                racer.writer.close()
+        await asyncio.sleep(0.1)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            try:
+                request = await read_request(reader)
+            except ValueError as e:
+                write_response(writer, 400, {"error": str(e)}, keep_alive=False)
+                return
+            if request is None:
+                return
+            method, path, headers, _ = request
+            if headers.get("upgrade", "").lower() == "websocket":
+                await accept_websocket(writer, headers)
+                await self.handle_racer(reader, writer)
+                return
+            if path.split("?", 1)[0].rstrip("/") == "/rooms" and method == "GET":
+                write_response(writer, 200, {"rooms": self.room_list()}, keep_alive=False)
+            else:
+                write_response(writer, 404, {"error": "not found"}, keep_alive=False)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_racer(self, reader, writer):
+        racer = Racer(writer)
+        try:
+            while True:
+                try:
+                    opcode, payload = await read_frame(reader)
+                except ValueError:
+                    writer.write(encode_frame(struct.pack(">H", 1009), opcode=8))
+                    return
+                racer.last_seen = time.monotonic()
+                if opcode == 8:
+                    writer.write(encode_frame(payload[:2], opcode=8))
+                    return
+                if opcode == 9:
+                    writer.write(encode_frame(payload, opcode=10))
+                    continue
+                if opcode != 1:
+                    continue
+                racer.last_active = racer.last_seen
+                try:
+                    message = json.loads(payload)
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict) or "op" not in message:
+                    reply = _error("expected {\"op\": ...}")
+                else:
+                    reply = self.call(racer, message.pop("op"), message)
+                if reply is not None:
+                    racer.send(encode_events([reply]))
+                # Reading waits for the racer's own replies to drain; the
+                # broadcasts it receives never do
+                await writer.drain()
+        finally:
+            self.leave(racer)
+
+async def serve(host="127.0.0.1", port=RACE_PORT, words_file=WORDS_FILE, answers_file=ANSWERS_FILE,
+                reload_interval=5.0, batch_window=BATCH_WINDOW, grace_period=GRACE_PERIOD):
+    word_lists = WordListWatcher(words_file, answers_file, reload_interval)
+    lists = word_lists.current()
+    if reload_interval > 0:
+        word_lists.start()
+    race_server = RaceServer(word_lists, batch_window=batch_window, grace_period=grace_period)
+    server = await asyncio.start_server(race_server.handle_connection, host, port)
+    print(f"Serving race rooms with {len(lists.answers)} answers on "
+          f"ws://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except NotImplementedError:
+        pass  # Windows: Ctrl+C only
+    sweeper = asyncio.create_task(race_server.sweep_forever())
+    async with server:
+        await stop.wait()
+        sweeper.cancel()
+        await race_server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host Wordle race rooms for players on this machine or the LAN.")
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to accept players from the LAN")
+    parser.add_argument("--port", type=int, default=RACE_PORT)
+    parser.add_argument("--words", default=WORDS_FILE)
+    parser.add_argument("--answers", default=ANSWERS_FILE, help="optional answer list (default: any word)")
+    parser.add_argument("--reload", type=float, default=5.0, help="seconds between word list checks (0: never)")
+    parser.add_argument("--batch-ms", type=float, default=BATCH_WINDOW * 1000,
+                        help="how long a broadcast waits to share a frame with others")
+    parser.add_argument("--grace", type=float, default=GRACE_PERIOD,
+                        help="seconds others may keep playing after the first win")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.words, args.answers, args.reload, args.batch_ms / 1000,
+                          args.grace))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import sys
+import json
+import time
+import random
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from word_index import load_word_index
+from wordle_core import ROWS
+from constraints import Constraints
+from patterns import load_matrix, decode_pattern
+
+# Strategies are factories: factory(ctx) returns pick(candidates, history,
+# constraints) -> word id. candidates is a NumPy array of surviving ids,
+# history a list of (guess_id, pattern_code) and constraints the
+# Constraints every hard-mode guess must satisfy.
+STRATEGIES = {}
+
+def strategy(name):
+    def register(factory):
+        STRATEGIES[name] = factory
+        return factory
+    return register
+
+@strategy("random")
+def random_strategy(ctx):
+    def pick(candidates, history, constraints):
+        return int(candidates[ctx.rng.randrange(len(candidates))])
+    return pick
+
+@strategy("first")
+def first_strategy(ctx):
+    def pick(candidates, history, constraints):
+        return int(candidates[0])
+    return pick
+
+@strategy("entropy")
+def entropy_strategy(ctx):
+    from solver import Solver
+    solver = Solver(ctx.index, workers=1)
+    def pick(candidates, history, constraints):
+        # In hard mode the legal guesses are exactly the candidates
+        guess_ids = candidates.tolist() if ctx.hard and history else None
+        return ctx.index.ids[solver.best_guess(candidates.tolist(), guess_ids=guess_ids)]
+    return pick
+
+def load_strategy(name):
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    # "package.module:factory" for strategies that live outside this file
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown strategy: {name}")
+    return getattr(importlib.import_module(module), attr)
+
+class SimContext:
+    def __init__(self, words_file, strategy_name, hard=False, rows=ROWS, seed=0):
+        self.index, _ = load_word_index(words_file)
+        self.matrix = load_matrix(self.index.words)
+        self.hard = hard
+        self.rows = rows
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pick = load_strategy(strategy_name)(self)
+
+    def play(self, target_id):
+        # Number of guesses used, 0 for a loss, -1 for an illegal guess
+        self.rng.seed(f"{self.seed}:{target_id}")
+        words = self.index.words
+        candidates = np.arange(len(words))
+        history = []
+        constraints = Constraints()
+        for turn in range(1, self.rows + 1):
+            guess_id = self.pick(candidates, history, constraints)
+            guess = words[guess_id]
+            if self.hard and not constraints.allows(guess):
+                return -1
+            if guess_id == target_id:
+                return turn
+            code = int(self.matrix[guess_id, target_id])
+            history.append((guess_id, code))
+            candidates = candidates[self.matrix[guess_id, candidates] == code]
+            constraints.add(guess, decode_pattern(code))
+        return 0
+
+_ctx = None
+
+def _init_worker(*args):
+    global _ctx
+    _ctx = SimContext(*args)
+
+def _play_batch(target_ids):
+    return [_ctx.play(t) for t in target_ids]
+
+def run(words_file="words_5.txt", strategy_name="random", hard=False, rows=ROWS,
+        sample=None, seed=0, workers=1, batch=64):
+    index, _ = load_word_index(words_file)
+    # Build the matrix cache once before any worker tries to
+    load_matrix(index.words)
+    targets = list(range(len(index)))
+    if sample and sample < len(targets):
+        targets = sorted(random.Random(seed).sample(targets, sample))
+    ctx_args = (words_file, strategy_name, hard, rows, seed)
+    batches = [targets[i:i + batch] for i in range(0, len(targets), batch)]
+    t0 = time.perf_counter()
+    if workers <= 1:
+        _init_worker(*ctx_args)
+        results = [r for b in batches for r in _play_batch(b)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=ctx_args) as pool:
+            results = [r for rs in pool.map(_play_batch, batches) for r in rs]
+    elapsed = time.perf_counter() - t0
+    return summarize(results, elapsed, rows, strategy=strategy_name, hard=hard, workers=workers)
+
+def summarize(results, elapsed, rows, **info):
+    games = len(results)
+    wins = [r for r in results if r > 0]
+    dist = {str(n): 0 for n in range(1, rows + 1)}
+    for r in wins:
+        dist[str(r)] += 1
+    return dict(
+        info,
+        games=games,
+        elapsed=elapsed,
+        games_per_sec=games / elapsed if elapsed else 0.0,
+        distribution=dist,
+        failures=sum(1 for r in results if r == 0),
+        illegal=sum(1 for r in results if r < 0),
+        failure_rate=(games - len(wins)) / games if games else 0.0,
+        average_guesses=sum(wins) / len(wins) if wins else 0.0,
+    )
+
+def print_report(report):
+    print(f"Strategy: {report['strategy']}  Hard mode: {'on' if report['hard'] else 'off'}  "
+          f"Workers: {report['workers']}")
+    print(f"Games: {report['games']}  Elapsed: {report['elapsed']:.2f}s  "
+          f"({report['games_per_sec']:.1f} games/s)")
+    print(f"Failure rate: {report['failure_rate']:.2%}  (lost {report['failures']}, "
+          f"illegal {report['illegal']})  Average guesses: {report['average_guesses']:.3f}")
+    most = max(report["distribution"].values()) or 1
+    for n, count in report["distribution"].items():
+        print(f"  {n}: {count:6d} {'#' * round(40 * count / most)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Wordle headlessly and report solver throughput.")
+    parser.add_argument("--words", default="words_5.txt")
+    parser.add_argument("--strategy", default="random",
+                        help=f"one of {', '.join(STRATEGIES)} or module:factory")
+    parser.add_argument("--hard", action="store_true", help="enforce hard-mode rules")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--sample", type=int, help="play a random subset of this many answers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+    report = run(args.words, args.strategy, args.hard, args.rows, args.sample, args.seed, args.workers)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from patterns import load_matrix, matrix_path, words_fingerprint, CACHE_DIR
+from tracing import traced, count
+
+METRICS = ("entropy", "expected")
+CHUNK_ROWS = 1024
+# Below this many (guess, candidate) cells the pool costs more than it saves
+PARALLEL_CELLS = 4_000_000
+RANK_CACHE_SIZE = 256
+
+_worker_matrices = {}
+
+def _worker_matrix(path):
+    m = _worker_matrices.get(path)
+    if m is None:
+        m = _worker_matrices[path] = np.load(path, mmap_mode="r")
+    return m
+
+def score_guesses(matrix, guess_ids, candidate_ids, metric="entropy"):
+    # Higher is better for both metrics
+    sub = np.asarray(matrix[guess_ids][:, candidate_ids], dtype=np.intp)
+    n = len(candidate_ids)
+    offsets = (np.arange(len(guess_ids), dtype=np.intp) * 243)[:, None]
+    counts = np.bincount((sub + offsets).ravel(), minlength=len(guess_ids) * 243)
+    counts = counts.reshape(len(guess_ids), 243).astype(np.float64)
+    if metric == "expected":
+        return -(counts * counts).sum(axis=1) / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plogp = np.where(counts > 0, counts * np.log2(counts), 0.0)
+    return np.log2(n) - plogp.sum(axis=1) / n
+
+def _score_chunk(path, guess_ids, candidate_ids, metric):
+    return guess_ids, score_guesses(_worker_matrix(path), guess_ids, candidate_ids, metric)
+
+def candidates_fingerprint(candidate_ids):
+    ids = np.asarray(candidate_ids, dtype=np.int32)
+    return hashlib.sha1(ids.tobytes()).hexdigest()
+
+class Solver:
+    def __init__(self, index, metric="entropy", workers=None, cache_dir=None):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.index = index
+        self.metric = metric
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.matrix = load_matrix(index.words, self.cache_dir)
+        self.path = matrix_path(index.words, self.cache_dir)
+        self._pool = None
+        self._ranks = OrderedDict()
+        self._opening = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _score_all(self, candidate_ids, guess_ids=None, deadline=None):
+        # Returns (guess_ids, scores) for every guess scored before the
+        # deadline. Candidates are scored first so a partial result still
+        # contains a word that can win.
+        cand = np.asarray(candidate_ids, dtype=np.intp)
+        if guess_ids is None:
+            allowed = np.arange(len(self.index), dtype=np.intp)
+        else:
+            allowed = np.asarray(guess_ids, dtype=np.intp)
+        first = np.intersect1d(cand, allowed, assume_unique=True)
+        order = np.concatenate([first, np.setdiff1d(allowed, first, assume_unique=True)])
+        n = len(order)
+        chunks = [order[i:i + CHUNK_ROWS] for i in range(0, n, CHUNK_ROWS)]
+        done_ids, done_scores = [], []
+        if self.workers <= 1 or n * len(cand) < PARALLEL_CELLS:
+            for chunk in chunks:
+                if deadline is not None and done_ids and time.monotonic() > deadline:
+                    break
+                done_ids.append(chunk)
+                done_scores.append(score_guesses(self.matrix, chunk, cand, self.metric))
+        else:
+            pool = self._get_pool()
+            pending = {pool.submit(_score_chunk, self.path, chunk, cand, self.metric) for chunk in chunks}
+            while pending:
+                timeout = None
+                if deadline is not None and done_ids:
+                    timeout = max(0.0, deadline - time.monotonic())
+                finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not finished:
+                    for f in pending:
+                        f.cancel()
+                    break
+                for f in finished:
+                    ids, scores = f.result()
+                    done_ids.append(ids)
+                    done_scores.append(scores)
+        return np.concatenate(done_ids), np.concatenate(done_scores), len(done_ids) == len(chunks)
+
+    @traced("solver.rank")
+    def rank(self, candidate_ids, top=10, budget=None, guess_ids=None):
+        # Best guesses for the candidate set as [(word, score), ...].
+        # guess_ids restricts which words may be guessed (e.g. hard mode).
+        candidate_ids = sorted(candidate_ids)
+        if not candidate_ids:
+            return []
+        if len(candidate_ids) <= 2:
+            return [(self.index.words[i], 0.0) for i in candidate_ids][:top]
+        key = candidates_fingerprint(candidate_ids)
+        if guess_ids is not None:
+            guess_ids = sorted(guess_ids)
+            if not guess_ids:
+                return []
+            key += candidates_fingerprint(guess_ids)
+        cached = self._ranks.get(key)
+        if cached is not None and len(cached) >= top:
+            count("solver.cache_hit")
+            self._ranks.move_to_end(key)
+            return cached[:top]
+        deadline = time.monotonic() + budget if budget is not None else None
+        ids, scores, complete = self._score_all(candidate_ids, guess_ids, deadline)
+        # Prefer words that could be the answer when scores tie
+        is_cand = np.isin(ids, candidate_ids)
+        order = np.lexsort((~is_cand, -scores))[:top]
+        result = [(self.index.words[ids[i]], float(scores[i])) for i in order]
+        if complete:
+            self._ranks[key] = result
+            if len(self._ranks) > RANK_CACHE_SIZE:
+                self._ranks.popitem(last=False)
+        return result
+
+    def best_guess(self, candidate_ids, budget=None, guess_ids=None):
+        if guess_ids is None and len(candidate_ids) == len(self.index):
+            return self.opening_guess(budget)
+        ranked = self.rank(candidate_ids, top=1, budget=budget, guess_ids=guess_ids)
+        return ranked[0][0] if ranked else None
+
+    def opening_guess(self, budget=None):
+        # Scoring the full list takes a while, so the result is kept on disk
+        # next to the pattern matrix. Within a budget the best word scored
+        # so far is returned, and only a complete result is kept.
+        if self._opening is not None:
+            return self._opening
+        path = os.path.join(self.cache_dir, f"opening-{words_fingerprint(self.index.words)}-{self.metric}.json")
+        try:
+            with open(path, "r") as f:
+                self._opening = json.load(f)["word"]
+                return self._opening
+        except Exception:
+            pass
+        deadline = time.monotonic() + budget if budget is not None else None
+        ids, scores, complete = self._score_all(range(len(self.index)), None, deadline)
+        word = self.index.words[ids[np.argmax(scores)]]
+        if not complete:
+            return word
+        self._opening = word
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"word": self._opening}, f)
+        os.replace(tmp, path)
+        return self._opening
+
+class SolverWarmup:
+    # Builds a Solver and its opening guess on a daemon thread: on a cold
+    # cache the pattern matrix alone takes many seconds, which a UI should
+    # spend saying "warming up" rather than frozen. solver is None until
+    # both are ready.
+    def __init__(self, index, metric="entropy"):
+        self.index = index
+        self.metric = metric
+        self.solver = None
+        self.error = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="solver-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            solver = Solver(self.index, self.metric)
+            solver.opening_guess()
+            self.solver = solver
+        except Exception as e:
+            self.error = e
+
+    @property
+    def ready(self):
+        return self.solver is not None
+
+    def wait(self, timeout=None):
+        # The solver, or None if it failed or is still building at timeout
+        self.start()._thread.join(timeout)
+        return self.solver
+
+if __name__ == "__main__":
+    import sys
+    from word_index import load_word_index
+    index, _ = load_word_index(sys.argv[1] if len(sys.argv) > 1 else "words_5.txt")
+    solver = Solver(index)
+    t0 = time.perf_counter()
+    print(f"Opening guess: {solver.opening_guess()} ({time.perf_counter() - t0:.2f}s)")
+    solver.close()
@@ -0,0 +1,97 @@
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Modules main.py should not pull in before the first paint
+DEFERRED = ("definitions", "requests", "urllib3", "concurrent.futures", "multiprocessing",
+            "numpy", "solver", "patterns", "hashlib")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+PAINT_LINE = re.compile(r"startup: ([\d.]+) ms to first paint")
+
+def import_times(module="main", python=sys.executable):
+    # [(module, self us, cumulative us, depth)] from python -X importtime
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return rows
+
+def import_report(rows, module="main", top=15):
+    # -X importtime lists children before their parent, so the module's own
+    # block is every nested row just above its top-level line. site and the
+    # other interpreter start-up imports sit in earlier blocks.
+    end = max(i for i, row in enumerate(rows) if row[0] == module and row[3] == 0)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    block = rows[start:end]
+    seen = {name for name, *_ in block}
+    heaviest = sorted(block, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": rows[end][2] / 1000,
+        "modules": len(block) + 1,
+        "heaviest": [{"module": name, "self_ms": s / 1000, "cumulative_ms": c / 1000}
+                     for name, s, c, _ in heaviest],
+        "deferred_but_imported": sorted(m for m in DEFERRED if m in seen),
+    }
+
+def first_paint_times(command, runs=5):
+    # Run the app until its first paint and collect the ms it reports
+    env = dict(os.environ, WORDLE_STARTUP_TIMING="exit", WORDLE_PLAYER="bench")
+    times = []
+    for _ in range(runs):
+        proc = subprocess.run(command, capture_output=True, text=True, env=env, timeout=60)
+        m = PAINT_LINE.search(proc.stderr)
+        if not m:
+            raise RuntimeError(f"no startup timing from {' '.join(command)}: {proc.stderr.strip()[-200:]}")
+        times.append(float(m.group(1)))
+    return times
+
+def print_report(report):
+    imports = report["imports"]
+    print(f"import {imports['module']}: {imports['import_ms']:.1f} ms over {imports['modules']} modules")
+    for row in imports["heaviest"]:
+        print(f"  {row['self_ms']:7.2f} ms self {row['cumulative_ms']:8.2f} ms cum  {row['module']}")
+    if imports["deferred_but_imported"]:
+        print(f"  imported eagerly (should be deferred): {', '.join(imports['deferred_but_imported'])}")
+    paint = report.get("first_paint")
+    if paint:
+        print(f"first paint ({paint['command']}): median {paint['median_ms']:.1f} ms, "
+              f"min {paint['min_ms']:.1f} ms, max {paint['max_ms']:.1f} ms over {len(paint['runs_ms'])} runs")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Tk startup: import cost and time to first paint.")
+    parser.add_argument("--runs", type=int, default=5, help="app launches to time (0 skips, e.g. without a display)")
+    parser.add_argument("--exe", help="time this frozen build (dist/wordle/wordle) instead of python main.py")
+    parser.add_argument("--top", type=int, default=15, help="heaviest imports to list")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+    report = {"imports": import_report(import_times("main"), "main", args.top)}
+    if args.runs > 0:
+        command = [args.exe] if args.exe else [sys.executable, "main.py"]
+        times = first_paint_times(command, args.runs)
+        report["first_paint"] = {
+            "command": " ".join(command),
+            "runs_ms": times,
+            "median_ms": statistics.median(times),
+            "min_ms": min(times),
+            "max_ms": max(times),
+        }
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from tracing import traced
+from wordle_core import ROWS
+
+# Counters kept per player and updated in O(1) per finished game, so every
+# figure in analytics() is read, never recomputed from history.
+# total_guesses is summed over won games, for the average per win. solve_ms
+# and won_in_N (wins in exactly N guesses) only exist since timing was
+# added, so they are averaged over timed_wins, not wins.
+WON_IN_FIELDS = tuple(f"won_in_{n}" for n in range(1, ROWS + 1))
+STAT_FIELDS = ("games", "wins", "streak", "max_streak", "total_guesses", "solve_ms", "timed_wins",
+               "hard_games", "hard_wins", "daily_games", "daily_wins") + WON_IN_FIELDS
+
+def default_stats():
+    return {field: 0 for field in STAT_FIELDS}
+
+def apply_game_result(stats, win, guesses=0, hard=False, daily=False, seconds=0.0):
+    for field in STAT_FIELDS:
+        stats.setdefault(field, 0)
+    stats["games"] += 1
+    if hard:
+        stats["hard_games"] += 1
+    if daily:
+        stats["daily_games"] += 1
+    if win:
+        stats["wins"] += 1
+        stats["total_guesses"] += guesses
+        stats["solve_ms"] += max(0, round(seconds * 1000))
+        stats["timed_wins"] += 1
+        stats[WON_IN_FIELDS[min(max(guesses, 1), ROWS) - 1]] += 1
+        if hard:
+            stats["hard_wins"] += 1
+        if daily:
+            stats["daily_wins"] += 1
+        stats["streak"] += 1
+        if stats["streak"] > stats["max_streak"]:
+            stats["max_streak"] = stats["streak"]
+    else:
+        stats["streak"] = 0
+    return stats
+
+def analytics(stats):
+    # Derived figures for the stats screens, straight from the counters
+    stats = dict(default_stats(), **stats)
+    games, wins, timed_wins = stats["games"], stats["wins"], stats["timed_wins"]
+    return {
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "streak": stats["streak"],
+        "max_streak": stats["max_streak"],
+        "average_guesses": stats["total_guesses"] / wins if wins else 0.0,
+        "average_solve_seconds": stats["solve_ms"] / 1000 / timed_wins if timed_wins else 0.0,
+        "distribution": [stats[field] for field in WON_IN_FIELDS],
+        # Wins from before timing are in neither figure above; the screens
+        # say so when there are any
+        "timed_wins": timed_wins,
+        "partial": timed_wins < wins,
+        "hard": (stats["hard_wins"], stats["hard_games"]),
+        "daily": (stats["daily_wins"], stats["daily_games"]),
+    }
+
+class SQLiteStatsStore:
+    # One row per player. WAL mode lets readers run alongside a writer, and
+    # record_game does its read-modify-write inside BEGIN IMMEDIATE so
+    # concurrent writers (threads or processes) serialize instead of losing
+    # updates.
+    def __init__(self, path, legacy_json=None, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS players ("
+                "name TEXT PRIMARY KEY, games INTEGER NOT NULL DEFAULT 0, "
+                "wins INTEGER NOT NULL DEFAULT 0, streak INTEGER NOT NULL DEFAULT 0, "
+                "max_streak INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+            for field in STAT_FIELDS:
+                if field not in columns:
+                    conn.execute(f"ALTER TABLE players ADD COLUMN {field} INTEGER NOT NULL DEFAULT 0")
+                    if field == "timed_wins" and WON_IN_FIELDS[0] in columns:
+                        # Every win counted in won_in_N was timed
+                        conn.execute(f"UPDATE players SET timed_wins = {' + '.join(WON_IN_FIELDS)}")
+            empty = conn.execute("SELECT 1 FROM players LIMIT 1").fetchone() is None
+            if empty and legacy_json:
+                self._migrate(conn, legacy_json)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _migrate(self, conn, legacy_json):
+        try:
+            with open(legacy_json, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        for player, stats in legacy.items():
+            self._upsert(conn, player, dict(default_stats(), **stats))
+
+    def _upsert(self, conn, player, stats):
+        stats = dict(default_stats(), **stats)
+        conn.execute(
+            f"INSERT INTO players (name, {', '.join(STAT_FIELDS)}) "
+            f"VALUES (?{', ?' * len(STAT_FIELDS)}) ON CONFLICT(name) DO UPDATE SET "
+            + ", ".join(f"{field}=excluded.{field}" for field in STAT_FIELDS),
+            (player, *(stats[field] for field in STAT_FIELDS)),
+        )
+
+    def _row(self, conn, player):
+        row = conn.execute(
+            f"SELECT {', '.join(STAT_FIELDS)} FROM players WHERE name = ?", (player,)
+        ).fetchone()
+        return dict(zip(STAT_FIELDS, row)) if row else default_stats()
+
+    def load_all(self):
+        rows = self._conn().execute(f"SELECT name, {', '.join(STAT_FIELDS)} FROM players")
+        return {name: dict(zip(STAT_FIELDS, values)) for name, *values in rows}
+
+    def get(self, player):
+        return self._row(self._conn(), player)
+
+    def put(self, player, stats):
+        with self._transaction() as conn:
+            self._upsert(conn, player, stats)
+
+    @traced("stats.record_game")
+    def record_game(self, player, win, guesses=0, hard=False, daily=False, seconds=0.0):
+        with self._transaction() as conn:
+            stats = apply_game_result(self._row(conn, player), win, guesses, hard, daily, seconds)
+            self._upsert(conn, player, stats)
+        return stats
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+class JsonStatsStore:
+    # The original whole-file format, kept for setups that want a single
+    # human-readable file. Writes go through a temp file and an atomic
+    # rename, but concurrent processes can still overwrite each other, so
+    # prefer SQLite when several processes share the stats.
+    def __init__(self, path, legacy_json=None):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load_all(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save(self, all_stats):
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(all_stats, f)
+        os.replace(tmp, self.path)
+
+    def get(self, player):
+        return dict(default_stats(), **self.load_all().get(player, {}))
+
+    def put(self, player, stats):
+        with self._lock:
+            all_stats = self.load_all()
+            all_stats[player] = stats
+            self._save(all_stats)
+
+    @traced("stats.record_game")
+    def record_game(self, player, win, guesses=0, hard=False, daily=False, seconds=0.0):
+        with self._lock:
+            all_stats = self.load_all()
+            stats = apply_game_result(dict(default_stats(), **all_stats.get(player, {})),
+                                      win, guesses, hard, daily, seconds)
+            all_stats[player] = stats
+            self._save(all_stats)
+        return stats
+
+    def close(self):
+        pass
+
+def open_stats_store(path, legacy_json=None):
+    # WORDLE_STATS_STORE overrides the path; the backend follows the extension
+    path = os.environ.get("WORDLE_STATS_STORE", path)
+    if path.endswith(".json"):
+        return JsonStatsStore(path)
+    return SQLiteStatsStore(path, legacy_json=legacy_json)
@@ -1,77 +1,70 @@
 import streamlit as st
 import random
 import os
-import json
-import hashlib
-import datetime
-from collections import Counter
-
-ROWS = 6
-COLS = 5
-STATS_FILE = "stats.json"
-
-def load_words_from_file(filename="words_5.txt"):
-    if not os.path.exists(filename):
-        return []
-    with open(filename, "r", encoding="utf-8") as f:
-        return [w.strip().lower() for w in f if len(w.strip()) == 5 and w.strip().isalpha()]
-
-def score_guess(guess, target):
-    result = [0] * 5
-    counts = Counter(target)
-    for i in range(5):
-        if guess[i] == target[i]:
-            result[i] = 2
-            counts[guess[i]] -= 1
-    for i in range(5):
-        if result[i] == 0 and counts.get(guess[i], 0) > 0:
-            result[i] = 1
-            counts[guess[i]] -= 1
-    return result
-
-def get_daily_word(words):
-    today = datetime.date.today().isoformat()
-    idx = int(hashlib.sha256(today.encode()).hexdigest(), 16) % len(words)
-    return words[idx]
-
-def get_definition(word):
-    import requests
-    try:
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-        resp = requests.get(url, timeout=5)
-        data = resp.json()
-        if isinstance(data, list) and "meanings" in data[0]:
-            meanings = data[0]["meanings"]
-            if meanings and "definitions" in meanings[0]:
-                definition = meanings[0]["definitions"][0].get("definition", "")
-                return definition
-        return "No definition found."
-    except Exception:
-        return "No definition found."
-
-def load_all_stats(filename=STATS_FILE):
-    if os.path.exists(filename):
-        with open(filename, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_all_stats(stats, filename=STATS_FILE):
-    with open(filename, "w") as f:
-        json.dump(stats, f)
-
-def get_hint(possible_words, prev_guesses, marks_list):
-    # Filter possible words based on previous guesses and marks
-    filtered = possible_words[:]
-    for guess, marks in zip(prev_guesses, marks_list):
-        new_filtered = []
-        for word in filtered:
-            if score_guess(guess, word) == marks:
-                new_filtered.append(word)
-        filtered = new_filtered
-    if filtered:
-        return random.choice(filtered)
+import time
+import statistics
+from word_lists import WordListWatcher, ANSWERS_FILE
+from definitions import prefetch_definition, get_definition
+from stats_store import open_stats_store, analytics
+from leaderboard import LeaderboardIndex, METRICS, format_value
+from game_state import GameState
+from game_log import log_game
+from tracing import record, game_profiler
+from daily_schedule import daily_word
+from answer_sampler import pick_answer
+from race_client import RaceClient, RaceView, parse_address
+from race_server import RACE_PORT
+from wordle_core import ROWS, COLS, decode_pattern
+
+_rerun_start = time.perf_counter()
+
+WORDS_FILE = "words_5.txt"
+STATS_FILE = "stats.db"
+LEGACY_STATS_FILE = "stats.json"  # migrated into STATS_FILE on first run
+LEADERBOARD_PAGE_SIZE = 10
+RACE_POLL_SECONDS = 0.5
+RACE_SHOWN = 12  # opponents listed; the rest are counted
+SHOW_TIMING = os.environ.get("WORDLE_SHOW_TIMING") == "1"
+
+def get_hint(candidates, words):
+    if candidates:
+        return words[random.choice(candidates)]
     return None
 
+# Shared resources are loaded once per server process and shared by every
+# session. The word lists are watched: an edited file is reloaded in the
+# background and new games use it, while games in progress keep the
+# snapshot they started with.
+@st.cache_resource(show_spinner=False)
+def get_word_lists(path, answers_path):
+    return WordListWatcher(path, answers_path, matrix=True).start()
+
+@st.cache_resource(show_spinner=False)
+def get_stats_store(path, legacy_path):
+    return open_stats_store(path, legacy_json=legacy_path)
+
+@st.cache_resource(show_spinner=False)
+def get_leaderboard(_store, path):
+    # Updated in place as games finish, so it is not keyed on the file version
+    return LeaderboardIndex(_store.load_all())
+
+# Keyed on the snapshot version; two entries let sessions still playing on
+# the previous word list finish their games. The solver builds on a
+# background thread from the first page load, so no session waits on it.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_solver(_words, version):
+    from solver import SolverWarmup
+    return SolverWarmup(_words).start()
+
+@st.cache_resource(show_spinner=False)
+def get_avatars():
+    return {
+        "a": "🦁", "b": "🐻", "c": "🐱", "d": "🐶", "e": "🦊", "f": "🐸", "g": "🐼", "h": "🐨",
+        "i": "🦄", "j": "🐧", "k": "🐔", "l": "🦉", "m": "🐵", "n": "🐙", "o": "🐢", "p": "🦖",
+        "q": "🦕", "r": "🦓", "s": "🐍", "t": "🦖", "u": "🦕", "v": "🦒", "w": "🦘", "x": "🦔",
+        "y": "🦚", "z": "🦜"
+    }
+
 def color_tile(letter, mark):
     color = "#bdbdbd" if mark == 0 else "#c9b458" if mark == 1 else "#6aaa64"
     emoji = "⬜" if mark == 0 else "🟨" if mark == 1 else "🟩"
@@ -79,13 +72,101 @@ def color_tile(letter, mark):
 
 def avatar(name):
     # Simple emoji avatar based on first letter
-    avatars = {
-        "a": "🦁", "b": "🐻", "c": "🐱", "d": "🐶", "e": "🦊", "f": "🐸", "g": "🐼", "h": "🐨",
-        "i": "🦄", "j": "🐧", "k": "🐔", "l": "🦉", "m": "🐵", "n": "🐙", "o": "🐢", "p": "🦖",
-        "q": "🦕", "r": "🦓", "s": "🐍", "t": "🦖", "u": "🦕", "v": "🦒", "w": "🦘", "x": "🦔",
-        "y": "🦚", "z": "🦜"
-    }
-    return avatars.get(name[0].lower(), "🙂")
+    return get_avatars().get(name[0].lower(), "🙂")
+
+def mark_emoji(code):
+    return "".join("⬜🟨🟩"[m] for m in decode_pattern(code))
+
+# --- Race mode: a RaceClient per session, polled by a fragment so only the
+# race board reruns as opponents' progress arrives ---
+
+def _race_wait(kinds, timeout=1.0):
+    # Apply events until one of kinds arrives, so a click shows its result
+    client, view = st.session_state.race_client, st.session_state.race_view
+    deadline = time.perf_counter() + timeout
+    while True:
+        left = deadline - time.perf_counter()
+        events = client.poll(timeout=max(left, 0.001))
+        if any(view.apply(event) in kinds for event in events) or left <= 0 or view.closed:
+            return
+
+def _race_guess():
+    word = st.session_state.race_guess.strip().lower()
+    if word:
+        st.session_state.race_client.guess(word)
+        _race_wait(("guess", "error"))
+
+def _race_next():
+    st.session_state.race_client.next_round()
+    _race_wait(("round", "error"))
+
+def _race_leave():
+    st.session_state.race_client.close()
+    del st.session_state.race_client
+    del st.session_state.race_view
+
+@st.fragment(run_every=RACE_POLL_SECONDS)
+def race_board():
+    if "race_client" not in st.session_state:
+        return
+    view = st.session_state.race_view
+    for event in st.session_state.race_client.poll():
+        view.apply(event)
+    if view.closed:
+        st.error(f"Disconnected: {view.error}")
+        st.button("Back", on_click=_race_leave)
+        return
+    if not view.joined:
+        st.info("Connecting...")
+        return
+    others = view.opponents()
+    st.caption(f"Room **{view.room}** · round {view.round} · {len(others)} opponents"
+               + (" · Hard Mode" if view.hard else ""))
+    for guess, marks in view.guesses:
+        st.markdown("".join(color_tile(guess[i], marks[i]) for i in range(COLS)), unsafe_allow_html=True)
+    if view.error:
+        st.error(view.error)
+    if view.won:
+        st.success(f"🎉 Solved! Place #{view.racers[view.player]['place']}")
+    elif view.winner:
+        st.info(f"🏁 {view.winner} won this round" + (f" · answer `{view.answer.upper()}`" if view.answer else ""))
+    elif view.over:
+        st.error(f"😢 Out of tries. Answer: {view.answer.upper()}")
+    if not view.over and not view.finished:
+        with st.form("race_form", clear_on_submit=True):
+            st.text_input("Your guess:", max_chars=5, key="race_guess")
+            st.form_submit_button("Submit Guess", on_click=_race_guess)
+    if view.can_start_next():
+        st.button("🔄 Next Round", on_click=_race_next)
+    # Opponents' colours only, never their letters
+    lines = []
+    for racer in others[:RACE_SHOWN]:
+        status = f"🏆 #{racer['place']}" if racer["won"] else "❌" if racer["over"] else "…"
+        rows = " ".join(mark_emoji(code) for code in racer["codes"])
+        lines.append(f"{avatar(racer['player'])} **{racer['player']}** {status} {rows}")
+    if len(others) > RACE_SHOWN:
+        lines.append(f"…and {len(others) - RACE_SHOWN} more")
+    if lines:
+        st.markdown("  \n".join(lines))
+
+def race_page(player, hard):
+    if "race_client" not in st.session_state:
+        with st.form("race_join"):
+            server = st.text_input("Race server", value=f"127.0.0.1:{RACE_PORT}")
+            room = st.text_input("Room", value="lobby")
+            if st.form_submit_button("🏁 Join Race"):
+                try:
+                    host, port = parse_address(server)
+                except ValueError:
+                    st.error("Server should look like host:port")
+                    return
+                st.session_state.race_client = RaceClient(host, port, room.strip() or "lobby", player, hard).start()
+                st.session_state.race_view = RaceView()
+                _race_wait(("joined", "error"))
+                st.rerun()
+        return
+    race_board()
+    st.button("🚪 Leave Race", on_click=_race_leave)
 
 # --- Streamlit UI ---
 st.set_page_config(page_title="Wordle in Streamlit", layout="centered")
@@ -103,8 +184,9 @@ with st.expander("ℹ️ How to Play", expanded=False):
         - 🟩 Green: Correct letter, correct place
         - 🟨 Yellow: Correct letter, wrong place
         - ⬜ Gray: Letter not in the word
-    - **Hard Mode:** If a letter is revealed as 🟩 or 🟨, you must use it in your next guess.
+    - **Hard Mode:** Every guess must fit all the clues so far: 🟩 stay in place, 🟨 move elsewhere, ⬜ are left out.
     - Try the **Daily Challenge** for a global word!
+    - **Race:** join a room on a race server (`python race_server.py`) and race others to the same word.
     """)
 
 player = st.text_input("Enter your player name:", value="Player").strip()
@@ -113,125 +195,149 @@ if not player:
 
 st.markdown(f"<h3 style='text-align:center;'>{avatar(player)} {player}</h3>", unsafe_allow_html=True)
 
-words = load_words_from_file("words_5.txt")
-if not words:
+lists = get_word_lists(WORDS_FILE, ANSWERS_FILE).current()
+if not lists.from_file:
     st.warning("words_5.txt not found. Using fallback words.")
-    words = [
-        "about","other","which","their","there","apple","grape","mango","peach","berry",
-        "lemon","melon","chair","table","plant","glass","stone","flame","cloud","dream",
-        "crash","trace","place","spare","share","stare","crate","slate","brave","blink",
-        "pride","drive","bring","sling","sugar","cider","orbit","vivid","cabin","knock",
-        "rinse","smile","snack","track","video","zesty","quick","jazzy","fuzzy","piano"
-    ]
-
-all_stats = load_all_stats()
-stats = all_stats.get(player, {"games": 0, "wins": 0, "streak": 0, "max_streak": 0})
-
-mode = st.radio("Game Mode", ["Classic", "Daily"], horizontal=True)
-hard_mode = st.checkbox("Hard Mode (must use revealed letters in next guess)")
-
-if "target" not in st.session_state or st.session_state.get("player") != player or st.session_state.get("mode") != mode:
-    st.session_state.target = random.choice(words) if mode == "Classic" else get_daily_word(words)
-    st.session_state.guesses = []
-    st.session_state.marks = []
-    st.session_state.game_over = False
-    st.session_state.hard_letters = set()
-    st.session_state.player = player
-    st.session_state.mode = mode
+get_solver(lists.index, lists.version)
+
+store = get_stats_store(STATS_FILE, LEGACY_STATS_FILE)
+leaderboard = get_leaderboard(store, STATS_FILE)
+stats = store.get(player)
+
+mode = st.radio("Game Mode", ["Classic", "Daily", "Race"], horizontal=True)
+hard_mode = st.checkbox("Hard Mode (every guess must fit all the clues so far)")
+
+if mode == "Race":
+    race_page(player, hard_mode)
+    st.stop()
+elif "race_client" in st.session_state:
+    # Left race mode: leave the room rather than keep a silent racer in it
+    _race_leave()
 
 def new_game():
-    st.session_state.target = random.choice(words) if mode == "Classic" else get_daily_word(words)
-    st.session_state.guesses = []
-    st.session_state.marks = []
-    st.session_state.game_over = False
-    st.session_state.hard_letters = set()
+    target = pick_answer(lists, player) if mode == "Classic" else daily_word(lists.index, lists.answers)
+    st.session_state.game = GameState.for_word(lists.index, target, ROWS, hard_mode)
+    prefetch_definition(target)
     st.session_state.player = player
     st.session_state.mode = mode
+    st.session_state.words_version = lists.version
+
+if ("game" not in st.session_state or st.session_state.get("player") != player
+        or st.session_state.get("mode") != mode):
+    new_game()
+
+game = st.session_state.game
+if not game.over:
+    game_profiler.start()
+# The checkbox can be flipped mid-game, as in the Tk app
+game.hard = hard_mode
 
 # Show previous guesses with emoji and color
-if st.session_state.guesses:
+if game.row:
     st.markdown("<h4>Guesses:</h4>", unsafe_allow_html=True)
-    for guess, marks in zip(st.session_state.guesses, st.session_state.marks):
+    for guess, marks in game.history():
         tiles = "".join([color_tile(guess[i], marks[i]) for i in range(COLS)])
         st.markdown(tiles, unsafe_allow_html=True)
 
 # Hint button
-if st.session_state.guesses and not st.session_state.game_over:
+if game.row and not game.over:
+    st.caption(f"{game.candidate_count()} possible words left")
     if st.button("💡 Hint"):
-        hint = get_hint(words, st.session_state.guesses, st.session_state.marks)
+        hint = get_hint(game.candidate_ids(), game.index)
         if hint:
             st.info(f"Try: **{hint.upper()}**")
         else:
             st.info("No hints available!")
 
-if not st.session_state.game_over:
+if not game.over:
+    if st.button("🧠 Best Guess"):
+        warmup = get_solver(game.index, st.session_state.words_version)
+        solver = warmup.solver
+        if solver is None:
+            st.info("No hints available!" if warmup.error else
+                    "The solver is still warming up; try again in a few seconds.")
+        else:
+            with st.spinner("Thinking..."):
+                best = solver.best_guess(game.candidate_ids(), budget=0.5, guess_ids=game.legal_guess_ids())
+            if best:
+                st.info(f"Best guess: **{best.upper()}**")
+            else:
+                st.info("No hints available!")
+
+if not game.over:
     with st.form("guess_form", clear_on_submit=True):
         guess_input = st.text_input("Enter your guess:", max_chars=5, key="guess_input").lower()
         submitted = st.form_submit_button("Submit Guess")
         if submitted:
-            if len(guess_input) != 5 or not guess_input.isalpha():
-                st.error("Please enter a valid 5-letter word.")
-            elif guess_input not in words:
-                st.error("Not in word list.")
-            elif any(g == guess_input for g in st.session_state.guesses):
-                st.error("Already guessed.")
-            elif hard_mode and st.session_state.hard_letters and any(l not in guess_input for l in st.session_state.hard_letters):
-                missing = [l.upper() for l in st.session_state.hard_letters if l not in guess_input]
-                st.error(f"Hard Mode: Must use {', '.join(missing)}!")
+            error = game.validate(guess_input)
+            if error:
+                st.error(error)
             else:
-                marks = score_guess(guess_input, st.session_state.target)
-                st.session_state.guesses.append(guess_input)
-                st.session_state.marks.append(marks)
-                # Update hard letters for next guess
-                if hard_mode:
-                    st.session_state.hard_letters = set()
-                    for i in range(COLS):
-                        if marks[i] in (1, 2):
-                            st.session_state.hard_letters.add(guess_input[i])
-                if guess_input == st.session_state.target:
-                    st.success(f"🎉 Great! You guessed {st.session_state.target.upper()} ✅")
-                    st.session_state.game_over = True
-                    stats["games"] += 1
-                    stats["wins"] += 1
-                    stats["streak"] += 1
-                    stats["max_streak"] = max(stats["max_streak"], stats["streak"])
-                    all_stats[player] = stats
-                    save_all_stats(all_stats)
-                    definition = get_definition(st.session_state.target)
+                marks = game.submit(guess_input)
+                if game.won:
+                    st.success(f"🎉 Great! You guessed {game.target.upper()} ✅")
+                    stats = store.record_game(player, win=True, guesses=game.row, hard=game.hard,
+                                              daily=mode == "Daily", seconds=time.time() - game.started)
+                    log_game(player, game, mode == "Daily")
+                    leaderboard.update(player, stats)
+                    game_profiler.stop()
+                    definition = get_definition(game.target)
                     st.info(f"**Meaning:** {definition}")
-                elif len(st.session_state.guesses) == ROWS:
-                    st.error(f"😢 Out of tries. Answer: {st.session_state.target.upper()}")
-                    st.session_state.game_over = True
-                    stats["games"] += 1
-                    stats["streak"] = 0
-                    all_stats[player] = stats
-                    save_all_stats(all_stats)
-                    definition = get_definition(st.session_state.target)
+                elif game.over:
+                    st.error(f"😢 Out of tries. Answer: {game.target.upper()}")
+                    stats = store.record_game(player, win=False, hard=game.hard, daily=mode == "Daily")
+                    log_game(player, game, mode == "Daily")
+                    leaderboard.update(player, stats)
+                    game_profiler.stop()
+                    definition = get_definition(game.target)
                     st.info(f"**Meaning:** {definition}")
 
-if st.session_state.game_over:
+if game.over:
     st.markdown("---")
-    st.markdown(f"**Game Over!** {'🎉' if st.session_state.guesses and st.session_state.guesses[-1] == st.session_state.target else '😢'}")
-    st.markdown(f"**Word:** `{st.session_state.target.upper()}`")
-    st.markdown(f"**Guesses:** {len(st.session_state.guesses)}")
-    st.markdown(f"**Your guesses:** {', '.join([g.upper() for g in st.session_state.guesses])}")
+    st.markdown(f"**Game Over!** {'🎉' if game.won else '😢'}")
+    st.markdown(f"**Word:** `{game.target.upper()}`")
+    st.markdown(f"**Guesses:** {game.row}")
+    st.markdown(f"**Your guesses:** {', '.join([g.upper() for g in game.guesses])}")
     if st.button("🔄 New Game"):
         new_game()
 
 # Stats
 with st.expander("📊 Your Stats", expanded=False):
-    st.markdown(f"**Games Played:** `{stats['games']}`")
-    st.markdown(f"**Wins:** `{stats['wins']}`")
-    st.markdown(f"**Current Streak:** `{stats['streak']}`")
-    st.markdown(f"**Max Streak:** `{stats['max_streak']}`")
+    summary = analytics(stats)
+    since = f" (last {summary['timed_wins']} wins)" if summary["partial"] else ""
+    st.markdown(f"**Games Played:** `{summary['games']}`")
+    st.markdown(f"**Wins:** `{summary['wins']}` ({summary['win_rate']:.0%})")
+    st.markdown(f"**Current Streak:** `{summary['streak']}` · **Max Streak:** `{summary['max_streak']}`")
+    st.markdown(f"**Average Guesses:** `{summary['average_guesses']:.2f}` · "
+                f"**Average Solve Time:** `{summary['average_solve_seconds']:.0f}s`{since}")
+    st.markdown("**Hard Mode Wins:** `{}/{}` · **Daily Wins:** `{}/{}`".format(*summary["hard"], *summary["daily"]))
+    most = max(summary["distribution"]) or 1
+    st.markdown(f"**Guess Distribution**{since}")
+    st.code("\n".join(f"{n} {'█' * (1 + 24 * count // most) if count else '▏'} {count}"
+                      for n, count in enumerate(summary["distribution"], 1)))
 
 # Leaderboard
 with st.expander("🏆 Leaderboard", expanded=False):
-    sorted_stats = sorted(all_stats.items(), key=lambda x: x[1].get("max_streak", 0), reverse=True)
-    st.markdown("<h4>Top Streaks</h4>", unsafe_allow_html=True)
-    for i, (pname, pstats) in enumerate(sorted_stats[:10], 1):
+    metric = st.selectbox("Rank by", list(METRICS), format_func=lambda m: METRICS[m][0])
+    label = METRICS[metric][0]
+    pages = max(1, -(-leaderboard.size(metric) // LEADERBOARD_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1) - 1 if pages > 1 else 0
+    st.markdown(f"<h4>Top {label}</h4>", unsafe_allow_html=True)
+    for i, pname, value, pstats in leaderboard.page(metric, page, LEADERBOARD_PAGE_SIZE):
         rank_emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else ""
         st.markdown(
-            f"{rank_emoji} <b>{avatar(pname)} {pname}</b> — Max Streak: <b>{pstats.get('max_streak', 0)}</b> | Games: {pstats.get('games', 0)} | Wins: {pstats.get('wins', 0)}",
+            f"{rank_emoji} <b>{avatar(pname)} {pname}</b> — {label}: <b>{format_value(metric, value)}</b> | Games: {pstats.get('games', 0)} | Wins: {pstats.get('wins', 0)}",
             unsafe_allow_html=True
-        )
\ No newline at end of file
+        )
+    rank = leaderboard.rank(metric, player)
+    if rank:
+        st.caption(f"Your rank: #{rank} of {leaderboard.size(metric)}")
+
+game_profiler.pause()
+record("streamlit.rerun", _rerun_start)
+if SHOW_TIMING:
+    rerun_ms = (time.perf_counter() - _rerun_start) * 1000
+    timings = st.session_state.setdefault("rerun_ms", [])
+    timings.append(rerun_ms)
+    del timings[:-50]
+    st.sidebar.caption(f"Rerun: {rerun_ms:.1f} ms (median of last {len(timings)}: {statistics.median(timings):.1f} ms)")
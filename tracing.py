@@ -0,0 +1,239 @@
+import os
+import sys
+import time
+import atexit
+import threading
+from collections import defaultdict
+
+# WORDLE_TRACE=1 (or a file name) records spans and counters and writes a
+# Chrome trace (chrome://tracing, ui.perfetto.dev) plus a summary at exit.
+# WORDLE_PROFILE_GAME=1 (or a file name) runs cProfile over the first game.
+# When both are unset, traced() returns the function itself and span()
+# returns a shared no-op object, so instrumented code pays only that call.
+_TRACE = os.environ.get("WORDLE_TRACE", "")
+_PROFILE = os.environ.get("WORDLE_PROFILE_GAME", "")
+ENABLED = bool(_TRACE) and _TRACE != "0"
+TRACE_FILE = _TRACE if ENABLED and _TRACE != "1" else "wordle_trace.json"
+PROFILE_FILE = _PROFILE if _PROFILE and _PROFILE != "1" else "wordle_game.prof"
+MAX_EVENTS = 1_000_000
+CO_COROUTINE = 0x80  # inspect.CO_COROUTINE, without importing inspect
+# Histogram bucket upper bounds in ms
+BUCKETS_MS = (0.01, 0.1, 1, 10, 100, 1000, float("inf"))
+
+_origin = time.perf_counter()
+_events = []
+_durations = defaultdict(list)
+_counters = defaultdict(int)
+_dropped = 0
+_lock = threading.Lock()
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter(), **self.args)
+        return False
+
+def record(name, start, end=None, **args):
+    # Add a finished span from two time.perf_counter() readings
+    global _dropped
+    if not ENABLED:
+        return
+    end = time.perf_counter() if end is None else end
+    with _lock:
+        _durations[name].append(end - start)
+        if len(_events) < MAX_EVENTS:
+            _events.append((name, start, end, threading.get_ident(), args))
+        else:
+            _dropped += 1
+
+def span(name, **args):
+    # with span("stats.record_game"): ...
+    return _Span(name, args) if ENABLED else _NULL_SPAN
+
+def traced(name=None):
+    # Decorator: time every call of the function as a span
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        if func.__code__.co_flags & CO_COROUTINE:
+            # Time the awaited call, not just creating the coroutine
+            async def wrapper(*a, **kw):
+                start = time.perf_counter()
+                try:
+                    return await func(*a, **kw)
+                finally:
+                    record(label, start)
+        else:
+            def wrapper(*a, **kw):
+                start = time.perf_counter()
+                try:
+                    return func(*a, **kw)
+                finally:
+                    record(label, start)
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorate
+
+def count(name, n=1):
+    if ENABLED:
+        with _lock:
+            _counters[name] += n
+
+def chrome_trace():
+    # Trace Event Format: one complete ("X") event per span, in microseconds
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        counters = dict(_counters)
+    trace = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+              "ts": round((start - _origin) * 1e6, 3), "dur": round((end - start) * 1e6, 3),
+              **({"args": args} if args else {})}
+             for name, start, end, tid, args in events]
+    ts = round((time.perf_counter() - _origin) * 1e6, 3)
+    trace += [{"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": ts, "args": {"value": value}}
+              for name, value in counters.items()]
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+def summary():
+    # {name: {count, total_ms, mean_ms, p50_ms, p95_ms, max_ms, histogram}}
+    with _lock:
+        durations = {name: sorted(values) for name, values in _durations.items()}
+    result = {}
+    for name, values in durations.items():
+        ms = [v * 1000 for v in values]
+        histogram = [0] * len(BUCKETS_MS)
+        bucket = 0
+        for v in ms:
+            while v > BUCKETS_MS[bucket]:
+                bucket += 1
+            histogram[bucket] += 1
+        result[name] = {
+            "count": len(ms),
+            "total_ms": sum(ms),
+            "mean_ms": sum(ms) / len(ms),
+            "p50_ms": ms[int(0.50 * (len(ms) - 1))],
+            "p95_ms": ms[int(0.95 * (len(ms) - 1))],
+            "max_ms": ms[-1],
+            "histogram": histogram,
+        }
+    return result
+
+def format_summary(stats=None, counters=None):
+    stats = summary() if stats is None else stats
+    counters = dict(_counters) if counters is None else counters
+    labels = ["<=" + (f"{b:g}ms" if b != float("inf") else "inf") for b in BUCKETS_MS]
+    lines = [f"{'span':32} {'count':>7} {'total ms':>10} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}"]
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1]["total_ms"]):
+        lines.append(f"{name[:32]:32} {s['count']:7d} {s['total_ms']:10.1f} {s['mean_ms']:8.2f} "
+                     f"{s['p50_ms']:8.2f} {s['p95_ms']:8.2f} {s['max_ms']:8.2f}")
+        most = max(s["histogram"]) or 1
+        for label, n in zip(labels, s["histogram"]):
+            if n:
+                lines.append(f"    {label:>9} {n:7d} {'#' * max(1, round(30 * n / most))}")
+    for name, value in sorted(counters.items()):
+        lines.append(f"{name[:32]:32} {value:7d} (counter)")
+    if _dropped:
+        lines.append(f"({_dropped} spans not kept in the trace after {MAX_EVENTS})")
+    return "\n".join(lines)
+
+def write_trace(path=None):
+    import json
+    path = path or TRACE_FILE
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(chrome_trace(), f)
+    os.replace(tmp, path)
+    return path
+
+def _at_exit():
+    if not _durations and not _counters:
+        return
+    try:
+        path = write_trace()
+    except OSError as e:
+        path = f"not written ({e})"
+    # sys.stderr is None in the windowed PyInstaller build
+    if sys.stderr is not None:
+        print(f"trace: {path}\n{format_summary()}", file=sys.stderr)
+
+if ENABLED:
+    atexit.register(_at_exit)
+
+class _GameProfiler:
+    # cProfile over exactly one game: start() when a game begins or
+    # resumes, stop() when it ends. cProfile follows one thread, so
+    # Streamlit, whose reruns may land on different threads, calls pause()
+    # at the end of every rerun. Later games are not profiled.
+    def __init__(self, path):
+        self.path = path
+        self.profiler = None
+        self.running = False
+        self.done = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.done or self.running:
+                return
+            if self.profiler is None:
+                import cProfile
+                self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            self.running = True
+
+    def pause(self):
+        with self._lock:
+            if self.running:
+                self.profiler.disable()
+                self.running = False
+
+    def stop(self):
+        with self._lock:
+            if self.profiler is None or self.done:
+                return
+            if self.running:
+                self.profiler.disable()
+                self.running = False
+            self.done = True
+            self.profiler.dump_stats(self.path)
+            if sys.stderr is not None:
+                import pstats
+                print(f"profile: {self.path}", file=sys.stderr)
+                pstats.Stats(self.profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+
+class _NullProfiler:
+    def start(self):
+        pass
+
+    def pause(self):
+        pass
+
+    def stop(self):
+        pass
+
+game_profiler = _GameProfiler(PROFILE_FILE) if _PROFILE and _PROFILE != "0" else _NullProfiler()
@@ -0,0 +1,127 @@
+import os
+import struct
+from bisect import bisect_left
+from wordle_core import CACHE_DIR, file_version
+
+FALLBACK_WORDS = [
+    "about","other","which","their","there","apple","grape","mango","peach","berry",
+    "lemon","melon","chair","table","plant","glass","stone","flame","cloud","dream",
+    "crash","trace","place","spare","share","stare","crate","slate","brave","blink",
+    "pride","drive","bring","sling","sugar","cider","orbit","vivid","cabin","knock",
+    "rinse","smile","snack","track","video","zesty","quick","jazzy","fuzzy","piano"
+]
+
+def load_words_from_file(filename="words_5.txt"):
+    if not os.path.exists(filename):
+        return None
+    words = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            w = line.strip().lower()
+            if len(w) == 5 and w.isalpha():
+                words.append(w)
+    return sorted(set(words))
+
+class WordIndex:
+    # Sorted, de-duplicated word list. A word's id is its position in the
+    # sorted list, so the dict lookup, the binary search and the trie agree.
+    __slots__ = ("words", "ids", "_trie", "__weakref__")
+
+    def __init__(self, words, presorted=False):
+        self.words = tuple(words) if presorted else tuple(sorted(set(w.lower() for w in words)))
+        self.ids = {w: i for i, w in enumerate(self.words)}
+        self._trie = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.ids
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __getitem__(self, word_id):
+        return self.words[word_id]
+
+    def id_of(self, word):
+        return self.ids.get(word)
+
+    def word_of(self, word_id):
+        return self.words[word_id]
+
+    def bisect(self, word):
+        # Index of the word by binary search, or -1 if it is not present
+        i = bisect_left(self.words, word)
+        if i < len(self.words) and self.words[i] == word:
+            return i
+        return -1
+
+    def prefix_range(self, prefix):
+        # Ids [start, end) of all words starting with prefix
+        start = bisect_left(self.words, prefix)
+        end = bisect_left(self.words, prefix + "{", start)
+        return start, end
+
+    def trie(self):
+        # Built on first use unless the index came from the cache
+        if self._trie is None:
+            from word_trie import WordTrie
+            self._trie = WordTrie.from_words(self.words)
+        return self._trie
+
+# Compiled word list cache: the source file's version, the words as one
+# fixed-width ASCII blob, then the serialized trie. Loading it skips the
+# text parse, the sort and the trie build.
+_CACHE_HEADER = struct.Struct("<qqI")
+
+def _cache_path(filename, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, os.path.basename(filename) + ".idx")
+
+def _load_cached(filename, version, cache_dir=None):
+    try:
+        with open(_cache_path(filename, cache_dir), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    try:
+        mtime, size, n = _CACHE_HEADER.unpack_from(data)
+        if (mtime, size) != version:
+            return None
+        start = _CACHE_HEADER.size
+        blob = data[start:start + 5 * n].decode("ascii")
+        from word_trie import WordTrie
+        trie = WordTrie.from_bytes(data[start + 5 * n:])
+    except (struct.error, ValueError):
+        return None
+    index = WordIndex([blob[i:i + 5] for i in range(0, len(blob), 5)], presorted=True)
+    index._trie = trie
+    return index
+
+def _save_cached(filename, version, index, cache_dir=None):
+    # Best effort: a read-only cache directory only costs the next start
+    path = _cache_path(filename, cache_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_CACHE_HEADER.pack(*version, len(index)))
+            f.write("".join(index.words).encode("ascii"))
+            f.write(index.trie().to_bytes())
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def load_word_index(filename="words_5.txt", cache_dir=None):
+    # Returns (index, from_file)
+    version = file_version(filename)
+    if version is not None:
+        index = _load_cached(filename, version, cache_dir)
+        if index is not None:
+            return index, True
+    file_words = load_words_from_file(filename)
+    if file_words:
+        index = WordIndex(file_words, presorted=True)
+        _save_cached(filename, version, index, cache_dir)
+        return index, True
+    return WordIndex(FALLBACK_WORDS), False
@@ -0,0 +1,122 @@
+import time
+import threading
+from word_index import load_word_index, load_words_from_file
+from constraints import letter_index
+from wordle_core import file_version
+
+WORDS_FILE = "words_5.txt"
+# The words that can be answers (built by answer_sampler.py). Every word in
+# WORDS_FILE can still be guessed; without this file every one of them can
+# be an answer.
+ANSWERS_FILE = "answers_5.txt"
+
+class WordLists:
+    # One consistent version of the allowed and answer lists. It is never
+    # modified: a reload builds a new one and swaps the reference, so a
+    # game keeps the snapshot (and word ids) it started with.
+    __slots__ = ("index", "answers", "from_file", "version", "__weakref__")
+
+    def __init__(self, index, answers, from_file, version):
+        self.index = index
+        self.answers = answers
+        self.from_file = from_file
+        self.version = version
+
+def sources_version(allowed_file, answers_file=None):
+    return (file_version(allowed_file), file_version(answers_file) if answers_file else None)
+
+def _answers(index, answers_file):
+    words = load_words_from_file(answers_file) if answers_file else None
+    if not words:
+        return index.words
+    # Answers must also be guessable; the file is sorted like index.words
+    return tuple(w for w in words if w in index) or index.words
+
+def load_word_lists(allowed_file=WORDS_FILE, answers_file=ANSWERS_FILE):
+    version = sources_version(allowed_file, answers_file)
+    index, from_file = load_word_index(allowed_file)
+    return WordLists(index, _answers(index, answers_file), from_file, version)
+
+def reload_word_lists(previous, allowed_file=WORDS_FILE, answers_file=ANSWERS_FILE, matrix=False):
+    # Load the lists again, reusing whatever did not change: an unchanged
+    # allowed list keeps the previous WordIndex with its trie and letter
+    # bitsets, and a cached pattern matrix is edited for the added and
+    # removed words instead of being recomputed.
+    lists = load_word_lists(allowed_file, answers_file)
+    old_words, new_words = previous.index.words, lists.index.words
+    if new_words == old_words:
+        index = previous.index
+        answers = index.words if lists.answers == new_words else lists.answers
+        return WordLists(index, answers, lists.from_file, lists.version)
+    lists.index.trie()
+    letter_index(lists.index)
+    if matrix:
+        from patterns import update_matrix
+        update_matrix(old_words, new_words)
+    return lists
+
+class WordListWatcher:
+    # Keeps the newest WordLists for a pair of files. check() compares the
+    # files' mtime and size with the current snapshot's and, when they
+    # moved, builds the new snapshot and everything derived from it before
+    # swapping it in with one assignment. Readers never wait on a reload.
+    # start() runs check() every interval seconds on a daemon thread.
+    def __init__(self, allowed_file=WORDS_FILE, answers_file=ANSWERS_FILE, interval=5.0,
+                 matrix=False, on_change=None):
+        self.allowed_file = allowed_file
+        self.answers_file = answers_file
+        self.interval = interval
+        self.matrix = matrix
+        self.on_change = on_change
+        self.reloads = 0
+        self._current = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def current(self):
+        lists = self._current
+        if lists is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = load_word_lists(self.allowed_file, self.answers_file)
+                lists = self._current
+        return lists
+
+    def check(self):
+        # True when a new snapshot was swapped in
+        with self._lock:
+            old = self._current
+            if old is None:
+                return False
+            version = sources_version(self.allowed_file, self.answers_file)
+            # A missing word file keeps the lists already in use rather
+            # than falling back to the built-in words
+            if version == old.version or version[0] is None:
+                return False
+            new = reload_word_lists(old, self.allowed_file, self.answers_file, self.matrix)
+            self._current = new
+            self.reloads += 1
+        if self.on_change:
+            self.on_change(old, new)
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="word-lists", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception:
+                # A file caught mid-write is read again on the next check
+                pass
+
+def describe_change(old, new):
+    # "+3 -1 words, 2315 answers" for logs and status lines
+    old_words, new_words = set(old.index.words), set(new.index.words)
+    return (f"+{len(new_words - old_words)} -{len(old_words - new_words)} words, "
+            f"{len(new.answers)} answers")
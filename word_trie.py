@@ -0,0 +1,139 @@
+import struct
+from array import array
+
+# to_bytes() layout: magic, version, node count, edge count, then the
+# masks, first, counts, final, targets and skips arrays in that order
+MAGIC = b"WTRI"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBII")
+DEAD = -1  # node reached by a prefix no word starts with
+
+class WordTrie:
+    # Minimized trie (a DAWG) over a sorted word list, flattened into
+    # arrays. Node n's outgoing edges sit at first[n] onwards in letter
+    # order, and masks[n] has bit c set when letter c may follow, so a step
+    # is a bit test plus a popcount. skips[e] counts the words that sort
+    # before every word through edge e at that node, so walking a word sums
+    # to its position in the sorted list: the trie doubles as the id lookup.
+    __slots__ = ("masks", "first", "counts", "final", "targets", "skips")
+
+    def __init__(self, masks, first, counts, final, targets, skips):
+        self.masks = masks
+        self.first = first
+        self.counts = counts
+        self.final = final
+        self.targets = targets
+        self.skips = skips
+
+    @classmethod
+    def from_words(cls, words):
+        # words must be sorted and unique, like WordIndex.words
+        registry = {}
+        shapes = []
+
+        def build(lo, hi, depth):
+            final = lo < hi and len(words[lo]) == depth
+            i = lo + final
+            edges = []
+            while i < hi:
+                ch = words[i][depth]
+                j = i + 1
+                while j < hi and words[j][depth] == ch:
+                    j += 1
+                edges.append((ch, build(i, j, depth + 1), j - i))
+                i = j
+            # Equal subtries share one node
+            shape = (final, tuple(edges))
+            node = registry.get(shape)
+            if node is None:
+                node = registry[shape] = len(shapes)
+                shapes.append(shape)
+            return node
+
+        root = build(0, len(words), 0)
+        # Renumber breadth-first so the root is node 0
+        order = [root]
+        number = {root: 0}
+        for node in order:
+            for _, child, _ in shapes[node][1]:
+                if child not in number:
+                    number[child] = len(order)
+                    order.append(child)
+        masks, first, counts = array("I"), array("I"), array("I")
+        final, targets, skips = bytearray(), array("I"), array("I")
+        for node in order:
+            is_final, edges = shapes[node]
+            mask = 0
+            seen = int(is_final)
+            first.append(len(targets))
+            for ch, child, n in edges:
+                mask |= 1 << (ord(ch) - 97)
+                targets.append(number[child])
+                skips.append(seen)
+                seen += n
+            masks.append(mask)
+            counts.append(seen)
+            final.append(is_final)
+        return cls(masks, first, counts, final, targets, skips)
+
+    def step(self, node, ch):
+        # (child, id offset) after reading ch at node, or (DEAD, 0)
+        if node == DEAD:
+            return DEAD, 0
+        c = ord(ch) - 97
+        bit = 1 << c if 0 <= c < 26 else 0
+        mask = self.masks[node]
+        if not mask & bit:
+            return DEAD, 0
+        e = self.first[node] + (mask & (bit - 1)).bit_count()
+        return self.targets[e], self.skips[e]
+
+    def walk(self, word):
+        # (node, id offset) after reading all of word
+        node, offset = 0, 0
+        for ch in word:
+            node, skip = self.step(node, ch)
+            if node == DEAD:
+                return DEAD, 0
+            offset += skip
+        return node, offset
+
+    def word_id(self, word):
+        node, offset = self.walk(word)
+        return offset if node != DEAD and self.final[node] else None
+
+    def __contains__(self, word):
+        return self.word_id(word) is not None
+
+    def completions(self, node):
+        # How many words go through node
+        return 0 if node == DEAD else self.counts[node]
+
+    def __len__(self):
+        return self.counts[0]
+
+    def node_count(self):
+        return len(self.masks)
+
+    def to_bytes(self):
+        return b"".join((_HEADER.pack(MAGIC, FORMAT_VERSION, len(self.masks), len(self.targets)),
+                         self.masks.tobytes(), self.first.tobytes(), self.counts.tobytes(),
+                         bytes(self.final), self.targets.tobytes(), self.skips.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, nodes, edges = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"unsupported word trie version {version}")
+        pos = _HEADER.size
+        parts = []
+        for kind, n in (("I", nodes), ("I", nodes), ("I", nodes), ("B", nodes), ("I", edges), ("I", edges)):
+            part = array(kind)
+            end = pos + n * part.itemsize
+            part.frombytes(data[pos:end])
+            parts.append(part)
+            pos = end
+        if pos != len(data):
+            raise ValueError("truncated word trie")
+        masks, first, counts, final, targets, skips = parts
+        return cls(masks, first, counts, bytearray(final), targets, skips)
@@ -1,8 +1,12 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# One-folder build: a one-file exe unpacks the whole bundle (numpy
+# included) to a temp dir on every launch, and UPX-compressed binaries
+# must be decompressed before they load, so both are off for cold start.
+# Time it with: python startup_bench.py --exe dist/wordle/wordle
 
 a = Analysis(
-    ['wordle.py'],
+    ['main.py'],
     pathex=[],
     binaries=[],
     datas=[],
@@ -10,7 +14,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Only the Streamlit frontend uses these
+    excludes=['streamlit', 'pandas', 'pyarrow', 'altair', 'pydeck', 'pygame'],
     noarchive=False,
     optimize=0,
 )
@@ -19,16 +24,13 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='wordle',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +38,13 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='wordle',
+)
@@ -0,0 +1,42 @@
+import os
+from collections import Counter
+
+ROWS = 6
+COLS = 5
+CACHE_DIR = os.environ.get("WORDLE_CACHE_DIR", ".wordle_cache")
+ALL_GREEN = 242  # encode_marks([2, 2, 2, 2, 2])
+
+def score_guess(guess, target):
+    result = [0] * 5
+    counts = Counter(target)
+    for i in range(5):
+        if guess[i] == target[i]:
+            result[i] = 2
+            counts[guess[i]] -= 1
+    for i in range(5):
+        if result[i] == 0 and counts.get(guess[i], 0) > 0:
+            result[i] = 1
+            counts[guess[i]] -= 1
+    return result
+
+def encode_marks(marks):
+    # Marks as one base-3 number, first letter most significant (0-242)
+    code = 0
+    for m in marks:
+        code = code * 3 + m
+    return code
+
+def decode_pattern(code):
+    marks = [0] * 5
+    for i in range(4, -1, -1):
+        marks[i] = code % 3
+        code //= 3
+    return marks
+
+def file_version(path):
+    # Cheap change detector for cached resources built from a file
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return (info.st_mtime_ns, info.st_size)